@@ -0,0 +1,6 @@
+from .frame_reader import FramePacket, FrameReader, is_live_source, open_capture
+from .snapshot_source import SnapshotSource, ConnectionPool, is_snapshot_url
+from .frame_skip import StrideSkipper, RateSkipper, AdaptiveSkipper, make_skipper
+from .mjpeg_stream import MjpegStream
+from .sync import FrameSynchronizer
+from .camera_control import CameraControl, FRAME_SIZES, closest_frame_size, negotiate_frame_size
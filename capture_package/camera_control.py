@@ -0,0 +1,136 @@
+# Importation des bibliothèques nécessaires
+import json  # Lecture de la réponse de /status
+import urllib.request  # Client HTTP de la bibliothèque standard
+from urllib.parse import urlsplit, urlunsplit  # Découpage des URL
+
+# Résolutions du capteur (valeurs de framesize_t du pilote esp32-camera, jusqu'à l'UXGA de l'OV2640)
+FRAME_SIZES = {
+    0: (96, 96),  # FRAMESIZE_96X96
+    1: (160, 120),  # FRAMESIZE_QQVGA
+    2: (176, 144),  # FRAMESIZE_QCIF
+    3: (240, 176),  # FRAMESIZE_HQVGA
+    4: (240, 240),  # FRAMESIZE_240X240
+    5: (320, 240),  # FRAMESIZE_QVGA
+    6: (400, 296),  # FRAMESIZE_CIF
+    7: (480, 320),  # FRAMESIZE_HVGA
+    8: (640, 480),  # FRAMESIZE_VGA
+    9: (800, 600),  # FRAMESIZE_SVGA
+    10: (1024, 768),  # FRAMESIZE_XGA
+    11: (1280, 720),  # FRAMESIZE_HD
+    12: (1280, 1024),  # FRAMESIZE_SXGA
+    13: (1600, 1200),  # FRAMESIZE_UXGA
+}
+
+
+def closest_frame_size(width, height, aspect=None):
+    """
+    Choisit la plus petite résolution du capteur couvrant la résolution demandée.
+
+    Aucune résolution plus petite n'est choisie pour ne jamais agrandir les frames côté client.
+    Avec `aspect`, seules les résolutions de même rapport largeur/hauteur sont candidates : une
+    autre proportion change le champ de vue du capteur (ex. HD 16:9 et VGA 4:3) et les points
+    clés du sol ne correspondraient plus à la scène.
+
+    :param width: Largeur de traitement souhaitée
+    :param height: Hauteur de traitement souhaitée
+    :param aspect: Rapport largeur/hauteur imposé (celui de la résolution actuelle), ou None
+    :return: Valeur framesize (la plus grande candidate si aucune ne couvre la demande)
+    """
+    sizes = {value: (w, h) for value, (w, h) in FRAME_SIZES.items()
+             if aspect is None or abs(w / h - aspect) <= 0.01 * aspect}
+    covering = [(w * h, value) for value, (w, h) in sizes.items() if w >= width and h >= height]
+    if not covering:
+        return max(sizes, key=lambda value: sizes[value][0] * sizes[value][1])
+    return min(covering)[1]
+
+
+def control_url(source):
+    """
+    Déduit l'adresse du serveur de contrôle de l'ESP32 à partir de l'URL d'une frame.
+
+    Le firmware sert `/stream` sur le port du serveur de contrôle + 1 (81) et `/control`,
+    `/status` et `/capture` sur le port du serveur (80).
+
+    :param source: URL du flux ou du point d'accès /capture
+    :return: URL de base du serveur de contrôle (sans chemin)
+    """
+    parts = urlsplit(source)
+    netloc = parts.hostname
+    port = parts.port
+    if parts.path.rstrip('/').endswith('/stream') and port is not None:
+        port -= 1
+    if port is not None and port != 80:
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((parts.scheme, netloc, '', '', ''))
+
+
+class CameraControl:
+    def __init__(self, source, timeout=2.0):
+        """
+        Client du serveur de contrôle de l'ESP32 (`/status` et `/control` de app_httpd.cpp).
+
+        :param source: URL du flux ou du point d'accès /capture de la caméra
+        :param timeout: Délai d'attente réseau en secondes
+        """
+        self.base_url = control_url(source)  # Serveur de contrôle
+        self.timeout = timeout  # Délai d'attente réseau
+
+    def status(self):
+        """
+        Lit l'état du capteur.
+
+        :return: Dictionnaire de /status (dont 'framesize')
+        """
+        with urllib.request.urlopen(self.base_url + '/status', timeout=self.timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+    def set(self, variable, value):
+        """
+        Règle une variable du capteur via /control.
+
+        :param variable: Nom de la variable (ex. 'framesize')
+        :param value: Valeur entière
+        :return: True si la caméra a accepté la valeur
+        """
+        url = f"{self.base_url}/control?var={variable}&val={int(value)}"
+        with urllib.request.urlopen(url, timeout=self.timeout) as response:
+            return response.status == 200
+
+    def frame_size(self):
+        """
+        Résolution actuelle du capteur.
+
+        :return: Tuple (valeur framesize, (largeur, hauteur))
+        """
+        value = int(self.status()['framesize'])
+        return value, FRAME_SIZES.get(value)
+
+
+def negotiate_frame_size(source, scale, timeout=2.0):
+    """
+    Demande à la caméra la résolution la plus proche de la résolution de traitement.
+
+    La résolution de traitement est la résolution actuelle du capteur multipliée par `scale`
+    (le videoScale des boucles). La caméra envoie alors des frames déjà presque à la bonne
+    taille : moins de transfert, de décodage et de redimensionnement côté client. Seules les
+    résolutions de même proportion que la résolution actuelle sont demandées ; sans résolution
+    adaptée, le capteur est laissé tel quel et la frame est redimensionnée côté client.
+
+    :param source: URL du flux ou du point d'accès /capture de la caméra
+    :param scale: Échelle de traitement par rapport à la résolution actuelle du capteur
+    :param timeout: Délai d'attente réseau en secondes
+    :return: Tuple ((largeur, hauteur) de traitement, (largeur, hauteur) négociée), ou None en cas d'échec
+    """
+    control = CameraControl(source, timeout)
+    try:
+        current, size = control.frame_size()
+        if size is None:
+            return None
+        target = (round(size[0] * scale), round(size[1] * scale))
+        value = closest_frame_size(*target, aspect=size[0] / size[1])
+        if value != current and not control.set('framesize', value):
+            return None
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Négociation de résolution impossible pour {source}: {e}")
+        return None
+    return target, FRAME_SIZES[value]
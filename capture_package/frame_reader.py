@@ -0,0 +1,305 @@
+# Importation des bibliothèques nécessaires
+import threading  # Thread de lecture dédié à chaque source
+import time  # Horodatage des frames
+from collections import deque  # Tampon borné des frames décodées
+
+import cv2  # OpenCV pour la capture vidéo
+
+from .mjpeg_stream import MjpegStream  # Client MJPEG natif (flux ESP32)
+from .snapshot_source import SnapshotSource, is_snapshot_url  # Images tirées du point d'accès /capture
+
+
+def is_live_source(source):
+    """
+    Indique si la source est un flux en direct (caméra IP ou webcam) plutôt qu'un fichier.
+
+    :param source: Chemin, URL ou index de la source vidéo
+    :return: True si la source est un flux en direct
+    """
+    if isinstance(source, int):
+        return True
+    return str(source).lower().startswith(('http://', 'https://', 'rtsp://', 'udp://', 'tcp://'))
+
+
+def open_capture(source, scale=1.0):
+    """
+    Ouvre la capture adaptée à la source.
+
+    Les URL HTTP sont des flux MJPEG (ESP32) lus par MjpegStream, qui peut sauter une
+    partie sans la décoder et décoder directement à l'échelle voulue, sauf les URL `/capture`
+    lues image par image par SnapshotSource ; les autres sources passent par cv2.VideoCapture
+    (pleine résolution, l'attribut `scale` est absent).
+
+    :param source: Chemin, URL ou index de la source vidéo
+    :param scale: Échelle de décodage souhaitée (appliquée seulement par MjpegStream)
+    :return: Objet de capture exposant grab / retrieve / read
+    """
+    if is_snapshot_url(source):
+        return SnapshotSource(source, scale=scale)
+    if isinstance(source, str) and source.lower().startswith(('http://', 'https://')):
+        return MjpegStream(source, scale=scale)
+    return cv2.VideoCapture(source)
+
+
+class FramePacket:
+    def __init__(self, index, timestamp, image, received=None):
+        """
+        Initialise un paquet contenant une frame et ses métadonnées.
+
+        :param index: Numéro de la frame dans la source (frames ignorées comprises)
+        :param timestamp: Instant de capture en secondes (horloge de la caméra ou position dans le fichier)
+        :param image: Image décodée (numpy.ndarray)
+        :param received: Instant de réception (time.monotonic()) ; maintenant par défaut
+        """
+        self.index = index  # Numéro de la frame dans la source
+        self.timestamp = timestamp  # Instant de capture
+        self.image = image  # Image décodée
+        self.received = received if received is not None else time.monotonic()  # Réception (horloge locale)
+        self.marks = {'received': self.received}  # Instants de passage dans chaque étape (traçage de latence)
+
+    def mark(self, stage):
+        """
+        Note l'instant (time.monotonic()) où la frame termine une étape.
+
+        :param stage: Nom de l'étape (voir pipeline_package.tracing.STAGES)
+        """
+        self.marks[stage] = time.monotonic()
+
+
+class FrameReader:
+    def __init__(self, source, buffer_size=None, drop_oldest=None, name=None, skipper=None, scale=1.0,
+                 reconnect_delay=None):
+        """
+        Initialise un lecteur de frames tournant dans son propre thread.
+
+        Pour un flux en direct, le tampon est borné et les frames les plus anciennes sont
+        jetées lorsqu'il est plein : la boucle de traitement reçoit toujours la frame la
+        plus récente. Pour un fichier, le thread de lecture attend qu'une place se libère
+        afin de ne perdre aucune frame.
+
+        Si une politique de saut est fournie, les frames qu'elle écarte sont seulement
+        avancées (grab) sans être décodées (retrieve).
+
+        :param source: Chemin, URL ou index de la source vidéo
+        :param buffer_size: Taille du tampon (1 pour un flux en direct, 4 pour un fichier par défaut)
+        :param drop_oldest: Jeter la frame la plus ancienne si le tampon est plein (auto si None)
+        :param name: Nom de la caméra pour les statistiques
+        :param skipper: Politique de saut (StrideSkipper, RateSkipper...) ou None pour tout décoder
+        :param scale: Échelle de décodage souhaitée ; voir applied_scale pour celle réellement appliquée
+        :param reconnect_delay: Pour un flux en direct, délai en secondes avant de rouvrir la source
+                                après une coupure (None pour terminer le flux à la première coupure)
+        """
+        live = is_live_source(source)
+        self.live = live  # Flux en direct ou fichier
+        self.source = source  # Source vidéo
+        self.name = name if name is not None else str(source)  # Nom de la caméra
+        self.skipper = skipper  # Politique de saut des frames
+        self.scale = scale  # Échelle de décodage demandée
+        self.reconnect_delay = reconnect_delay  # Délai avant reconnexion (None : pas de reconnexion)
+
+        self.capture = open_capture(source, scale)  # Capture (OpenCV, MJPEG natif ou images tirées)
+        self.applied_scale = getattr(self.capture, 'scale', 1.0)  # Échelle déjà appliquée au décodage
+
+        # Une source tirée ne télécharge que les frames consommées : elle attend plutôt que de jeter
+        pull = getattr(self.capture, 'pull', False)
+        default_drop = live and not pull
+        self.drop_oldest = default_drop if drop_oldest is None else drop_oldest  # Politique du tampon plein
+        self.buffer_size = buffer_size if buffer_size is not None else (1 if live else 4)  # Taille du tampon
+        if live:
+            # Limite le tampon interne d'OpenCV pour ne pas accumuler de frames périmées
+            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.buffer = deque()  # Tampon des paquets décodés
+        self.condition = threading.Condition()  # Synchronisation lecteur / consommateur
+        self.thread = None  # Thread de lecture
+        self.running = False  # Indique si le thread doit continuer
+        self.finished = False  # Fin du flux ou erreur de lecture
+
+        # Compteurs
+        self.frames_read = 0  # Frames lues depuis la source
+        self.frames_dropped = 0  # Frames jetées car le tampon était plein
+        self.frames_skipped = 0  # Frames avancées sans décodage par la politique de saut
+        self.frames_corrupt = 0  # Frames tronquées ou illisibles sautées (flux toujours synchronisé)
+        self.reconnects = 0  # Reconnexions après une coupure du flux
+
+    def isOpened(self):
+        """
+        Indique si la source a pu être ouverte.
+
+        :return: True si la capture est ouverte
+        """
+        return self.capture.isOpened()
+
+    def start(self):
+        """
+        Démarre le thread de lecture.
+
+        :return: Le lecteur lui-même (pour chaîner les appels)
+        """
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name=f"FrameReader-{self.name}", daemon=True)
+            self.thread.start()
+        return self
+
+    def _timestamp(self):
+        """
+        Retourne l'instant de capture de la frame qui vient d'être avancée.
+
+        :return: Horodatage caméra (X-Timestamp), position dans le fichier ou heure locale
+        """
+        timestamp = getattr(self.capture, 'timestamp', None)
+        if timestamp is not None:
+            return timestamp
+        if not self.live:
+            return self.capture.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        return time.time()
+
+    def _reconnect(self):
+        """
+        Rouvre un flux en direct coupé, en réessayant tant que le lecteur tourne.
+
+        :return: True si la source a été rouverte
+        """
+        if self.reconnect_delay is None or not self.live:
+            return False
+        while self.running:
+            time.sleep(self.reconnect_delay)
+            self.capture.release()
+            self.capture = open_capture(self.source, self.scale)
+            if self.capture.isOpened():
+                self.reconnects += 1
+                return True
+        return False
+
+    def _run(self):
+        """
+        Boucle du thread de lecture : avance les frames, décode celles retenues par la
+        politique de saut et les place dans le tampon.
+        """
+        while self.running:
+            if not self.capture.grab():
+                if self._reconnect():
+                    continue
+                break
+
+            received = time.monotonic()
+            index = self.frames_read
+            timestamp = self._timestamp()
+            self.frames_read += 1
+
+            if self.skipper is not None and not self.skipper.should_process(index, timestamp):
+                # Frame écartée : pas de décodage
+                self.frames_skipped += 1
+                continue
+
+            ret, frame = self.capture.retrieve()
+            if not ret and getattr(self.capture, 'corrupt', False):
+                # Partie JPEG abîmée ou requête /capture échouée : la frame est perdue mais la source continue
+                self.frames_corrupt += 1
+                continue
+            if not ret:
+                if self._reconnect():
+                    continue
+                break
+            if getattr(self.capture, 'pull', False):
+                # Horodatage de l'image téléchargée (X-Timestamp), connu seulement après retrieve
+                timestamp = self._timestamp()
+            packet = FramePacket(index, timestamp, frame, received)
+            packet.mark('decoded')
+
+            with self.condition:
+                while len(self.buffer) >= self.buffer_size and self.running:
+                    if self.drop_oldest:
+                        # Jette la frame la plus ancienne pour garder la plus fraîche
+                        self.buffer.popleft()
+                        self.frames_dropped += 1
+                    else:
+                        # Attend que le consommateur libère une place
+                        self.condition.wait(0.1)
+                self.buffer.append(packet)
+                self.condition.notify_all()
+
+        with self.condition:
+            self.finished = True
+            self.condition.notify_all()
+
+    def read_packet(self, timeout=None):
+        """
+        Retourne le paquet le plus ancien du tampon en attendant si nécessaire.
+
+        :param timeout: Délai d'attente maximal en secondes (None pour attendre indéfiniment)
+        :return: FramePacket ou None en fin de flux / délai dépassé
+        """
+        if self.thread is None:
+            self.start()
+
+        with self.condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self.buffer and not self.finished:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+            if not self.buffer:
+                return None
+            packet = self.buffer.popleft()
+            self.condition.notify_all()
+            return packet
+
+    def read(self):
+        """
+        Lecture compatible avec cv2.VideoCapture.read().
+
+        :return: Tuple (ret, frame)
+        """
+        packet = self.read_packet()
+        if packet is None:
+            return False, None
+        return True, packet.image
+
+    def is_finished(self):
+        """
+        Indique si la source est terminée et que toutes ses frames ont été consommées.
+
+        :return: True si plus aucune frame ne sera disponible
+        """
+        with self.condition:
+            return self.finished and not self.buffer
+
+    def queue_depth(self):
+        """
+        Retourne le nombre de frames en attente dans le tampon.
+
+        :return: Profondeur de la file
+        """
+        with self.condition:
+            return len(self.buffer)
+
+    def stats(self):
+        """
+        Retourne les compteurs de la caméra.
+
+        :return: Dictionnaire des statistiques (frames lues, sautées, jetées, corrompues, reconnexions, profondeur de file)
+        """
+        return {
+            'name': self.name,
+            'frames_read': self.frames_read,
+            'frames_skipped': self.frames_skipped,
+            'frames_dropped': self.frames_dropped,
+            'frames_corrupt': self.frames_corrupt,
+            'reconnects': self.reconnects,
+            'queue_depth': self.queue_depth(),
+        }
+
+    def release(self):
+        """
+        Arrête le thread de lecture et libère la capture.
+        """
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+        self.capture.release()
@@ -0,0 +1,176 @@
+# Importation des bibliothèques nécessaires
+import math  # Arrondi du pas de traitement
+
+
+class StrideSkipper:
+    def __init__(self, fps_divider):
+        """
+        Politique de saut fixe : traite une frame sur `fps_divider`.
+
+        :param fps_divider: Diviseur du taux de traitement (1 pour tout traiter)
+        """
+        self.fps_divider = max(1, int(fps_divider))  # Pas de traitement
+
+    def should_process(self, index, timestamp):
+        """
+        Indique si la frame doit être décodée et traitée.
+
+        :param index: Numéro de la frame dans la source
+        :param timestamp: Instant de capture de la frame (en secondes)
+        :return: True si la frame doit être traitée
+        """
+        return index % self.fps_divider == 0
+
+
+class RateSkipper:
+    def __init__(self, target_fps):
+        """
+        Politique de saut temporelle : vise `target_fps` frames traitées par seconde.
+
+        :param target_fps: Nombre de frames traitées par seconde visé
+        """
+        if target_fps <= 0:
+            raise ValueError("target_fps doit être strictement positif")
+        self.target_fps = float(target_fps)  # Cadence de traitement visée
+        self.period = 1.0 / self.target_fps  # Intervalle minimal entre deux frames traitées
+        self.next_timestamp = None  # Instant à partir duquel la prochaine frame est traitée
+
+    def should_process(self, index, timestamp):
+        """
+        Indique si la frame doit être décodée et traitée.
+
+        :param index: Numéro de la frame dans la source
+        :param timestamp: Instant de capture de la frame (en secondes)
+        :return: True si la frame doit être traitée
+        """
+        if self.next_timestamp is None or timestamp >= self.next_timestamp:
+            # Avance l'échéance par pas fixes pour ne pas dériver, sans accumuler de retard
+            if self.next_timestamp is None or timestamp - self.next_timestamp > self.period:
+                self.next_timestamp = timestamp
+            self.next_timestamp += self.period
+            return True
+        return False
+
+
+class AdaptiveSkipper:
+    def __init__(self, target_latency=None, cpu_budget=1.0, max_stride=30, smoothing=0.2):
+        """
+        Politique de saut adaptative : ajuste le pas de traitement à la charge mesurée.
+
+        Le pas est le plus petit qui garde le temps de traitement sous le budget de calcul
+        (cadence d'arrivée x temps de traitement <= cpu_budget) : plein débit quand les frames
+        sont rapides à traiter, sauts progressifs quand elles deviennent coûteuses plutôt qu'un
+        retard qui s'accumule. Si une latence cible est fournie, le pas augmente tant que la
+        latence mesurée la dépasse et redescend quand elle est largement respectée.
+
+        Le pipeline doit appeler report après chaque frame traitée.
+
+        :param target_latency: Latence visée entre la réception et la fin du traitement (en secondes)
+        :param cpu_budget: Fraction du temps pouvant être passée à traiter cette source (1.0 = en continu)
+        :param max_stride: Pas maximal (une frame traitée sur max_stride au pire)
+        :param smoothing: Coefficient des moyennes glissantes exponentielles (0 < smoothing <= 1)
+        """
+        if cpu_budget <= 0:
+            raise ValueError("cpu_budget doit être strictement positif")
+        self.target_latency = target_latency  # Latence visée
+        self.cpu_budget = float(cpu_budget)  # Budget de calcul
+        self.max_stride = max(1, int(max_stride))  # Pas maximal
+        self.smoothing = smoothing  # Coefficient de lissage
+
+        self.stride = 1  # Pas de traitement courant
+        self.latency_stride = 1  # Pas imposé par la latence cible
+        self.incoming_fps = None  # Cadence d'arrivée des frames (lissée)
+        self.processing_time = None  # Temps de traitement d'une frame (lissé, en secondes)
+        self.latency = None  # Latence de bout en bout (lissée, en secondes)
+        self.last_timestamp = None  # Horodatage de la dernière frame reçue
+        self.last_processed = None  # Numéro de la dernière frame retenue
+
+    def _smooth(self, average, value):
+        """
+        Met à jour une moyenne glissante exponentielle.
+        """
+        if average is None:
+            return value
+        return average + self.smoothing * (value - average)
+
+    def should_process(self, index, timestamp):
+        """
+        Mesure la cadence d'arrivée et indique si la frame doit être décodée et traitée.
+
+        :param index: Numéro de la frame dans la source
+        :param timestamp: Instant de capture de la frame (en secondes)
+        :return: True si la frame doit être traitée
+        """
+        if self.last_timestamp is not None and timestamp > self.last_timestamp:
+            self.incoming_fps = self._smooth(self.incoming_fps, 1.0 / (timestamp - self.last_timestamp))
+        self.last_timestamp = timestamp
+
+        if self.last_processed is None or index - self.last_processed >= self.stride:
+            self.last_processed = index
+            return True
+        return False
+
+    def report(self, processing_time, latency=None):
+        """
+        Enregistre le coût d'une frame traitée et réajuste le pas.
+
+        :param processing_time: Temps de traitement de la frame (en secondes)
+        :param latency: Temps écoulé entre la réception de la frame et la fin de son traitement (en secondes)
+        """
+        self.processing_time = self._smooth(self.processing_time, processing_time)
+        if latency is not None:
+            self.latency = self._smooth(self.latency, latency)
+
+        stride = 1
+        if self.incoming_fps is not None:
+            # Frames arrivant pendant le traitement d'une frame, rapportées au budget
+            stride = math.ceil(self.incoming_fps * self.processing_time / self.cpu_budget - 1e-6)
+
+        if self.target_latency is not None and latency is not None:
+            if self.latency > self.target_latency:
+                self.latency_stride = min(self.max_stride, self.latency_stride + 1)
+            elif self.latency < 0.5 * self.target_latency:
+                self.latency_stride = max(1, self.latency_stride - 1)
+            stride = max(stride, self.latency_stride)
+
+        self.stride = min(self.max_stride, max(1, stride))
+
+    @property
+    def effective_fps(self):
+        """
+        Cadence de traitement courante (frames traitées par seconde), ou None tant qu'elle est inconnue.
+        """
+        if self.incoming_fps is None:
+            return None
+        return self.incoming_fps / self.stride
+
+    def stats(self):
+        """
+        Retourne l'état du contrôleur.
+
+        :return: Dictionnaire (pas, cadences d'arrivée et effective, temps de traitement et latence en ms)
+        """
+        return {
+            'stride': self.stride,
+            'incoming_fps': self.incoming_fps,
+            'effective_fps': self.effective_fps,
+            'processing_ms': 1000.0 * self.processing_time if self.processing_time is not None else None,
+            'latency_ms': 1000.0 * self.latency if self.latency is not None else None,
+        }
+
+
+def make_skipper(fps_divider=1, target_fps=None, target_latency=None, cpu_budget=1.0):
+    """
+    Construit la politique de saut correspondant aux paramètres des boucles.
+
+    :param fps_divider: Diviseur fixe du taux de traitement, ou None pour un pas adaptatif
+    :param target_fps: Cadence visée en frames traitées par seconde (prioritaire si fournie)
+    :param target_latency: Latence visée en secondes (pas adaptatif)
+    :param cpu_budget: Fraction du temps de calcul allouée à la source (pas adaptatif)
+    :return: Politique de saut
+    """
+    if target_fps is not None:
+        return RateSkipper(target_fps)
+    if fps_divider is None:
+        return AdaptiveSkipper(target_latency=target_latency, cpu_budget=cpu_budget)
+    return StrideSkipper(fps_divider)
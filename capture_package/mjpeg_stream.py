@@ -0,0 +1,278 @@
+# Importation des bibliothèques nécessaires
+import http.client  # Erreurs de réponse HTTP (flux coupé en cours de partie)
+import urllib.request  # Client HTTP de la bibliothèque standard
+
+import cv2  # OpenCV pour le décodage JPEG
+import numpy as np  # NumPy pour manipuler les octets JPEG
+
+# Décodages JPEG réduits (mise à l'échelle DCT de libjpeg, sans décoder la pleine résolution)
+REDUCED_DECODE_FLAGS = [
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+]
+
+
+def reduced_decode(scale):
+    """
+    Choisit le décodage JPEG réduit le plus petit qui reste au moins à l'échelle demandée.
+
+    :param scale: Facteur d'échelle voulu (ex. 0.5)
+    :return: Tuple (drapeau cv2.imdecode, facteur restant à appliquer par redimensionnement)
+    """
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if scale * factor <= 1.0 + 1e-6:
+            return flag, scale * factor
+    return cv2.IMREAD_COLOR, scale
+
+
+def decode_scaled(data, decode_flag, residual_scale):
+    """
+    Décode un JPEG avec le décodage réduit choisi par reduced_decode, puis applique le
+    redimensionnement restant.
+
+    :param data: Octets JPEG
+    :param decode_flag: Drapeau cv2.imdecode renvoyé par reduced_decode
+    :param residual_scale: Facteur restant renvoyé par reduced_decode
+    :return: Frame décodée à l'échelle demandée, ou None si le JPEG est illisible
+    """
+    frame = cv2.imdecode(np.frombuffer(data, np.uint8), decode_flag)
+    if frame is not None and abs(residual_scale - 1.0) > 1e-6:
+        # Échelle non atteignable par le seul décodage réduit
+        frame = cv2.resize(frame, None, fx=residual_scale, fy=residual_scale, interpolation=cv2.INTER_AREA)
+    return frame
+
+
+class MjpegStream:
+    def __init__(self, url, timeout=5.0, scale=1.0):
+        """
+        Client pour les flux MJPEG `multipart/x-mixed-replace` (ex. `/stream` de l'ESP32).
+
+        Expose la même interface que cv2.VideoCapture (grab / retrieve / read). `grab` ne lit
+        que les en-têtes de la partie suivante : le corps JPEG n'est lu et décodé que par
+        `retrieve`, et simplement sauté sans décodage si la frame n'est pas retenue.
+
+        Les frames sont décodées directement à l'échelle demandée : à 1/2, 1/4 ou 1/8 le
+        décodeur JPEG ne calcule que l'image réduite, sans décodage pleine taille ni resize.
+
+        :param url: URL du flux MJPEG
+        :param timeout: Délai d'attente réseau en secondes
+        :param scale: Échelle des frames décodées (1.0 pour la pleine résolution)
+        """
+        self.url = url  # URL du flux
+        self.timeout = timeout  # Délai d'attente réseau
+        self.scale = float(scale)  # Échelle des frames renvoyées par retrieve
+        self.decode_flag, self.residual_scale = reduced_decode(self.scale)  # Décodage réduit et reste
+        self.response = None  # Réponse HTTP en cours
+        self.boundary = None  # Délimiteur des parties (avec le préfixe '--')
+        self.pending_length = None  # Taille du corps JPEG non encore lu (None si déjà consommé)
+        self.pending_data = None  # Corps JPEG lu sans Content-Length
+        self.boundary_consumed = False  # Le délimiteur de la partie suivante a déjà été lu
+        self.headers = {}  # En-têtes de la partie courante
+        self.timestamp = None  # Horodatage caméra de la partie courante (X-Timestamp)
+        self.corrupt = False  # La dernière partie lue était tronquée ou illisible (le flux reste utilisable)
+        self.corrupt_frames = 0  # Parties JPEG tronquées ou illisibles, sautées
+        self.open()
+
+    def open(self):
+        """
+        Ouvre la connexion HTTP et lit le délimiteur annoncé par le serveur.
+
+        :return: True si le flux est ouvert
+        """
+        self.release()
+        try:
+            self.response = urllib.request.urlopen(self.url, timeout=self.timeout)
+        except OSError as e:
+            print(f"Erreur connexion flux MJPEG {self.url}: {e}")
+            self.response = None
+            return False
+
+        content_type = self.response.headers.get('Content-Type', '')
+        for param in content_type.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key.lower() == 'boundary':
+                value = value.strip('"')
+                if value.startswith('--'):
+                    value = value[2:]
+                self.boundary = b'--' + value.encode()
+        return True
+
+    def isOpened(self):
+        """
+        Indique si le flux est ouvert.
+
+        :return: True si la connexion HTTP est active
+        """
+        return self.response is not None
+
+    def _is_boundary(self, line):
+        """
+        Indique si la ligne est un délimiteur de partie.
+        """
+        if self.boundary is not None:
+            return line.startswith(self.boundary)
+        return line.startswith(b'--')
+
+    def _skip_pending(self):
+        """
+        Consomme sans le décoder le corps JPEG de la partie courante s'il n'a pas été lu.
+        """
+        if self.pending_length:
+            remaining = self.pending_length
+            while remaining > 0:
+                chunk = self.response.read(min(remaining, 65536))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        self.pending_length = None
+        self.pending_data = None
+
+    def _read_headers(self):
+        """
+        Avance jusqu'au prochain délimiteur puis lit les en-têtes de la partie.
+
+        :return: Dictionnaire des en-têtes (clés en minuscules) ou None en fin de flux
+        """
+        while not self.boundary_consumed:
+            line = self.response.readline()
+            if not line:
+                return None
+            if self._is_boundary(line.strip()):
+                break
+        self.boundary_consumed = False
+
+        headers = {}
+        while True:
+            line = self.response.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            key, _, value = line.partition(b':')
+            headers[key.strip().lower().decode('latin-1')] = value.strip().decode('latin-1')
+        return headers
+
+    def _read_until_boundary(self):
+        """
+        Lit un corps JPEG sans Content-Length en cherchant le délimiteur suivant.
+
+        :return: Octets du corps JPEG
+        """
+        data = bytearray()
+        while True:
+            line = self.response.readline()
+            if not line or self._is_boundary(line.strip()):
+                break
+            data += line
+        # Le délimiteur de la partie suivante a été consommé
+        self.boundary_consumed = bool(line)
+        return bytes(data).rstrip(b'\r\n')
+
+    def grab(self):
+        """
+        Passe à la partie suivante en ne lisant que ses en-têtes.
+
+        :return: True si une nouvelle partie est disponible
+        """
+        if self.response is None:
+            return False
+        try:
+            self._skip_pending()
+            headers = self._read_headers()
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Erreur lecture flux MJPEG {self.url}: {e}")
+            return False
+        if headers is None:
+            return False
+
+        self.headers = headers
+        timestamp = headers.get('x-timestamp')
+        self.timestamp = float(timestamp) if timestamp else None
+
+        length = headers.get('content-length')
+        if length is not None:
+            self.pending_length = int(length)
+        else:
+            self.pending_data = self._read_until_boundary()
+        return True
+
+    def retrieve_bytes(self):
+        """
+        Lit le corps JPEG de la partie courante sans le décoder.
+
+        :return: Octets JPEG ou None si indisponibles
+        """
+        if self.pending_data is not None:
+            data, self.pending_data = self.pending_data, None
+            return data
+        if not self.pending_length:
+            return None
+        try:
+            data = self.response.read(self.pending_length)
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Erreur lecture flux MJPEG {self.url}: {e}")
+            data = None
+        self.pending_length = None
+        return data
+
+    def retrieve(self):
+        """
+        Lit et décode le corps JPEG de la partie courante, à l'échelle du flux.
+
+        Une partie tronquée (sans marqueur de fin JPEG) ou illisible renvoie (False, None) avec
+        `corrupt` à True : le flux reste synchronisé et la partie suivante peut être lue.
+
+        :return: Tuple (ret, frame)
+        """
+        data = self.retrieve_bytes()
+        self.corrupt = False
+        if not data:
+            return False, None
+        frame = None
+        if data.startswith(b'\xff\xd8') and data.rstrip(b'\r\n').endswith(b'\xff\xd9'):
+            # Selon la version, libjpeg peut décoder une image tronquée en la complétant de gris : SOI/EOI vérifiés avant
+            frame = decode_scaled(data, self.decode_flag, self.residual_scale)
+        if frame is None:
+            self.corrupt = True
+            self.corrupt_frames += 1
+            return False, None
+        return True, frame
+
+    def read(self):
+        """
+        Lit et décode la partie suivante (grab + retrieve).
+
+        :return: Tuple (ret, frame)
+        """
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def set(self, prop_id, value):
+        """
+        Compatibilité avec cv2.VideoCapture.set (aucune propriété réglable).
+
+        :return: False
+        """
+        return False
+
+    def get(self, prop_id):
+        """
+        Compatibilité avec cv2.VideoCapture.get (aucune propriété exposée).
+
+        :return: 0.0
+        """
+        return 0.0
+
+    def release(self):
+        """
+        Ferme la connexion HTTP.
+        """
+        if self.response is not None:
+            self.response.close()
+        self.response = None
+        self.pending_length = None
+        self.pending_data = None
+        self.boundary_consumed = False
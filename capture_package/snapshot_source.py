@@ -0,0 +1,244 @@
+# Importation des bibliothèques nécessaires
+import http.client  # Client HTTP persistant (keep-alive)
+import threading  # Protection du pool de connexions
+import time  # Cadence des frames virtuelles
+from urllib.parse import urlsplit  # Découpage des URL
+
+import cv2  # OpenCV pour les propriétés de capture
+
+from .mjpeg_stream import reduced_decode, decode_scaled  # Décodage JPEG réduit
+
+
+def is_snapshot_url(source):
+    """
+    Indique si la source est un point d'accès d'image unique (ex. `/capture` de l'ESP32).
+
+    :param source: Chemin, URL ou index de la source vidéo
+    :return: True si la source est une URL HTTP se terminant par /capture
+    """
+    if not isinstance(source, str) or not source.lower().startswith(('http://', 'https://')):
+        return False
+    return urlsplit(source).path.rstrip('/').endswith('/capture')
+
+
+class ConnectionPool:
+    def __init__(self):
+        """
+        Pool de connexions HTTP persistantes, partagé par toutes les sources d'images.
+
+        Une connexion est empruntée le temps d'une requête puis rendue : les requêtes
+        successives vers une même caméra réutilisent la même connexion TCP, et plusieurs
+        caméras peuvent être interrogées en parallèle.
+        """
+        self.lock = threading.Lock()  # Accès concurrent des lecteurs
+        self.idle = {}  # Connexions libres par (schéma, hôte, port)
+        self.created = 0  # Connexions ouvertes
+        self.requests = 0  # Requêtes envoyées
+
+    def _acquire(self, key, timeout):
+        """
+        Emprunte une connexion libre ou en ouvre une nouvelle.
+        """
+        with self.lock:
+            connections = self.idle.get(key)
+            if connections:
+                return connections.pop()
+            self.created += 1
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(host, port, timeout=timeout)
+
+    def _release(self, key, connection):
+        """
+        Rend une connexion au pool.
+        """
+        with self.lock:
+            self.idle.setdefault(key, []).append(connection)
+
+    def get(self, url, timeout=5.0):
+        """
+        Envoie une requête GET en réutilisant une connexion persistante.
+
+        Une connexion fermée par le serveur entre deux requêtes est rouverte une fois.
+
+        :param url: URL demandée
+        :param timeout: Délai d'attente réseau en secondes
+        :return: Tuple (statut, en-têtes en minuscules, corps)
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        for attempt in range(2):
+            connection = self._acquire(key, timeout)
+            try:
+                connection.request('GET', path, headers={'Connection': 'keep-alive'})
+                response = connection.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                if attempt == 1:
+                    raise
+                continue
+            with self.lock:
+                self.requests += 1
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            return response.status, headers, body
+
+    def close(self):
+        """
+        Ferme toutes les connexions libres.
+        """
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle = {}
+
+    def stats(self):
+        """
+        Retourne les compteurs du pool.
+
+        :return: Dictionnaire (connexions ouvertes, requêtes envoyées)
+        """
+        return {'connections': self.created, 'requests': self.requests}
+
+
+pool = ConnectionPool()  # Pool partagé par les sources d'images
+
+
+class SnapshotSource:
+    pull = True  # La frame n'est téléchargée qu'au décodage : le lecteur ne doit pas en jeter
+
+    def __init__(self, url, fps=25.0, timeout=5.0, scale=1.0, connection_pool=None):
+        """
+        Source d'images en mode tiré : chaque frame est demandée au point d'accès `/capture`.
+
+        Expose la même interface que cv2.VideoCapture. `grab` ne fait qu'avancer une horloge de
+        frames virtuelles à `fps` images par seconde ; l'image n'est téléchargée que par
+        `retrieve`. Avec une politique de saut, seules les frames retenues sont demandées à la
+        caméra : rien n'est transféré puis jeté. Le FrameReader de chaque caméra télécharge la
+        frame suivante pendant le traitement de la courante, en parallèle des autres caméras.
+
+        :param url: URL du point d'accès (ex. http://<ip>/capture)
+        :param fps: Cadence des frames virtuelles (cadence nominale de la caméra)
+        :param timeout: Délai d'attente réseau en secondes
+        :param scale: Échelle des frames décodées (1.0 pour la pleine résolution)
+        :param connection_pool: ConnectionPool à utiliser (pool partagé par défaut)
+        """
+        self.url = url  # URL du point d'accès
+        self.period = 1.0 / fps  # Intervalle entre deux frames virtuelles
+        self.timeout = timeout  # Délai d'attente réseau
+        self.scale = float(scale)  # Échelle des frames renvoyées par retrieve
+        self.decode_flag, self.residual_scale = reduced_decode(self.scale)  # Décodage réduit et reste
+        self.pool = connection_pool if connection_pool is not None else pool  # Connexions persistantes
+        self.next_tick = None  # Instant de la prochaine frame virtuelle
+        self.opened = True  # Source utilisable
+        self.headers = {}  # En-têtes de la dernière image
+        self.timestamp = None  # Horodatage de la frame courante (X-Timestamp après retrieve)
+        self.corrupt = False  # La dernière requête a échoué (frame perdue, la suivante sera redemandée)
+        self.failed_requests = 0  # Requêtes échouées (réseau, statut HTTP, image illisible)
+
+    def isOpened(self):
+        """
+        Indique si la source est utilisable.
+
+        :return: True tant que la source n'a pas été libérée
+        """
+        return self.opened
+
+    def grab(self):
+        """
+        Attend la frame virtuelle suivante sans rien télécharger.
+
+        :return: True si la source est ouverte
+        """
+        if not self.opened:
+            return False
+        now = time.monotonic()
+        if self.next_tick is None or now - self.next_tick > self.period:
+            # Premier appel ou retard : repart de maintenant sans rattraper les frames manquées
+            self.next_tick = now
+        elif now < self.next_tick:
+            time.sleep(self.next_tick - now)
+        self.next_tick += self.period
+        self.timestamp = time.time()
+        return True
+
+    def retrieve_bytes(self):
+        """
+        Télécharge l'image courante sans la décoder.
+
+        :return: Octets JPEG ou None en cas d'erreur
+        """
+        try:
+            status, headers, body = self.pool.get(self.url, timeout=self.timeout)
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Erreur lecture image {self.url}: {e}")
+            return None
+        if status != 200:
+            print(f"Erreur lecture image {self.url}: HTTP {status}")
+            return None
+        self.headers = headers
+        timestamp = headers.get('x-timestamp')
+        if timestamp:
+            self.timestamp = float(timestamp)
+        return body
+
+    def retrieve(self):
+        """
+        Télécharge et décode l'image courante, à l'échelle de la source.
+
+        Sans flux à resynchroniser, un échec (délai dépassé, connexion coupée, statut HTTP
+        d'erreur, image illisible) ne perd que cette frame : (False, None) est renvoyé avec
+        `corrupt` à True et la frame virtuelle suivante est redemandée normalement.
+
+        :return: Tuple (ret, frame)
+        """
+        data = self.retrieve_bytes()
+        frame = decode_scaled(data, self.decode_flag, self.residual_scale) if data else None
+        self.corrupt = frame is None
+        if frame is None:
+            self.failed_requests += 1
+            return False, None
+        return True, frame
+
+    def read(self):
+        """
+        Attend la frame virtuelle suivante puis la télécharge (grab + retrieve).
+
+        :return: Tuple (ret, frame)
+        """
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def set(self, prop_id, value):
+        """
+        Compatibilité avec cv2.VideoCapture.set (aucune propriété réglable).
+
+        :return: False
+        """
+        return False
+
+    def get(self, prop_id):
+        """
+        Compatibilité avec cv2.VideoCapture.get : seule la cadence est exposée.
+
+        :return: Valeur de la propriété (0.0 si inconnue)
+        """
+        if prop_id == cv2.CAP_PROP_FPS:
+            return 1.0 / self.period
+        return 0.0
+
+    def release(self):
+        """
+        Arrête la source (les connexions restent dans le pool partagé).
+        """
+        self.opened = False
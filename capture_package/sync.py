@@ -0,0 +1,115 @@
+# Importation des bibliothèques nécessaires
+from collections import deque  # Files des frames en attente de partenaires
+from itertools import combinations  # Paires de caméras
+
+
+class FrameSynchronizer:
+    def __init__(self, n_cameras, tolerance=0.05, max_pending=4, offsets=None):
+        """
+        Apparie les frames de N caméras par horodatage de capture.
+
+        Un ensemble n'est formé que si toutes les caméras ont une frame à moins de `tolerance`
+        secondes les unes des autres. Une frame trop ancienne pour être appariée est jetée ;
+        une frame plus récente que celles des autres caméras est gardée en attente de ses
+        partenaires. Rien ne bloque : pop retourne None tant qu'aucun ensemble n'est complet.
+
+        Les horodatages doivent être comparables entre caméras (horloges ESP32 synchronisées par
+        SNTP, vidéos enregistrées simultanément) ; un décalage connu se corrige avec `offsets`.
+
+        :param n_cameras: Nombre de caméras
+        :param tolerance: Écart maximal en secondes entre les frames d'un même ensemble
+        :param max_pending: Frames gardées en attente par caméra (les plus anciennes sont jetées au-delà)
+        :param offsets: Décalage d'horloge ajouté aux horodatages de chaque caméra (en secondes)
+        """
+        self.n_cameras = n_cameras  # Nombre de caméras
+        self.tolerance = tolerance  # Fenêtre d'appariement
+        self.max_pending = max_pending  # Profondeur des files d'attente
+        self.offsets = list(offsets) if offsets is not None else [0.0] * n_cameras  # Décalages d'horloge
+        self.pending = [deque() for _ in range(n_cameras)]  # Frames en attente par caméra
+
+        # Compteurs
+        self.matched = 0  # Ensembles formés
+        self.dropped = [0] * n_cameras  # Frames jetées par caméra
+        self.skew_sum = {pair: 0.0 for pair in combinations(range(n_cameras), 2)}  # Somme des écarts par paire
+        self.skew_max = {pair: 0.0 for pair in self.skew_sum}  # Écart maximal par paire
+        self.last_skew = {pair: None for pair in self.skew_sum}  # Écart du dernier ensemble par paire
+
+    def _time(self, camera, packet):
+        """
+        Horodatage corrigé du décalage d'horloge de la caméra.
+        """
+        return packet.timestamp + self.offsets[camera]
+
+    def push(self, camera, packet):
+        """
+        Ajoute une frame reçue d'une caméra.
+
+        :param camera: Indice de la caméra
+        :param packet: FramePacket (timestamp en secondes)
+        """
+        queue = self.pending[camera]
+        if len(queue) >= self.max_pending:
+            queue.popleft()
+            self.dropped[camera] += 1
+        queue.append(packet)
+
+    def has_pending(self, camera):
+        """
+        Indique si une frame de la caméra attend un partenaire.
+        """
+        return bool(self.pending[camera])
+
+    def pop(self):
+        """
+        Retourne le prochain ensemble de frames appariées, sans attendre.
+
+        :return: Liste de FramePacket (une par caméra, dans l'ordre des caméras) ou None
+        """
+        while all(self.pending):
+            heads = [self._time(i, queue[0]) for i, queue in enumerate(self.pending)]
+            latest = max(heads)
+
+            # Jette les frames trop anciennes pour être appariées à la plus récente des têtes
+            stale = False
+            for i, queue in enumerate(self.pending):
+                if heads[i] < latest - self.tolerance:
+                    queue.popleft()
+                    self.dropped[i] += 1
+                    stale = True
+            if stale:
+                continue
+
+            packets = [queue.popleft() for queue in self.pending]
+            self._record_skew(heads)
+            return packets
+        return None
+
+    def _record_skew(self, times):
+        """
+        Met à jour les écarts par paire de caméras pour l'ensemble formé.
+        """
+        self.matched += 1
+        for i, j in self.skew_sum:
+            skew = abs(times[i] - times[j])
+            self.last_skew[(i, j)] = skew
+            self.skew_sum[(i, j)] += skew
+            self.skew_max[(i, j)] = max(self.skew_max[(i, j)], skew)
+
+    def stats(self):
+        """
+        Retourne les compteurs de synchronisation.
+
+        :return: Dictionnaire (ensembles formés, frames jetées par caméra, écarts moyen et maximal
+                 par paire de caméras en ms)
+        """
+        return {
+            'matched': self.matched,
+            'dropped': list(self.dropped),
+            'skew_ms': {
+                f"{i}-{j}": {
+                    'mean': 1000.0 * self.skew_sum[(i, j)] / self.matched if self.matched else 0.0,
+                    'max': 1000.0 * self.skew_max[(i, j)],
+                }
+                for i, j in self.skew_sum
+            },
+        }
@@ -0,0 +1,78 @@
+"""
+Benchmark of the two re-ID crop paths of Extractor on one frame:
+    slice:     numpy crop per box + batched uint8 resize (_preprocess)
+    roi_align: frame to tensor once + one batched RoIAlign call (_preprocess_boxes)
+
+usage: python -m deep_sort.deep.benchmark_crops [--weights checkpoint/ckpt.t7] [--boxes 40]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+import torch
+
+from .feature_extractor import Extractor
+from .model import Net
+
+
+def random_boxes(n, width, height, rng):
+    boxes = []
+    for _ in range(n):
+        w, h = rng.integers(20, 120), rng.integers(60, 300)
+        x1, y1 = rng.integers(0, width - w), rng.integers(0, height - h)
+        boxes.append((int(x1), int(y1), int(x1 + w), int(y1 + h)))
+    return boxes
+
+
+def time_ms(fn, repeat):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return 1000. * (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark slice vs RoIAlign re-ID crops")
+    parser.add_argument("--weights", default=None, type=str, help="checkpoint (random weights if omitted)")
+    parser.add_argument("--image", default=None, type=str, help="frame to crop from (random if omitted)")
+    parser.add_argument("--boxes", default=40, type=int)
+    parser.add_argument("--repeat", default=20, type=int)
+    parser.add_argument("--no-cuda", action="store_true")
+    args = parser.parse_args()
+
+    weights = args.weights
+    if weights is None:
+        weights = os.path.join(tempfile.mkdtemp(), "ckpt.t7")
+        torch.save({'net_dict': Net(reid=True).state_dict()}, weights)
+
+    rng = np.random.default_rng(0)
+    frame = cv2.imread(args.image) if args.image else rng.integers(0, 255, (720, 1280, 3), dtype=np.uint8)
+    height, width = frame.shape[:2]
+    boxes = random_boxes(args.boxes, width, height, rng)
+
+    extractors = {mode: Extractor(weights, use_cuda=not args.no_cuda, crop_mode=mode)
+                  for mode in Extractor.CROP_MODES}
+    slice_ex, roi_ex = extractors['slice'], extractors['roi_align']
+
+    def crops():
+        return [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+
+    print("device: {}, frame: {}x{}, boxes: {}".format(slice_ex.device, width, height, len(boxes)))
+    print("preprocess  slice: {:.2f} ms  roi_align: {:.2f} ms".format(
+        time_ms(lambda: slice_ex._preprocess(crops()), args.repeat),
+        time_ms(lambda: roi_ex._preprocess_boxes(frame, boxes), args.repeat)))
+    print("features    slice: {:.2f} ms  roi_align: {:.2f} ms".format(
+        time_ms(lambda: slice_ex(crops()), args.repeat),
+        time_ms(lambda: roi_ex(frame, boxes=boxes), args.repeat)))
+
+    a, b = slice_ex(crops()), roi_ex(frame, boxes=boxes)
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print("feature cosine similarity slice/roi_align: min {:.4f} mean {:.4f}".format(cosine.min(), cosine.mean()))
+
+
+if __name__ == '__main__':
+    main()
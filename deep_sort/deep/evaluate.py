@@ -1,13 +1,24 @@
+import argparse
+
 import torch
 
-features = torch.load("features.pth")
-qf = features["qf"]
-ql = features["ql"]
-gf = features["gf"]
-gl = features["gl"]
 
-scores = qf.mm(gf.t())
-res = scores.topk(5, dim=1)[1][:, 0]
-top1correct = gl[res].eq(ql).sum().item()
+def top1_accuracy(features):
+    qf = features["qf"]
+    ql = features["ql"]
+    gf = features["gf"]
+    gl = features["gl"]
+
+    scores = qf.mm(gf.t())
+    res = scores.topk(5, dim=1)[1][:, 0]
+    top1correct = gl[res].eq(ql).sum().item()
+    return top1correct / ql.size(0)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Rank-1 accuracy of features saved by test.py")
+    parser.add_argument("--features", default="features.pth", type=str)
+    args = parser.parse_args()
 
-print("Acc top1:{:.3f}".format(top1correct / ql.size(0)))
+    features = torch.load(args.features)
+    print("Acc top1:{:.3f}".format(top1_accuracy(features)))
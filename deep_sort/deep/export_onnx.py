@@ -0,0 +1,51 @@
+"""
+Export a re-ID checkpoint (deep_sort/deep/model.py Net, 'net_dict' as saved by train.py)
+to ONNX, for the ONNX Runtime backend of Extractor (pass the .onnx path as model_path).
+
+usage: python -m deep_sort.deep.export_onnx checkpoint/ckpt.t7 [--output checkpoint/ckpt.onnx]
+"""
+import argparse
+import inspect
+import os
+
+import torch
+
+from .model import Net
+
+INPUT_NAME = "input"
+OUTPUT_NAME = "features"
+
+
+def export_onnx(checkpoint, output=None, opset=17):
+    """
+    Export the re-ID branch of Net (features normalised to unit length) with a dynamic batch size.
+    Returns the path of the ONNX file.
+    """
+    if output is None:
+        output = os.path.splitext(checkpoint)[0] + ".onnx"
+    net = Net(reid=True)
+    net.load_state_dict(torch.load(checkpoint, map_location="cpu")['net_dict'])
+    net.eval()
+
+    dummy = torch.zeros(1, 3, 128, 64)
+    # recent torch defaults to the torch.export-based exporter; keep the TorchScript one
+    kwargs = {'dynamo': False} if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    torch.onnx.export(
+        net, dummy, output,
+        input_names=[INPUT_NAME], output_names=[OUTPUT_NAME],
+        dynamic_axes={INPUT_NAME: {0: "batch"}, OUTPUT_NAME: {0: "batch"}},
+        opset_version=opset, **kwargs)
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a re-ID checkpoint to ONNX")
+    parser.add_argument("checkpoint", type=str)
+    parser.add_argument("--output", default=None, type=str)
+    parser.add_argument("--opset", default=17, type=int)
+    args = parser.parse_args()
+    print("Exported to {}".format(export_onnx(args.checkpoint, args.output, args.opset)))
+
+
+if __name__ == '__main__':
+    main()
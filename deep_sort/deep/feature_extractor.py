@@ -1,5 +1,5 @@
 import torch
-import torchvision.transforms as transforms
+from torchvision.ops import roi_align
 import numpy as np
 import cv2
 import logging
@@ -8,41 +8,108 @@ from .model import Net
 
 
 class Extractor(object):
-    def __init__(self, model_path, use_cuda=True):
-        self.net = Net(reid=True)
-        self.device = "cuda" if torch.cuda.is_available() and use_cuda else "cpu"
-        state_dict = torch.load(model_path, map_location=torch.device(self.device))[
-            'net_dict']
-        self.net.load_state_dict(state_dict)
+    CROP_MODES = ('slice', 'roi_align')
+
+    def __init__(self, model_path, use_cuda=True, crop_mode='slice'):
+        """
+        model_path is a torch checkpoint ('net_dict' of model.Net), an .onnx file
+        exported by export_onnx.py (run by ONNX Runtime on the CPU), or a TorchScript .pt
+        file such as the int8 model saved by quantize.py (run on the CPU).
+
+        crop_mode selects how DeepSort builds the re-ID patches:
+            'slice': one numpy crop per box, resized on the CPU (_preprocess)
+            'roi_align': the frame is converted to a tensor once and every patch is
+                         sampled from the box list in a single RoIAlign call (_preprocess_boxes)
+        """
+        assert crop_mode in self.CROP_MODES, "unknown crop_mode {}".format(crop_mode)
+        self.crop_mode = crop_mode
         logger = logging.getLogger("root.tracker")
+        if model_path.endswith(".onnx"):
+            self.backend = "onnx"
+            self.net = None
+            self.device = "cpu"
+            self.session = self._onnx_session(model_path)
+            self.input_name = self.session.get_inputs()[0].name
+        elif model_path.endswith(".pt"):
+            self.backend = "torchscript"
+            self.device = "cpu"
+            self.net = torch.jit.load(model_path, map_location="cpu")
+            self.net.eval()
+        else:
+            self.backend = "torch"
+            self.net = Net(reid=True)
+            self.device = "cuda" if torch.cuda.is_available() and use_cuda else "cpu"
+            state_dict = torch.load(model_path, map_location=torch.device(self.device))[
+                'net_dict']
+            self.net.load_state_dict(state_dict)
+            self.net.to(self.device)
+            # inference: BatchNorm must use its running statistics
+            self.net.eval()
         logger.info("Loading weights from {}... Done!".format(model_path))
-        self.net.to(self.device)
         self.size = (64, 128)
-        self.norm = transforms.Compose([
-            transforms.ToTensor(),
-            transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225]),
-        ])
+        # x / 255 then Normalize folded into a single multiply-add, applied to the whole batch
+        mean = torch.tensor([0.485, 0.456, 0.406]).view(1, 3, 1, 1)
+        std = torch.tensor([0.229, 0.224, 0.225]).view(1, 3, 1, 1)
+        self._scale = (1. / (255. * std)).to(self.device)
+        self._shift = (-mean / std).to(self.device)
+        # uint8 NCHW buffer reused across calls, grown to the largest batch seen
+        self._buffer = np.empty((0, 3, self.size[1], self.size[0]), dtype=np.uint8)
+
+    @staticmethod
+    def _onnx_session(model_path):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("onnxruntime is required to run an .onnx re-ID model "
+                              "(pip install onnxruntime)") from e
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
 
     def _preprocess(self, im_crops):
         """
-        TODO:
-            1. to float with scale from 0 to 1
-            2. resize to (64, 128) as Market1501 dataset did
-            3. concatenate to a numpy array
-            3. to torch Tensor
-            4. normalize
+        Batched preprocessing:
+            1. resize each uint8 crop to (64, 128) as Market1501 dataset did,
+               straight into a preallocated NCHW uint8 buffer
+            2. to torch Tensor (no copy)
+            3. scale to [0, 1] and normalize in one vectorized op on the device
         """
-        def _resize(im, size):
-            return cv2.resize(im.astype(np.float32)/255., size)
+        n = len(im_crops)
+        if self._buffer.shape[0] < n:
+            self._buffer = np.empty((n, 3, self.size[1], self.size[0]), dtype=np.uint8)
+        for i, im in enumerate(im_crops):
+            self._buffer[i] = cv2.resize(im, self.size).transpose(2, 0, 1)
 
-        im_batch = torch.cat([self.norm(_resize(im, self.size)).unsqueeze(
-            0) for im in im_crops], dim=0).float()
-        return im_batch
+        im_batch = torch.from_numpy(self._buffer[:n]).to(self.device).float()
+        return im_batch.mul_(self._scale).add_(self._shift)
 
-    def __call__(self, im_crops):
-        im_batch = self._preprocess(im_crops)
+    def _preprocess_boxes(self, ori_img, boxes):
+        """
+        RoIAlign preprocessing:
+            1. uint8 frame to a (1, 3, H, W) float tensor on the device, once per frame
+            2. sample every (128, 64) patch from the (x1, y1, x2, y2) boxes in one batched call
+            3. scale to [0, 1] and normalize in one vectorized op
+        """
+        frame = torch.from_numpy(np.ascontiguousarray(ori_img)).to(self.device)
+        frame = frame.permute(2, 0, 1).unsqueeze(0).float()
+        rois = torch.zeros((len(boxes), 5), dtype=torch.float32)
+        rois[:, 1:] = torch.as_tensor(np.asarray(boxes, dtype=np.float32).reshape(-1, 4))
+        im_batch = roi_align(frame, rois.to(self.device), output_size=(self.size[1], self.size[0]),
+                             spatial_scale=1.0, sampling_ratio=1, aligned=True)
+        return im_batch.mul_(self._scale).add_(self._shift)
+
+    def __call__(self, im_crops, boxes=None):
+        """
+        Features of a list of crops, or of the (x1, y1, x2, y2) `boxes` of the frame
+        `im_crops` when boxes are given (RoIAlign path).
+        """
+        if boxes is not None:
+            im_batch = self._preprocess_boxes(im_crops, boxes)
+        else:
+            im_batch = self._preprocess(im_crops)
+        if self.backend == "onnx":
+            return self.session.run(None, {self.input_name: im_batch.numpy()})[0]
         with torch.no_grad():
-            im_batch = im_batch.to(self.device)
             features = self.net(im_batch)
         return features.cpu().numpy()
 
@@ -0,0 +1,130 @@
+"""
+Post-training static INT8 quantization of the re-ID Net for the CPU (FX graph mode).
+
+    1. calibrate the activation observers on crops of a folder in Market1501 layout
+       (ImageFolder, e.g. data/train as used by train.py)
+    2. save the quantized model as TorchScript (.pt), which Extractor and test.py load
+    3. report the per-crop latency of fp32 vs int8 and, with --evaluate, the rank-1
+       accuracy of both models through test.py and evaluate.py
+
+usage: python -m deep_sort.deep.quantize checkpoint/ckpt.t7 --data-dir data [--evaluate]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import torch
+import torchvision
+
+from .evaluate import top1_accuracy
+from .model import Net
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_net(checkpoint):
+    net = Net(reid=True)
+    net.load_state_dict(torch.load(checkpoint, map_location="cpu")['net_dict'])
+    return net.eval()
+
+
+def calibration_loader(data_dir, batch_size=64):
+    # same preprocessing as the test transform of train.py
+    transform = torchvision.transforms.Compose([
+        torchvision.transforms.Resize((128, 64)),
+        torchvision.transforms.ToTensor(),
+        torchvision.transforms.Normalize(
+            [0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
+    ])
+    return torch.utils.data.DataLoader(
+        torchvision.datasets.ImageFolder(data_dir, transform=transform),
+        batch_size=batch_size, shuffle=True
+    )
+
+
+def quantize_net(net, batches, backend="x86", max_batches=32):
+    """
+    Fuse conv/bn/relu, insert observers, run the calibration batches, then convert to int8.
+    `batches` yields input tensors (or (inputs, labels) pairs from a DataLoader).
+    The final L2 normalisation of the features stays in float.
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    torch.backends.quantized.engine = backend
+    example = torch.zeros(1, 3, 128, 64)
+    prepared = prepare_fx(net.eval(), get_default_qconfig_mapping(backend), (example,))
+    with torch.no_grad():
+        for i, batch in enumerate(batches):
+            if i >= max_batches:
+                break
+            inputs = batch[0] if isinstance(batch, (list, tuple)) else batch
+            prepared(inputs)
+    return convert_fx(prepared)
+
+
+def save_quantized(qnet, path):
+    example = torch.zeros(1, 3, 128, 64)
+    with torch.no_grad():
+        scripted = torch.jit.freeze(torch.jit.trace(qnet, example))
+    torch.jit.save(scripted, path)
+    return path
+
+
+def crop_latency(net, batch_size=16, repeat=10):
+    """
+    Mean inference time per crop in ms, on batches of `batch_size` crops.
+    """
+    inputs = torch.randn(batch_size, 3, 128, 64)
+    with torch.no_grad():
+        net(inputs)  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeat):
+            net(inputs)
+    return 1000. * (time.perf_counter() - start) / (repeat * batch_size)
+
+
+def rank1(checkpoint, data_dir):
+    """
+    Rank-1 accuracy of a checkpoint through the test.py / evaluate.py flow (query/gallery of data_dir).
+    """
+    output = os.path.join(tempfile.mkdtemp(), "features.pth")
+    subprocess.run([sys.executable, "test.py", "--data-dir", os.path.abspath(data_dir), "--no-cuda",
+                    "--checkpoint", os.path.abspath(checkpoint), "--output", output],
+                   cwd=HERE, check=True)
+    return top1_accuracy(torch.load(output))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INT8 static quantization of the re-ID model")
+    parser.add_argument("checkpoint", type=str)
+    parser.add_argument("--data-dir", default='data', type=str, help="Market1501 layout (train/, query/, gallery/)")
+    parser.add_argument("--calibration-dir", default=None, type=str, help="defaults to <data-dir>/train")
+    parser.add_argument("--calibration-batches", default=32, type=int)
+    parser.add_argument("--output", default=None, type=str)
+    parser.add_argument("--backend", default="x86", type=str, help="x86/fbgemm on PCs, qnnpack on ARM")
+    parser.add_argument("--evaluate", action="store_true", help="rank-1 on <data-dir>/query and gallery")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.checkpoint)[0] + "_int8.pt"
+    calibration_dir = args.calibration_dir or os.path.join(args.data_dir, "train")
+
+    net = load_net(args.checkpoint)
+    qnet = quantize_net(load_net(args.checkpoint), calibration_loader(calibration_dir),
+                        backend=args.backend, max_batches=args.calibration_batches)
+    save_quantized(qnet, output)
+    print("Saved int8 model to {}".format(output))
+
+    fp32_ms, int8_ms = crop_latency(net), crop_latency(torch.jit.load(output))
+    print("Latency per crop: fp32 {:.2f} ms, int8 {:.2f} ms ({:.1f}x)".format(fp32_ms, int8_ms, fp32_ms / int8_ms))
+
+    if args.evaluate:
+        fp32_acc, int8_acc = rank1(args.checkpoint, args.data_dir), rank1(output, args.data_dir)
+        print("Rank-1: fp32 {:.3f}, int8 {:.3f} (delta {:+.3f})".format(fp32_acc, int8_acc, int8_acc - fp32_acc))
+
+
+if __name__ == '__main__':
+    main()
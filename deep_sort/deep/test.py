@@ -11,11 +11,15 @@ parser = argparse.ArgumentParser(description="Train on market1501")
 parser.add_argument("--data-dir", default='data', type=str)
 parser.add_argument("--no-cuda", action="store_true")
 parser.add_argument("--gpu-id", default=0, type=int)
+parser.add_argument("--checkpoint", default="./checkpoint/ckpt.t7", type=str,
+                    help="torch checkpoint, or TorchScript .pt (e.g. int8 model from quantize.py)")
+parser.add_argument("--output", default="features.pth", type=str)
 args = parser.parse_args()
+quantized = args.checkpoint.endswith(".pt")
 
 # device
 device = "cuda:{}".format(
-    args.gpu_id) if torch.cuda.is_available() and not args.no_cuda else "cpu"
+    args.gpu_id) if torch.cuda.is_available() and not args.no_cuda and not quantized else "cpu"
 if torch.cuda.is_available() and not args.no_cuda:
     cudnn.benchmark = True
 
@@ -39,13 +43,17 @@ galleryloader = torch.utils.data.DataLoader(
 )
 
 # net definition
-net = Net(reid=True)
 assert os.path.isfile(
-    "./checkpoint/ckpt.t7"), "Error: no checkpoint file found!"
-print('Loading from checkpoint/ckpt.t7')
-checkpoint = torch.load("./checkpoint/ckpt.t7")
-net_dict = checkpoint['net_dict']
-net.load_state_dict(net_dict, strict=False)
+    args.checkpoint), "Error: no checkpoint file found!"
+print('Loading from {}'.format(args.checkpoint))
+if quantized:
+    # int8 kernels run on the CPU only
+    net = torch.jit.load(args.checkpoint, map_location="cpu")
+else:
+    net = Net(reid=True)
+    checkpoint = torch.load(args.checkpoint)
+    net_dict = checkpoint['net_dict']
+    net.load_state_dict(net_dict, strict=False)
 net.eval()
 net.to(device)
 
@@ -77,4 +85,4 @@ features = {
     "gf": gallery_features,
     "gl": gallery_labels
 }
-torch.save(features, "features.pth")
+torch.save(features, args.output)
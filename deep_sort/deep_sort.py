@@ -5,28 +5,50 @@ from .deep.feature_extractor import Extractor
 from .sort.nn_matching import NearestNeighborDistanceMetric
 from .sort.detection import Detection
 from .sort.tracker import Tracker
+from .sort.iou_matching import iou
 
 
 __all__ = ['DeepSort']
 
 
 class DeepSort(object):
-    def __init__(self, model_path, max_dist=0.2, min_confidence=0.3, nms_max_overlap=1.0, max_iou_distance=0.7, max_age=70, n_init=3, nn_budget=100, use_cuda=True):
+    def __init__(self, model_path, max_dist=0.2, min_confidence=0.3, nms_max_overlap=1.0, max_iou_distance=0.7, max_age=70, n_init=3, nn_budget=100, use_cuda=True, extractor=None, reuse_refresh=0, reuse_iou=0.9):
         self.min_confidence = min_confidence
         self.nms_max_overlap = nms_max_overlap
 
-        self.extractor = Extractor(model_path, use_cuda=use_cuda)
+        # a shared extractor (e.g. from model_registry) avoids loading the re-ID weights once per tracker
+        self.extractor = extractor if extractor is not None else Extractor(model_path, use_cuda=use_cuda)
 
         max_cosine_distance = max_dist
         metric = NearestNeighborDistanceMetric(
             "cosine", max_cosine_distance, nn_budget)
         self.tracker = Tracker(
             metric, max_iou_distance=max_iou_distance, max_age=max_age, n_init=n_init)
-
-    def update(self, bbox_xywh, confidences, ori_img):
+        # frames predicted without detections since the last update (static frames)
+        self.coasted = 0
+
+        # embedding reuse cache (disabled when reuse_refresh is 0): a detection matching the
+        # predicted box of an isolated confirmed track at IoU >= reuse_iou takes the last
+        # feature of the track, at most reuse_refresh frames in a row, instead of a re-ID pass
+        self.reuse_refresh = reuse_refresh
+        self.reuse_iou = reuse_iou
+        # track_id -> (reused feature, consecutive reuses)
+        self.reuse_counts = {}
+        self.reuse_lookups = 0
+        self.reuse_hits = 0
+
+    def update(self, bbox_xywh, confidences, ori_img, features=None):
+        """
+        Update the tracks with the detections of a frame. `features` may be supplied
+        (e.g. the last features of the tracks whose boxes were propagated by optical
+        flow) to skip the re-ID extraction.
+        """
         self.height, self.width = ori_img.shape[:2]
+        # predict first: the reuse cache compares detections with the predicted track boxes
+        self.tracker.predict()
         # generate detections
-        features = self._get_features(bbox_xywh, ori_img)
+        if features is None:
+            features = self._get_features(bbox_xywh, ori_img)
         bbox_tlwh = self._xywh_to_tlwh(bbox_xywh)
         detections = [Detection(bbox_tlwh[i], conf, features[i]) for i, conf in enumerate(
             confidences) if conf > self.min_confidence]
@@ -36,13 +58,33 @@ class DeepSort(object):
         scores = np.array([d.confidence for d in detections])
 
         # update tracker
-        self.tracker.predict()
         self.tracker.update(detections)
+        self.coasted = 0
+
+        return self._outputs(max_time_since_update=1)
 
+    def predict(self):
+        """
+        Advance the tracks by one frame without detections (e.g. static frame, detector skipped).
+        Tracks are not marked missed: the ones reported at the last update keep being reported
+        at their predicted position.
+        """
+        self.tracker.predict()
+        self.coasted += 1
+        return self._outputs(max_time_since_update=1 + self.coasted)
+
+    def track_features(self, track_ids):
+        """
+        Last appearance feature of each given track (per-track cache kept by Track.last_feature).
+        """
+        features = {track.track_id: track.last_feature for track in self.tracker.tracks}
+        return [features[track_id] for track_id in track_ids]
+
+    def _outputs(self, max_time_since_update):
         # output bbox identities
         outputs = []
         for track in self.tracker.tracks:
-            if not track.is_confirmed() or track.time_since_update > 1:
+            if not track.is_confirmed() or track.time_since_update > max_time_since_update:
                 continue
             box = track.to_tlwh()
             x1, y1, x2, y2 = self._tlwh_to_xyxy(box)
@@ -102,7 +144,70 @@ class DeepSort(object):
         h = int(y2 - y1)
         return t, l, w, h
 
+    def reuse_stats(self):
+        return {
+            'detections': self.reuse_lookups,
+            'reused': self.reuse_hits,
+            'hit_rate': self.reuse_hits / self.reuse_lookups if self.reuse_lookups else 0.0,
+        }
+
+    def _reusable_features(self, bbox_xywh):
+        """
+        Last embedding of the track matching each detection unambiguously, None otherwise.
+        Must be called after the tracker prediction of the current frame.
+        """
+        reused = [None] * len(bbox_xywh)
+        tracks = self.tracker.tracks
+        if self.reuse_refresh <= 0 or not tracks or len(bbox_xywh) == 0:
+            self.reuse_counts = {}
+            return reused
+
+        det_tlwh = self._xywh_to_tlwh(np.asarray(bbox_xywh, dtype=float))
+        track_tlwh = np.array([track.to_tlwh() for track in tracks])
+        overlaps = np.array([iou(box, track_tlwh) for box in det_tlwh])  # detections x tracks
+        track_overlaps = np.array([iou(box, track_tlwh) for box in track_tlwh])
+        np.fill_diagonal(track_overlaps, 0.)
+
+        counts = {}
+        for i in range(len(det_tlwh)):
+            j = int(np.argmax(overlaps[i]))
+            track = tracks[j]
+            if (overlaps[i, j] < self.reuse_iou or not track.is_confirmed()
+                    or track.time_since_update != 1 or track.last_feature is None):
+                continue
+            # ambiguous: another track near the detection or the track, or another detection on the track
+            if (np.count_nonzero(overlaps[i] > 0.) > 1 or track_overlaps[j].max(initial=0.) > 0.
+                    or np.count_nonzero(overlaps[:, j] > 0.) > 1):
+                continue
+            feature, n = self.reuse_counts.get(track.track_id, (None, 0))
+            n = n if feature is track.last_feature else 0
+            if n >= self.reuse_refresh:
+                continue  # forced refresh
+            reused[i] = track.last_feature
+            counts[track.track_id] = (track.last_feature, n + 1)
+        self.reuse_counts = counts
+        return reused
+
     def _get_features(self, bbox_xywh, ori_img):
+        reused = self._reusable_features(bbox_xywh)
+        self.reuse_lookups += len(reused)
+        missing = [i for i, feature in enumerate(reused) if feature is None]
+        self.reuse_hits += len(reused) - len(missing)
+        if len(missing) == len(reused):
+            return self._extract_features(bbox_xywh, ori_img)
+
+        features = list(reused)
+        if missing:
+            extracted = self._extract_features([bbox_xywh[i] for i in missing], ori_img)
+            for i, feature in zip(missing, extracted):
+                features[i] = feature
+        return features
+
+    def _extract_features(self, bbox_xywh, ori_img):
+        if getattr(self.extractor, 'crop_mode', 'slice') == 'roi_align':
+            # patches sampled from the whole frame in one call
+            boxes = [self._xywh_to_xyxy(box) for box in bbox_xywh]
+            return self.extractor(ori_img, boxes=boxes) if boxes else np.array([])
         im_crops = []
         for box in bbox_xywh:
             x1, y1, x2, y2 = self._xywh_to_xyxy(box)
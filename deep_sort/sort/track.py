@@ -60,6 +60,10 @@ class Track:
     features : List[ndarray]
         A cache of features. On each measurement update, the associated feature
         vector is added to this list.
+    last_feature : Optional[ndarray]
+        Feature vector of the last associated detection. It is kept after the
+        feature cache is flushed into the metric, so that boxes propagated
+        without a detector (e.g. optical flow) can reuse the track appearance.
 
     """
 
@@ -76,6 +80,7 @@ class Track:
         self.features = []
         if feature is not None:
             self.features.append(feature)
+        self.last_feature = feature
 
         self._n_init = n_init
         self._max_age = max_age
@@ -140,7 +145,10 @@ class Track:
         """
         self.mean, self.covariance = kf.update(
             self.mean, self.covariance, detection.to_xyah())
-        self.features.append(detection.feature)
+        # a reused feature (propagated box) is already in the gallery
+        if detection.feature is not self.last_feature:
+            self.features.append(detection.feature)
+        self.last_feature = detection.feature
 
         self.hits += 1
         self.time_since_update = 0
@@ -4,22 +4,25 @@ import numpy as np
 
 class MultiViewDisplay:
     def __init__(self, window_name="Multi-View Display", layout="2x2", show_titles=True, margin=10,
-                 window_size=(720, 720)):
+                 window_size=(720, 720), columns=None):
         """
         Initialise le gestionnaire d'affichage multi-vues.
 
         Args:
             window_name (str): Nom de la fenêtre
-            layout (str): '2x2' pour deux vidéos en haut et deux minimaps en dessous
+            layout (str): '2x2' pour deux vidéos en haut et deux minimaps en dessous,
+                'grid' pour un nombre quelconque de vues disposées en grille
             show_titles (bool): Afficher les titres des vues
             margin (int): Marge entre les frames en pixels
             window_size (tuple): Taille initiale de la fenêtre (largeur, hauteur)
+            columns (int): Nombre de colonnes de la grille (racine du nombre de vues par défaut)
         """
         self.window_name = window_name
         self.layout = layout
         self.show_titles = show_titles
         self.margin = margin
         self.window_size = window_size  # (width, height)
+        self.columns = columns
         self.view_titles = []
         self.view_count = 0
 
@@ -37,8 +40,13 @@ class MultiViewDisplay:
         Affiche les frames selon la configuration choisie.
 
         Args:
-            *frames: Liste des frames à afficher (doit contenir 4 frames: vidéo1, vidéo2, minimap1, minimap2)
+            *frames: Liste des frames à afficher (doit contenir 4 frames: vidéo1, vidéo2, minimap1, minimap2
+                en disposition '2x2', un nombre quelconque en disposition 'grid')
         """
+        if self.layout == "grid":
+            self._show(self._compose_grid(frames))
+            return
+
         if len(frames) != 4:
             raise ValueError(
                 f"Nombre de frames ({len(frames)}) doit être 4 (vidéo1, vidéo2, minimap1, minimap2)")
@@ -114,12 +122,52 @@ class MultiViewDisplay:
             # Combiner les deux lignes verticalement
             combined = self._combine_vertically([main_row, minimap_row])
         else:
-            raise ValueError("Layout non supporté. Utiliser '2x2'")
+            raise ValueError("Layout non supporté. Utiliser '2x2' ou 'grid'")
+
+        self._show(combined)
 
+    def _show(self, combined):
+        """Affiche l'image composée dans la fenêtre"""
         cv2.imshow(self.window_name, combined)
         # Maintenir la taille de la fenêtre
         cv2.resizeWindow(self.window_name, self.window_size[0], self.window_size[1])
 
+    def _compose_grid(self, frames):
+        """
+        Dispose un nombre quelconque de frames en grille.
+
+        Chaque frame est redimensionnée à la taille de la première, les cases vides sont noires.
+
+        Args:
+            frames: Liste des frames (None pour une case vide)
+
+        Returns:
+            numpy.ndarray: Image composée
+        """
+        if not frames:
+            return np.zeros((480, 640, 3), dtype=np.uint8)
+
+        columns = self.columns or int(np.ceil(np.sqrt(len(frames))))
+        reference = next((f for f in frames if f is not None), None)
+        h, w = reference.shape[:2] if reference is not None else (480, 640)
+
+        cells = []
+        for i, frame in enumerate(frames):
+            if frame is None:
+                frame = np.zeros((h, w, 3), dtype=np.uint8)
+            elif frame.shape[:2] != (h, w):
+                frame = cv2.resize(frame, (w, h))
+            if self.show_titles and i < len(self.view_titles):
+                frame = self._add_title(frame, self.view_titles[i])
+            cells.append(frame)
+
+        # Compléter la dernière ligne avec des cases vides
+        while len(cells) % columns:
+            cells.append(np.zeros((h, w, 3), dtype=np.uint8))
+
+        rows = [self._combine_horizontally(cells[i:i + columns]) for i in range(0, len(cells), columns)]
+        return self._combine_vertically(rows)
+
     def _add_title(self, frame, title):
         """Ajoute un titre à une frame"""
         frame = frame.copy()
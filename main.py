@@ -10,6 +10,8 @@ def main():
     #caméra IP
     input_stream_path = ('http://172.20.10.12/stream')
     input_stream_path2 = ('http://172.20.10.14:81/stream')
+    #caméra IP en mode tiré : une image /capture par frame traitée (rien n'est transféré puis jeté)
+    input_capture_path = ('http://172.20.10.14/capture')
 
     #vidéos de test
     videoTestHall1 = ('input_videos/hall1.mp4')
@@ -30,13 +32,16 @@ def main():
     keypointsDeuxVueCam2 = [int(k * videoScale) for k in [328, 372, 502, 173, 804, 260, 662, 499]]  # 2VueCam2
 
     #loop pour une vidéo
-    #multivisio.loop(videoTestHall2, keypointsHall2, fpsDivider=5, videoScale=videoScale)
+    #multivisio.loop(videoTestHall2, keypointsHall2, fpsDivider=None, videoScale=videoScale)
+    #fpsDivider=None : pas de traitement adapté à la charge mesurée (plein débit si la salle est vide)
     #multi-caméra
     #scénario 1 : deux cams qui filment deux zones
-    multivisio.loop2(DeuxZonesCam1, DeuxZonesCam2, keypointsDeuxZonesCam1, keypointsDeuxZonesCam2, fpsDivider=5, videoScale=videoScale)
+    #pipelined=True : la détection de la frame suivante chevauche le suivi et l'affichage de la frame courante
+    multivisio.loop2(DeuxZonesCam1, DeuxZonesCam2, keypointsDeuxZonesCam1, keypointsDeuxZonesCam2, fpsDivider=None, videoScale=videoScale,
+                     pipelined=True)
 
     #scénario 2 : deux cams filment une meme zone sous 2 angles différents
-    #multivisio.loop2_masked(DeuxVueCam1, DeuxVueCam2, keypointsDeuxVueCam1, keypointsDeuxVueCam2, fpsDivider=5, videoScale=videoScale)
+    #multivisio.loop2_masked(DeuxVueCam1, DeuxVueCam2, keypointsDeuxVueCam1, keypointsDeuxVueCam2, fpsDivider=None, videoScale=videoScale)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import threading
+import logging
+
+
+class SharedModel:
+    def __init__(self, model, name):
+        """Poignée d'inférence partagée entre caméras et threads.
+
+        Les appels sont sérialisés par un verrou : ni le prédicteur YOLO ni l'extracteur
+        DeepSort ne sont prévus pour des appels concurrents sur la même instance.
+
+        Args:
+            model: Modèle chargé (YOLO, Extractor...), appelable
+            name (str): Nom du modèle (clé du registre)
+        """
+        self.model = model
+        self.name = name
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        """Appelle le modèle sous verrou.
+
+        Returns:
+            Résultat du modèle
+        """
+        with self.lock:
+            self.calls += 1
+            return self.model(*args, **kwargs)
+
+    def __getattr__(self, item):
+        # Accès en lecture aux attributs du modèle (ex. extractor.size)
+        return getattr(self.model, item)
+
+
+class ModelRegistry:
+    def __init__(self):
+        """Registre des modèles chargés une seule fois par processus."""
+        self._models = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _get(self, key, loader):
+        """Retourne le modèle de clé donnée en le chargeant au premier appel.
+
+        Args:
+            key (tuple): Clé du modèle (type, chemin, options)
+            loader (callable): Fonction de chargement
+
+        Returns:
+            SharedModel: Poignée partagée
+        """
+        with self._lock:
+            if key not in self._models:
+                logging.getLogger("root.tracker").info("Chargement du modèle {}".format(key))
+                self._models[key] = SharedModel(loader(), name=str(key))
+                self.loads += 1
+            return self._models[key]
+
+    def get_detector(self, model_path):
+        """Retourne le détecteur YOLO partagé.
+
+        Args:
+            model_path (str): Chemin ou nom du modèle YOLO
+
+        Returns:
+            SharedModel: Poignée partagée sur le modèle YOLO
+        """
+        def load():
+            from ultralytics import YOLO
+            return YOLO(model_path)
+        return self._get(('detector', model_path), load)
+
+    def get_extractor(self, model_path, use_cuda=True, crop_mode='slice'):
+        """Retourne l'extracteur de re-ID DeepSort partagé.
+
+        Args:
+            model_path (str): Chemin vers les poids du réseau de re-ID
+            use_cuda (bool): Utiliser le GPU si disponible
+            crop_mode (str): Découpe des patchs de re-ID ('slice' crop par crop, 'roi_align' en un appel)
+
+        Returns:
+            SharedModel: Poignée partagée sur l'Extractor
+        """
+        def load():
+            from deep_sort.deep.feature_extractor import Extractor
+            return Extractor(model_path, use_cuda=use_cuda, crop_mode=crop_mode)
+        return self._get(('extractor', model_path, use_cuda, crop_mode), load)
+
+    def clear(self):
+        """Oublie tous les modèles chargés."""
+        with self._lock:
+            self._models = {}
+
+    def stats(self):
+        """Retourne le nombre de chargements et d'appels par modèle.
+
+        Returns:
+            dict: Statistiques du registre
+        """
+        with self._lock:
+            return {
+                'loads': self.loads,
+                'calls': {model.name: model.calls for model in self._models.values()},
+            }
+
+
+# Registre par défaut du processus
+registry = ModelRegistry()
+
+
+def get_detector(model_path):
+    """Retourne le détecteur YOLO partagé du registre par défaut."""
+    return registry.get_detector(model_path)
+
+
+def get_extractor(model_path, use_cuda=True, crop_mode='slice'):
+    """Retourne l'extracteur de re-ID partagé du registre par défaut."""
+    return registry.get_extractor(model_path, use_cuda=use_cuda, crop_mode=crop_mode)
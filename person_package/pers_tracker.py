@@ -1,21 +1,31 @@
-from ultralytics import YOLO  # Importation du modèle YOLO pour la détection d'objets
 import cv2  # Importation d'OpenCV pour le traitement d'image
 import numpy as np  # Importation de NumPy pour les opérations numériques
 from deep_sort.deep_sort import DeepSort  # Importation de DeepSort pour le suivi d'objets
+from model_registry import get_detector, get_extractor  # Importation du registre des modèles partagés
 import person_package as pp  # Importation du package personnalisé pour la gestion des personnes
+from utils.bbox_utils import boxes_to_detections  # Conversion des boîtes YOLO en détections DeepSort
 
 # Chemin vers les poids du modèle DeepSort
 DEEP_SORT_WEIGHTS = 'C:/Ensta/Tracking/wetransfer_deep_sort_2025-02-04_1256/deep_sort/deep/checkpoint/ckpt.t7'
 
 class PlayerTracker:
-    def __init__(self, model_path):
+    class_id = 0  # Classe COCO des personnes
+    conf = 0.5  # Seuil de confiance des détections
+
+    def __init__(self, model_path, extractor=None, feature_reuse=0, crop_mode='slice'):
         """
         Initialise une nouvelle instance de la classe PlayerTracker.
 
-        :param model_path: Chemin vers le modèle YOLO
+        :param model_path: Chemin vers le modèle YOLO (None si la détection est faite par un détecteur partagé)
+        :param extractor: Extracteur de re-ID à utiliser (celui du registre des modèles par défaut)
+        :param feature_reuse: Nombre maximal de frames consécutives réutilisant l'embedding d'une piste isolée (0 pour toujours extraire)
+        :param crop_mode: Découpe des patchs de re-ID de l'extracteur du registre ('slice' ou 'roi_align')
         """
-        self.model = YOLO(model_path)  # Charge le modèle YOLO
-        self.tracker = DeepSort(model_path=DEEP_SORT_WEIGHTS, max_age=30)  # Initialise DeepSort avec les poids spécifiés
+        self.model = get_detector(model_path) if model_path is not None else None  # Modèle YOLO partagé du registre
+        if extractor is None:
+            extractor = get_extractor(DEEP_SORT_WEIGHTS, crop_mode=crop_mode)  # Extracteur de re-ID partagé du registre
+        self.tracker = DeepSort(model_path=DEEP_SORT_WEIGHTS, max_age=30, extractor=extractor,
+                                reuse_refresh=feature_reuse)  # Initialise DeepSort avec l'extracteur partagé
         self.colors = {}  # Dictionnaire pour stocker les couleurs associées aux IDs des personnes
 
     def generate_color(self):
@@ -36,17 +46,26 @@ class PlayerTracker:
         :param keypoints: Points clés pour le mappage
         :return: Instance de PersPop mise à jour avec les personnes détectées
         """
-        pers_pop.clear()  # Vide la population actuelle de personnes
-
         # Effectue la détection avec le modèle YOLO
-        results = self.model(frame, classes=[0], conf=0.5, verbose=False)
+        results = self.model(frame, classes=[self.class_id], conf=self.conf, verbose=False)
 
         # Convertit les résultats en détections utilisables par DeepSort
-        detections = [
-            ([int((box[0] + box[2]) / 2), int((box[1] + box[3]) / 2), int(box[2] - box[0]), int(box[3] - box[1])],
-             float(box[4]), int(box[5]))
-            for box in results[0].boxes.data.tolist()
-        ]
+        detections = boxes_to_detections(results[0].boxes.data.tolist())
+
+        return self.update_frame(frame, detections, pers_pop, mini_map, keypoints)
+
+    def update_frame(self, frame, detections, pers_pop, mini_map, keypoints):
+        """
+        Suit les personnes à partir de détections déjà calculées (ex. par un détecteur partagé).
+
+        :param frame: Trame vidéo actuelle
+        :param detections: Détections ([xc, yc, w, h], confiance, classe) des personnes
+        :param pers_pop: Instance de PersPop pour gérer la population de personnes
+        :param mini_map: Carte miniature pour le suivi
+        :param keypoints: Points clés pour le mappage
+        :return: Instance de PersPop mise à jour avec les personnes détectées
+        """
+        pers_pop.clear()  # Vide la population actuelle de personnes
 
         if detections:
             # Prépare les boîtes englobantes et les confiances pour DeepSort
@@ -55,16 +74,63 @@ class PlayerTracker:
 
             # Met à jour les pistes avec DeepSort
             tracks = self.tracker.update(bboxes_xywh, confidences, frame)
+            self.__add_tracks(tracks, frame, pers_pop, mini_map, keypoints)
+
+        return pers_pop  # Retourne la population mise à jour
+
+    def coast_frame(self, frame, pers_pop, mini_map, keypoints):
+        """
+        Avance les pistes d'une frame sans détection (frame statique, détecteur évité).
+
+        :param frame: Trame vidéo actuelle
+        :param pers_pop: Instance de PersPop pour gérer la population de personnes
+        :param mini_map: Carte miniature pour le suivi
+        :param keypoints: Points clés pour le mappage
+        :return: Instance de PersPop avec les personnes à leur position prédite
+        """
+        pers_pop.clear()  # Vide la population actuelle de personnes
+        tracks = self.tracker.predict()  # Prédiction de Kalman seule
+        self.__add_tracks(tracks, frame, pers_pop, mini_map, keypoints)
+        return pers_pop
+
+    def propagate_frame(self, frame, boxes, track_ids, pers_pop, mini_map, keypoints):
+        """
+        Suit les personnes à partir de boîtes propagées par flot optique, sans réextraire leur apparence.
+
+        :param frame: Trame vidéo actuelle
+        :param boxes: Boîtes propagées (x1, y1, x2, y2)
+        :param track_ids: ID de la piste de chaque boîte
+        :param pers_pop: Instance de PersPop pour gérer la population de personnes
+        :param mini_map: Carte miniature pour le suivi
+        :param keypoints: Points clés pour le mappage
+        :return: Instance de PersPop mise à jour avec les personnes propagées
+        """
+        pers_pop.clear()  # Vide la population actuelle de personnes
 
-            for track in tracks:
-                track_id = int(track[4])  # Récupère l'ID de la piste
-                x1, y1, x2, y2 = map(int, track[:4])  # Récupère les coordonnées de la boîte englobante
+        if boxes:
+            # Boîtes au format xywh, confiance maximale et apparence mémorisée de chaque piste
+            bboxes_xywh = np.array([[(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1] for x1, y1, x2, y2 in boxes], dtype=float)
+            confidences = np.ones(len(boxes))
+            features = self.tracker.track_features(track_ids)
 
-                # Génère une couleur si l'ID n'en a pas encore une
-                if track_id not in self.colors:
-                    self.colors[track_id] = self.generate_color()
+            tracks = self.tracker.update(bboxes_xywh, confidences, frame, features=features)
+            self.__add_tracks(tracks, frame, pers_pop, mini_map, keypoints)
 
-                # Crée une instance de Person et l'ajoute à la population
-                pers_pop.add(pp.Person(id=track_id, bbox=[x1, y1, x2, y2], frame=frame, mini_map=mini_map, keypoints=keypoints))
+        return pers_pop
 
-        return pers_pop  # Retourne la population mise à jour
+    def __add_tracks(self, tracks, frame, pers_pop, mini_map, keypoints):
+        """
+        Ajoute les pistes DeepSort à la population.
+
+        :param tracks: Pistes (x1, y1, x2, y2, id) renvoyées par DeepSort
+        """
+        for track in tracks:
+            track_id = int(track[4])  # Récupère l'ID de la piste
+            x1, y1, x2, y2 = map(int, track[:4])  # Récupère les coordonnées de la boîte englobante
+
+            # Génère une couleur si l'ID n'en a pas encore une
+            if track_id not in self.colors:
+                self.colors[track_id] = self.generate_color()
+
+            # Crée une instance de Person et l'ajoute à la population
+            pers_pop.add(pp.Person(id=track_id, bbox=[x1, y1, x2, y2], frame=frame, mini_map=mini_map, keypoints=keypoints))
@@ -0,0 +1,12 @@
+from .camera_spec import CameraSpec
+from .camera_pipeline import CameraPipeline, CameraResult
+from .site import Site
+from .detection import SharedDetector, split_detections, floor_roi, roi_imgsz
+from .batching import BatchScheduler
+from .stages import Stage, StagedPipeline, STOP
+from .multiprocess import MultiProcessSite, SharedFrameRing, TrackRecord
+from .sinks import Sink, CallbackSink, FileSink, SocketSink, DisplaySink
+from .tracing import LatencyTracker, lineage, STAGES
+from .motion_gate import MotionGate
+from .flow_propagator import FlowPropagator
+from .ignore_mask import IgnoreMask
@@ -0,0 +1,118 @@
+# Importation des bibliothèques nécessaires
+import time  # Gestion de l'échéance d'attente
+
+
+class BatchScheduler:
+    def __init__(self, detector, max_wait=0.05, synchronizer=None):
+        """
+        Ordonnanceur regroupant les frames de toutes les caméras en un seul lot d'inférence par tick.
+
+        Chaque tick attend au plus `max_wait` secondes : une caméra dont la frame n'est pas
+        arrivée à l'échéance est simplement absente du lot, sans retarder les autres.
+
+        Avec un FrameSynchronizer, un lot ne contient que des frames capturées au même instant
+        (une par caméra) ; s'il n'est pas complet à l'échéance, le tick est vide.
+
+        :param detector: SharedDetector exposant detect_batch
+        :param max_wait: Attente maximale en secondes pour compléter un lot
+        :param synchronizer: FrameSynchronizer appariant les frames par horodatage (optionnel)
+        """
+        self.detector = detector  # Détecteur partagé
+        self.max_wait = max_wait  # Échéance d'un lot
+        self.synchronizer = synchronizer  # Appariement par horodatage
+
+        # Compteurs
+        self.batches = 0  # Lots envoyés au détecteur
+        self.frames = 0  # Frames détectées
+        self.late = 0  # Frames manquantes à l'échéance
+
+    def gather(self, pipelines):
+        """
+        Collecte les frames disponibles avant l'échéance.
+
+        :param pipelines: Liste de CameraPipeline
+        :return: Liste de couples (pipeline, FramePacket), ou None si l'une des sources est terminée
+        """
+        if self.synchronizer is not None:
+            return self._gather_synchronized(pipelines)
+
+        deadline = time.monotonic() + self.max_wait
+        due = []
+        for pipeline in pipelines:
+            packet = pipeline.read(timeout=max(0.0, deadline - time.monotonic()))
+            if packet is None:
+                if pipeline.reader.is_finished():
+                    return None
+                self.late += 1
+                continue
+            due.append((pipeline, packet))
+        return due
+
+    def _gather_synchronized(self, pipelines):
+        """
+        Collecte un ensemble de frames appariées par horodatage avant l'échéance.
+
+        Seules les caméras sans frame en attente dans le synchroniseur sont lues : les autres
+        frames restent dans le tampon de leur lecteur (aucune perte pour un fichier). Une caméra
+        sans frame disponible est attendue jusqu'à l'échéance.
+
+        :param pipelines: Liste de CameraPipeline
+        :return: Liste de couples (pipeline, FramePacket), liste vide à l'échéance, ou None si une source est terminée
+        """
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            for i, pipeline in enumerate(pipelines):
+                if not self.synchronizer.has_pending(i):
+                    packet = pipeline.read(timeout=0)
+                    if packet is not None:
+                        self.synchronizer.push(i, packet)
+
+            packets = self.synchronizer.pop()
+            if packets is not None:
+                return list(zip(pipelines, packets))
+
+            # Attend la première caméra à laquelle il manque une frame
+            for i, pipeline in enumerate(pipelines):
+                if self.synchronizer.has_pending(i):
+                    continue
+                if pipeline.reader.is_finished():
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.late += 1
+                    return []
+                packet = pipeline.read(timeout=remaining)
+                if packet is not None:
+                    self.synchronizer.push(i, packet)
+                break
+
+    def detect(self, frames, rois=None):
+        """
+        Lance la détection sur le lot de frames.
+
+        :param frames: Liste de frames prétraitées
+        :param rois: Régions de détection (x1, y1, x2, y2) ou None, une par frame (None pour les frames entières)
+        :return: Liste de dictionnaires {classe: détections}, dans l'ordre des frames
+        """
+        if not frames:
+            return []
+        self.batches += 1
+        self.frames += len(frames)
+        if rois is None:
+            return self.detector.detect_batch(frames)
+        return self.detector.detect_batch(frames, rois)
+
+    def stats(self):
+        """
+        Retourne les compteurs de l'ordonnanceur.
+
+        :return: Dictionnaire des statistiques (lots, taille moyenne, frames en retard)
+        """
+        stats = {
+            'batches': self.batches,
+            'mean_batch_size': self.frames / self.batches if self.batches else 0.0,
+            'late_frames': self.late,
+        }
+        if self.synchronizer is not None:
+            stats['sync'] = self.synchronizer.stats()
+        return stats
@@ -0,0 +1,384 @@
+# Importation des bibliothèques nécessaires
+import time  # Mesure de la latence des frames
+
+import cv2  # OpenCV pour le traitement d'image
+
+# Importation des modules personnalisés
+import suitcase_package as sp  # Gestion des valises
+import person_package as pp  # Gestion des personnes
+from utils import associate_objects  # Association personnes-valises
+from capture_package import FrameReader, negotiate_frame_size  # Lecteur de frames threadé, résolution du capteur
+from .detection import SharedDetector, floor_roi  # Détection unique personnes + valises, région du sol
+from .tracing import LatencyTracker, lineage  # Traçage de la latence des frames
+from .ignore_mask import IgnoreMask  # Zones ignorées de la caméra
+
+
+def _to_builtin(value):
+    """
+    Convertit une valeur NumPy (scalaire ou tableau) en type Python natif.
+    """
+    if value is None:
+        return None
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_to_builtin(v) for v in value]
+    return value
+
+
+def _track_to_dict(track_id, bbox, position):
+    """
+    Décrit un objet suivi : identifiant, boîte englobante et position sur la mini-carte.
+    """
+    return {'id': _to_builtin(track_id), 'bbox': _to_builtin(bbox), 'position': _to_builtin(position)}
+
+
+class CameraResult:
+    def __init__(self, pipeline, frame, suits, persons, lien_dict, packet=None):
+        """
+        Résultat du suivi d'une frame d'une caméra, figé pour pouvoir être rendu pendant que
+        la caméra traite déjà la frame suivante.
+
+        :param pipeline: CameraPipeline d'origine
+        :param frame: Frame redimensionnée
+        :param suits: Liste des valises suivies
+        :param persons: Liste des personnes suivies
+        :param lien_dict: Associations {id_valise: id_personne}
+        :param packet: FramePacket d'origine (indice, horodatage et instants de passage de la frame)
+        """
+        self.pipeline = pipeline  # Caméra d'origine
+        self.frame = frame  # Frame (annotée par draw)
+        self.suits = suits  # Valises suivies
+        self.persons = persons  # Personnes suivies
+        self.lien_dict = lien_dict  # Associations personnes-valises
+        self.index = packet.index if packet is not None else None  # Indice de la frame dans la source
+        self.timestamp = packet.timestamp if packet is not None else None  # Horodatage de la frame
+        self.received = packet.received if packet is not None else None  # Réception de la frame (horloge locale)
+        self.marks = packet.marks if packet is not None else {}  # Instants de passage dans chaque étape
+        self.latency = None  # Latence de bout en bout (en secondes), connue à la sortie
+
+    def mark(self, stage):
+        """
+        Note l'instant où la frame termine une étape.
+
+        :param stage: Nom de l'étape (voir tracing.STAGES)
+        """
+        self.marks[stage] = time.monotonic()
+
+    def draw(self):
+        """
+        Dessine les points clés et les boîtes sur la frame.
+
+        :return: Frame annotée
+        """
+        self.pipeline.mini_map.draw_keypoints_on_vid(self.frame, self.pipeline.keypoints)
+
+        for suit in self.suits:
+            suit.drawBBOX(self.frame, self.lien_dict, self.persons)
+
+        for pers in self.persons:
+            pers.drawBBOX(self.frame)
+
+        return self.frame
+
+    def to_dict(self):
+        """
+        Convertit le résultat en dictionnaire sérialisable (sans image), pour les sorties du site.
+
+        :return: Dictionnaire (caméra, frame, durée des étapes, valises avec leur propriétaire, personnes)
+        """
+        return {
+            'camera': self.pipeline.name,
+            'index': self.index,
+            'timestamp': self.timestamp,
+            'lineage_ms': lineage(self.marks),
+            'suitcases': [dict(_track_to_dict(suit.suit_id, suit.bbox, suit.get_converted_coord()),
+                               owner=_to_builtin(self.lien_dict.get(suit.suit_id)))
+                          for suit in self.suits],
+            'persons': [_track_to_dict(pers.hum_id, pers.bbox, pers.get_converted_coord())
+                        for pers in self.persons],
+        }
+
+    def draw_on_mini_map(self, img):
+        """
+        Place les objets suivis sur l'image de la mini-carte.
+
+        :param img: Image de la mini-carte
+        """
+        for suit in self.suits:
+            self.pipeline.mini_map.update(img, suit)
+
+        for pers in self.persons:
+            self.pipeline.mini_map.update(img, pers)
+
+
+class CameraPipeline:
+    def __init__(self, spec, mini_map, skipper=None, model_path='yolov10n', detector=None, motion_gate=None,
+                 propagator=None, detect_in_floor=False, feature_reuse=0, crop_mode='slice'):
+        """
+        Initialise la chaîne de traitement d'une caméra (capture, détection, suivi, association).
+
+        :param spec: CameraSpec décrivant la caméra
+        :param mini_map: Mini-carte sur laquelle projeter les objets (peut être partagée entre caméras)
+        :param skipper: Politique de saut des frames (voir capture_package.frame_skip)
+        :param model_path: Chemin vers le modèle YOLO
+        :param detector: SharedDetector à utiliser (un détecteur sur model_path par défaut)
+        :param motion_gate: MotionGate évitant la détection sur les frames statiques (None pour toujours détecter)
+        :param propagator: FlowPropagator pour ne détecter que les frames clés et propager les boîtes entre
+                           elles par flot optique (None pour détecter chaque frame)
+        :param detect_in_floor: Limiter la détection au rectangle englobant le quadrilatère du sol
+        :param feature_reuse: Nombre maximal de frames consécutives où une piste isolée réutilise son
+                              embedding de re-ID au lieu d'une extraction (0 pour toujours extraire)
+        :param crop_mode: Découpe des patchs de re-ID : 'slice' (crop par crop) ou 'roi_align' (un appel
+                          RoIAlign sur toute la frame, plutôt pour le GPU)
+        """
+        self.spec = spec  # Description de la caméra
+        self.name = spec.name  # Nom de la caméra
+        self.keypoints = list(spec.keypoints)  # Points clés du sol (dans la résolution traitée)
+        self.keypoints_size = spec.keypoints_size  # Résolution des points clés, à adapter à la première frame
+        self.mini_map = mini_map  # Mini-carte associée
+
+        # Résolution du capteur : la caméra envoie directement des frames proches de la résolution traitée
+        scale = spec.scale
+        if spec.negotiate and isinstance(spec.source, str) and spec.source.lower().startswith(('http://', 'https://')):
+            negotiated = negotiate_frame_size(spec.source, spec.scale)
+            if negotiated is not None:
+                target, size = negotiated
+                print(f"Cam {spec.name}: résolution {size[0]}x{size[1]} pour un traitement en {target[0]}x{target[1]}")
+                scale = min(target[0] / size[0], target[1] / size[1])
+                if self.keypoints_size is None:
+                    # Points clés donnés dans la résolution traitée attendue
+                    self.keypoints_size = target
+
+        # Zones ignorées, dans la résolution des points clés
+        self.ignore_mask = None
+        if spec.ignore_polygons:
+            self.ignore_mask = IgnoreMask(spec.ignore_polygons, size=self.keypoints_size, blackout=spec.blackout)
+
+        # Capture
+        self.skipper = skipper  # Politique de saut (informée du coût des frames si adaptative)
+        self.reader = FrameReader(spec.source, name=spec.name, skipper=skipper, scale=scale)
+        self.resize_scale = scale / self.reader.applied_scale  # Échelle restant à appliquer après décodage
+        if not self.reader.isOpened():
+            print(f"Erreur cam {spec.name}")
+
+        # Détecteur commun aux deux trackers (une seule inférence YOLO par frame)
+        self.detector = detector if detector is not None else SharedDetector(model_path)
+        self.motion_gate = motion_gate  # Porte de mouvement (détection évitée sur les frames statiques)
+        self.propagator = propagator  # Propagation des boîtes entre frames clés
+        self.detect_in_floor = detect_in_floor  # Détection limitée à la région du sol
+        self.roi = None  # Région de détection (calculée à la première frame)
+        self.roi_key = None  # Taille de frame et points clés de la région
+
+        # Trackers (sans modèle YOLO propre) et populations
+        self.suit_tracker = sp.SuitcaseTracker(model_path=None, feature_reuse=feature_reuse, crop_mode=crop_mode)
+        self.pers_tracker = pp.PlayerTracker(model_path=None, feature_reuse=feature_reuse, crop_mode=crop_mode)
+        self.feature_reuse = feature_reuse  # Réutilisation des embeddings des pistes isolées
+        self.suit_pop = sp.SuitPop()
+        self.pers_pop = pp.PersPop()
+        self.lien_dict = {}  # Associations {id_valise: id_personne} de la dernière frame
+        self.last_result = None  # Dernier résultat rendu (vue et objets de la caméra)
+        self.latency = LatencyTracker(live=self.reader.live)  # Latence glass-to-glass glissante
+
+    def start(self):
+        """
+        Démarre la capture.
+
+        :return: La chaîne elle-même (pour chaîner les appels)
+        """
+        self.reader.start()
+        return self
+
+    def read(self, timeout=None):
+        """
+        Lit la prochaine frame à traiter.
+
+        :param timeout: Délai d'attente maximal en secondes
+        :return: FramePacket ou None en fin de flux
+        """
+        packet = self.reader.read_packet(timeout)
+        if packet is not None:
+            packet.mark('dequeued')
+        return packet
+
+    def preprocess(self, frame):
+        """
+        Redimensionne la frame à la résolution de traitement (sauf si elle a été décodée à l'échelle).
+
+        :param frame: Frame décodée
+        :return: Frame redimensionnée
+        """
+        if self.resize_scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.resize_scale, fy=self.resize_scale,
+                               interpolation=cv2.INTER_CUBIC)
+        if self.keypoints_size is not None:
+            self._fit_keypoints(frame)
+        return frame
+
+    def _fit_keypoints(self, frame):
+        """
+        Remet les points clés à l'échelle de la résolution réellement reçue (une seule fois).
+
+        La négociation ne change pas la proportion du capteur : fx et fy sont égaux aux arrondis
+        près. Une proportion différente signale un autre champ de vue, qu'aucune mise à l'échelle
+        ne corrige.
+
+        :param frame: Première frame traitée
+        """
+        height, width = frame.shape[:2]
+        fx = width / self.keypoints_size[0]
+        fy = height / self.keypoints_size[1]
+        if abs(fx - fy) > 0.01 * max(fx, fy):
+            print(f"Cam {self.name}: proportion {width}x{height} différente de celle des points clés "
+                  f"{self.keypoints_size[0]}x{self.keypoints_size[1]}, points clés à vérifier")
+        self.keypoints = [int(round(k * (fx if i % 2 == 0 else fy))) for i, k in enumerate(self.keypoints)]
+        self.keypoints_size = None
+
+    def detection_roi(self, frame):
+        """
+        Région à laquelle limiter la détection : les points hors du quadrilatère du sol sont de
+        toute façon écartés à la projection sur la mini-carte.
+
+        :param frame: Frame redimensionnée
+        :return: Rectangle (x1, y1, x2, y2), ou None pour détecter sur toute la frame
+        """
+        if not self.detect_in_floor:
+            return None
+        key = (frame.shape[:2], tuple(self.keypoints))
+        if key != self.roi_key:
+            self.roi = floor_roi(self.keypoints, frame.shape)
+            self.roi_key = key
+        return self.roi
+
+    def detection_frame(self, frame):
+        """
+        Frame passée au détecteur (zones ignorées noircies si demandé).
+
+        :param frame: Frame redimensionnée
+        :return: Frame pour l'inférence
+        """
+        return self.ignore_mask.apply(frame) if self.ignore_mask is not None else frame
+
+    def should_detect(self, frame):
+        """
+        Indique si la frame doit passer par le détecteur (toujours, sans porte de mouvement ni frames clés).
+
+        :param frame: Frame redimensionnée
+        :return: False entre deux frames clés, ou si rien n'a bougé dans la zone au sol depuis la dernière détection
+        """
+        if self.propagator is None:
+            return self.motion_gate is None or self.motion_gate.should_detect(frame, self.keypoints)
+        # Décision prise une seule fois, à l'étape de détection (indépendante de l'avance du suivi)
+        detect = self.propagator.is_keyframe() and (
+            self.motion_gate is None or self.motion_gate.should_detect(frame, self.keypoints))
+        self.propagator.schedule(detect)
+        return detect
+
+    def track(self, frame, radius_in_pixel, packet=None):
+        """
+        Détecte et suit les valises et personnes, puis les associe.
+
+        :param frame: Frame redimensionnée
+        :param radius_in_pixel: Rayon d'association personnes-valises sur la mini-carte
+        :param packet: FramePacket d'origine
+        :return: CameraResult de la frame
+        """
+        detections = None
+        if self.should_detect(frame):
+            detections = self.detector.detect(self.detection_frame(frame), self.detection_roi(frame))
+        if packet is not None:
+            packet.mark('detected')
+        return self.track_detections(frame, detections, radius_in_pixel, packet)
+
+    def track_detections(self, frame, detections, radius_in_pixel, packet=None):
+        """
+        Suit les valises et personnes à partir de détections déjà calculées, puis les associe.
+
+        :param frame: Frame redimensionnée
+        :param detections: Dictionnaire {classe: détections} produit par le détecteur, ou None pour
+                           propager les boîtes par flot optique ou seulement avancer les trackers (frame statique)
+        :param radius_in_pixel: Rayon d'association personnes-valises sur la mini-carte
+        :param packet: FramePacket d'origine
+        :return: CameraResult figeant les objets de la frame (indépendant des frames suivantes)
+        """
+        if detections is not None and self.ignore_mask is not None:
+            detections = self.ignore_mask.filter(detections, frame.shape)
+        if detections is None and self.propagator is not None:
+            self._propagate(frame)
+        elif detections is None:
+            self.suit_pop = self.suit_tracker.coast_frame(frame, self.suit_pop, self.mini_map, self.keypoints)
+            self.pers_pop = self.pers_tracker.coast_frame(frame, self.pers_pop, self.mini_map, self.keypoints)
+        else:
+            self.suit_pop = self.suit_tracker.update_frame(frame, detections[self.suit_tracker.class_id],
+                                                           self.suit_pop, self.mini_map, self.keypoints)
+            self.pers_pop = self.pers_tracker.update_frame(frame, detections[self.pers_tracker.class_id],
+                                                           self.pers_pop, self.mini_map, self.keypoints)
+            if self.propagator is not None:
+                self.propagator.keyframe(frame)
+        if packet is not None:
+            packet.mark('tracked')
+        self.lien_dict = associate_objects(self.pers_pop, self.suit_pop, radius_in_pixel)
+        if packet is not None:
+            packet.mark('associated')
+        return CameraResult(self, frame, list(self.suit_pop), list(self.pers_pop), dict(self.lien_dict), packet)
+
+    def _propagate(self, frame):
+        """
+        Déplace les boîtes des valises et personnes suivies par flot optique et met à jour les
+        trackers avec ces boîtes, en réutilisant l'apparence mémorisée de chaque piste.
+
+        :param frame: Frame redimensionnée
+        """
+        suits, persons = list(self.suit_pop), list(self.pers_pop)
+        boxes = self.propagator.propagate(frame, [suit.bbox for suit in suits] + [pers.bbox for pers in persons])
+        suit_boxes, pers_boxes = boxes[:len(suits)], boxes[len(suits):]
+
+        kept = [(box, suit.suit_id) for box, suit in zip(suit_boxes, suits) if box is not None]
+        self.suit_pop = self.suit_tracker.propagate_frame(frame, [box for box, _ in kept], [i for _, i in kept],
+                                                          self.suit_pop, self.mini_map, self.keypoints)
+        kept = [(box, pers.hum_id) for box, pers in zip(pers_boxes, persons) if box is not None]
+        self.pers_pop = self.pers_tracker.propagate_frame(frame, [box for box, _ in kept], [i for _, i in kept],
+                                                          self.pers_pop, self.mini_map, self.keypoints)
+
+    def finish(self, result):
+        """
+        Marque la sortie d'un résultat et enregistre sa latence de bout en bout.
+
+        :param result: CameraResult transmis aux sorties
+        :return: Latence de la frame en secondes (None si elle n'est pas tracée)
+        """
+        if 'received' not in result.marks:
+            return None
+        result.mark('output')
+        result.latency = self.latency.record(result.marks, result.timestamp)
+        return result.latency
+
+    def report(self, processing_time, received=None):
+        """
+        Informe la politique de saut adaptative du coût d'une frame traitée.
+
+        :param processing_time: Temps de traitement de la frame (en secondes)
+        :param received: Instant de réception de la frame (time.monotonic()), pour la latence de bout en bout
+        """
+        if hasattr(self.skipper, 'report'):
+            latency = time.monotonic() - received if received is not None else None
+            self.skipper.report(processing_time, latency)
+
+    def release(self):
+        """
+        Libère la capture.
+        """
+        print(self.reader.stats())
+        print({'latency': self.latency.stats()})
+        if hasattr(self.skipper, 'stats'):
+            print(self.skipper.stats())
+        if self.motion_gate is not None:
+            print(self.motion_gate.stats())
+        if self.propagator is not None:
+            print(self.propagator.stats())
+        if self.ignore_mask is not None:
+            print(self.ignore_mask.stats())
+        if self.feature_reuse:
+            print({'feature_reuse': {'suitcases': self.suit_tracker.tracker.reuse_stats(),
+                                     'persons': self.pers_tracker.tracker.reuse_stats()}})
+        self.reader.release()
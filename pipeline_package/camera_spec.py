@@ -0,0 +1,34 @@
+class CameraSpec:
+    def __init__(self, source, keypoints, scale=1.0, name=None, keypoints_size=None, negotiate=True,
+                 ignore_polygons=None, blackout=False):
+        """
+        Décrit une caméra d'un site.
+
+        :param source: Chemin, URL ou index de la source vidéo
+        :param keypoints: Points clés du sol (8 valeurs x, y), dans la résolution traitée ou dans keypoints_size
+        :param scale: Facteur de mise à l'échelle appliqué aux frames avant traitement
+        :param name: Nom de la caméra (affichage et statistiques)
+        :param keypoints_size: Résolution (largeur, hauteur) dans laquelle les points clés sont donnés ;
+                               ils sont alors remis à l'échelle des frames qui arrivent
+        :param negotiate: Pour une caméra ESP32, demander au démarrage la résolution la plus proche
+                          de la résolution de traitement (via /control)
+        :param ignore_polygons: Zones à ignorer (écrans, affiches, miroirs) : liste de polygones [x0, y0, x1, y1, ...]
+                                dans la même résolution que les points clés
+        :param blackout: Noircir aussi les zones ignorées sur la frame passée au détecteur
+        """
+        self.source = source  # Source vidéo
+        self.keypoints = list(keypoints)  # Points clés du sol
+        self.scale = float(scale)  # Facteur de mise à l'échelle
+        self.name = name if name is not None else str(source)  # Nom de la caméra
+        self.keypoints_size = tuple(keypoints_size) if keypoints_size is not None else None  # Résolution des points clés
+        self.negotiate = negotiate  # Négociation de la résolution du capteur
+        self.ignore_polygons = [list(polygon) for polygon in ignore_polygons] if ignore_polygons else []  # Zones ignorées
+        self.blackout = blackout  # Zones ignorées noircies avant l'inférence
+
+    def __str__(self):
+        """
+        Retourne une représentation sous forme de chaîne de caractères de la caméra.
+
+        :return: Chaîne de caractères décrivant la caméra
+        """
+        return f"Camera {self.name} ({self.source}, scale {self.scale})"
@@ -0,0 +1,140 @@
+# Importation des bibliothèques nécessaires
+import math  # Arrondi des tailles d'entrée au pas du modèle
+
+# Importation des modules personnalisés
+from model_registry import get_detector  # Modèle YOLO partagé du registre
+from person_package.pers_tracker import PlayerTracker  # Classe et seuil des personnes
+from suitcase_package.suit_tracker import SuitcaseTracker  # Classe et seuil des valises
+from utils.bbox_utils import boxes_to_detections  # Conversion des boîtes YOLO en détections DeepSort
+
+# Seuils de confiance par classe COCO (personnes, valises)
+DEFAULT_CLASS_CONF = {
+    PlayerTracker.class_id: PlayerTracker.conf,
+    SuitcaseTracker.class_id: SuitcaseTracker.conf,
+}
+
+
+def split_detections(boxes, class_conf):
+    """
+    Répartit les boîtes d'une inférence multi-classes par classe en appliquant le seuil de chaque classe.
+
+    :param boxes: Lignes (x1, y1, x2, y2, confiance, classe) de results[0].boxes.data
+    :param class_conf: Dictionnaire {classe: seuil de confiance}
+    :return: Dictionnaire {classe: détections ([xc, yc, w, h], confiance, classe)}
+    """
+    detections = {class_id: [] for class_id in class_conf}
+    for detection in boxes_to_detections(boxes):
+        class_id = detection[2]
+        if class_id in class_conf and detection[1] >= class_conf[class_id]:
+            detections[class_id].append(detection)
+    return detections
+
+
+def floor_roi(keypoints, frame_shape, margin=0.05, head_room=0.5):
+    """
+    Région de détection d'une caméra : rectangle englobant le quadrilatère du sol, élargi pour
+    garder le corps des personnes debout sur le bord du fond de la zone.
+
+    :param keypoints: Points clés du sol [x0, y0, x1, y1, ...] dans la résolution de la frame
+    :param frame_shape: Forme de la frame (hauteur, largeur, ...)
+    :param margin: Marge à gauche, à droite et en bas, en fraction de la taille du quadrilatère
+    :param head_room: Marge au-dessus du quadrilatère, en fraction de sa hauteur
+    :return: Rectangle (x1, y1, x2, y2) dans la frame, ou None sans points clés
+    """
+    if len(keypoints) < 6:
+        return None
+    height, width = frame_shape[:2]
+    xs, ys = keypoints[0::2], keypoints[1::2]
+    quad_w, quad_h = max(xs) - min(xs), max(ys) - min(ys)
+    x1 = max(0, int(min(xs) - margin * quad_w))
+    x2 = min(width, int(math.ceil(max(xs) + margin * quad_w)))
+    y1 = max(0, int(min(ys) - head_room * quad_h))
+    y2 = min(height, int(math.ceil(max(ys) + margin * quad_h)))
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+def roi_imgsz(frame_shape, roi, imgsz=640, stride=32):
+    """
+    Taille d'entrée rectangulaire du modèle pour une région, à la même échelle que la frame entière.
+
+    La frame entière serait réduite pour que son plus grand côté fasse `imgsz` ; la région garde
+    cette échelle : moins de pixels à traiter, sans perte de résolution sur les objets.
+
+    :param frame_shape: Forme de la frame (hauteur, largeur, ...)
+    :param roi: Rectangle (x1, y1, x2, y2) de la région
+    :param imgsz: Taille d'entrée du modèle pour la frame entière
+    :param stride: Pas du modèle (les côtés de l'entrée en sont des multiples)
+    :return: Taille d'entrée (hauteur, largeur)
+    """
+    scale = imgsz / max(frame_shape[:2])
+    x1, y1, x2, y2 = roi
+    height = min(imgsz, stride * math.ceil((y2 - y1) * scale / stride))
+    width = min(imgsz, stride * math.ceil((x2 - x1) * scale / stride))
+    return height, width
+
+
+class SharedDetector:
+    def __init__(self, model_path='yolov10n', class_conf=None, imgsz=640):
+        """
+        Détecteur effectuant une seule inférence YOLO par frame pour toutes les classes suivies.
+
+        L'inférence est lancée avec le plus petit des seuils, puis chaque classe est filtrée
+        avec son propre seuil avant d'être distribuée aux trackers.
+
+        :param model_path: Chemin vers le modèle YOLO
+        :param class_conf: Dictionnaire {classe: seuil de confiance} (personnes à 0.5 et valises à 0.1 par défaut)
+        :param imgsz: Taille d'entrée du modèle pour une frame entière
+        """
+        self.model = get_detector(model_path)  # Modèle YOLO partagé entre les caméras
+        self.class_conf = dict(class_conf) if class_conf is not None else dict(DEFAULT_CLASS_CONF)  # Seuils par classe
+        self.classes = list(self.class_conf)  # Classes détectées
+        self.min_conf = min(self.class_conf.values())  # Seuil de l'inférence
+        self.imgsz = imgsz  # Taille d'entrée pour une frame entière
+
+    def detect(self, frame, roi=None):
+        """
+        Détecte les objets de toutes les classes suivies en une seule inférence.
+
+        :param frame: Trame vidéo actuelle
+        :param roi: Région (x1, y1, x2, y2) à laquelle limiter la détection (None pour la frame entière)
+        :return: Dictionnaire {classe: détections ([xc, yc, w, h], confiance, classe)}
+        """
+        return self.detect_batch([frame], [roi])[0]
+
+    def detect_batch(self, frames, rois=None):
+        """
+        Détecte les objets sur plusieurs frames (de caméras différentes) en une seule inférence par lot.
+
+        Avec des régions, chaque frame est recadrée sur sa région et le modèle tourne à une taille
+        d'entrée rectangulaire couvrant les régions du lot ; les boîtes sont ramenées dans les
+        coordonnées de la frame.
+
+        :param frames: Liste de trames vidéo
+        :param rois: Liste de régions (x1, y1, x2, y2) ou None (frame entière), une par frame
+        :return: Liste de dictionnaires {classe: détections}, dans l'ordre des frames
+        """
+        if not frames:
+            return []
+        if rois is None or all(roi is None for roi in rois):
+            results = self.model(list(frames), classes=self.classes, conf=self.min_conf, verbose=False)
+            return [split_detections(result.boxes.data.tolist(), self.class_conf) for result in results]
+
+        crops, offsets, sizes = [], [], []
+        for frame, roi in zip(frames, rois):
+            if roi is None:
+                roi = (0, 0, frame.shape[1], frame.shape[0])
+            x1, y1, x2, y2 = roi
+            crops.append(frame[y1:y2, x1:x2])
+            offsets.append((x1, y1))
+            sizes.append(roi_imgsz(frame.shape, roi, self.imgsz))
+        imgsz = [max(size[0] for size in sizes), max(size[1] for size in sizes)]
+
+        results = self.model(crops, imgsz=imgsz, classes=self.classes, conf=self.min_conf, verbose=False)
+        detections = []
+        for result, (dx, dy) in zip(results, offsets):
+            boxes = [[x1 + dx, y1 + dy, x2 + dx, y2 + dy, conf, cls]
+                     for x1, y1, x2, y2, conf, cls in result.boxes.data.tolist()]
+            detections.append(split_detections(boxes, self.class_conf))
+        return detections
@@ -0,0 +1,126 @@
+# Importation des bibliothèques nécessaires
+import cv2  # OpenCV pour le flot optique de Lucas-Kanade
+import numpy as np  # NumPy pour les points suivis
+
+
+class FlowPropagator:
+    def __init__(self, keyframe_interval=5, grid=3, win_size=21, max_level=2, min_points=3):
+        """
+        Propagation des boîtes entre deux détections par flot optique épars (Lucas-Kanade).
+
+        YOLO ne tourne que sur les frames clés (une toutes les `keyframe_interval`). Entre deux,
+        une grille de `grid` x `grid` points de chaque boîte est suivie d'une frame à la
+        suivante ; la boîte est déplacée du déplacement médian des points et mise à l'échelle
+        du rapport médian de leurs écartements.
+
+        Le choix des frames clés (is_keyframe, schedule) appartient à l'étape de détection et ne
+        dépend pas du suivi : en mode pipeline, la détection peut avoir plusieurs frames d'avance.
+
+        :param keyframe_interval: Une frame clé (détection) toutes les keyframe_interval frames
+        :param grid: Nombre de points par côté de la grille suivie dans chaque boîte
+        :param win_size: Taille de la fenêtre de recherche de Lucas-Kanade
+        :param max_level: Nombre de niveaux de la pyramide de Lucas-Kanade
+        :param min_points: Nombre minimal de points suivis pour propager une boîte
+        """
+        self.keyframe_interval = keyframe_interval  # Période des frames clés
+        self.grid = grid  # Points par côté de la grille
+        self.lk_params = dict(winSize=(win_size, win_size), maxLevel=max_level,
+                              criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        self.min_points = min_points  # Points suivis nécessaires
+        self.previous = None  # Frame précédente en niveaux de gris
+        self.since_keyframe = None  # Frames non détectées depuis la dernière frame clé (None avant la première)
+        self.keyframes = 0  # Frames clés (détections)
+        self.propagated = 0  # Frames propagées sans détection
+        self.lost = 0  # Boîtes perdues par le flot optique
+
+    def is_keyframe(self):
+        """
+        Indique si la prochaine frame doit être détectée.
+
+        :return: True avant la première frame clé ou quand la période des frames clés est écoulée
+        """
+        return self.since_keyframe is None or self.since_keyframe + 1 >= self.keyframe_interval
+
+    def schedule(self, detected):
+        """
+        Enregistre la décision de l'étape de détection pour une frame.
+
+        :param detected: La frame passe par le détecteur (frame clé)
+        """
+        if detected:
+            self.since_keyframe = 0
+        elif self.since_keyframe is not None:
+            self.since_keyframe += 1
+
+    def keyframe(self, frame):
+        """
+        Enregistre une frame détectée comme référence du flot optique.
+
+        :param frame: Frame redimensionnée (BGR)
+        """
+        self.previous = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        self.keyframes += 1
+
+    def _grid_points(self, box):
+        """
+        Points de la grille suivie dans une boîte (resserrée pour éviter le fond).
+        """
+        x1, y1, x2, y2 = box
+        margin_x, margin_y = 0.2 * (x2 - x1), 0.2 * (y2 - y1)
+        xs = np.linspace(x1 + margin_x, x2 - margin_x, self.grid)
+        ys = np.linspace(y1 + margin_y, y2 - margin_y, self.grid)
+        return np.array([(x, y) for y in ys for x in xs], dtype=np.float32)
+
+    def propagate(self, frame, boxes):
+        """
+        Déplace les boîtes de la frame précédente vers la frame courante.
+
+        :param frame: Frame redimensionnée (BGR)
+        :param boxes: Liste de boîtes (x1, y1, x2, y2) dans la frame précédente
+        :return: Liste de boîtes (x1, y1, x2, y2) dans la frame courante, None pour une boîte perdue
+        """
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        propagated = []
+        if boxes and self.previous is not None:
+            points = np.concatenate([self._grid_points(box) for box in boxes]).reshape(-1, 1, 2)
+            moved, status, _ = cv2.calcOpticalFlowPyrLK(self.previous, grey, points, None, **self.lk_params)
+            per_box = self.grid * self.grid
+            for i, box in enumerate(boxes):
+                found = status[i * per_box:(i + 1) * per_box, 0] == 1
+                if np.count_nonzero(found) < self.min_points:
+                    propagated.append(None)
+                    self.lost += 1
+                    continue
+                before = points[i * per_box:(i + 1) * per_box, 0][found]
+                after = moved[i * per_box:(i + 1) * per_box, 0][found]
+                propagated.append(self._move_box(box, before, after))
+
+        self.previous = grey
+        self.propagated += 1
+        return propagated
+
+    @staticmethod
+    def _move_box(box, before, after):
+        """
+        Applique à la boîte le déplacement médian et le changement d'échelle médian des points.
+        """
+        dx, dy = np.median(after - before, axis=0)
+        scale = 1.0
+        if len(before) > 1:
+            spread_before = np.linalg.norm(before - before.mean(axis=0), axis=1)
+            spread_after = np.linalg.norm(after - after.mean(axis=0), axis=1)
+            valid = spread_before > 1e-3
+            if valid.any():
+                scale = float(np.clip(np.median(spread_after[valid] / spread_before[valid]), 0.5, 2.0))
+        x1, y1, x2, y2 = box
+        cx, cy = (x1 + x2) / 2 + dx, (y1 + y2) / 2 + dy
+        w, h = (x2 - x1) * scale, (y2 - y1) * scale
+        return [cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2]
+
+    def stats(self):
+        """
+        Retourne les compteurs de propagation.
+
+        :return: Dictionnaire (frames clés, frames propagées, boîtes perdues)
+        """
+        return {'keyframes': self.keyframes, 'propagated': self.propagated, 'lost_boxes': self.lost}
@@ -0,0 +1,81 @@
+# Importation des bibliothèques nécessaires
+import cv2  # OpenCV pour le remplissage des polygones
+import numpy as np  # NumPy pour le test vectorisé des boîtes
+
+
+class IgnoreMask:
+    def __init__(self, polygons, size=None, blackout=False):
+        """
+        Zones ignorées d'une caméra (écrans, affiches, miroirs) qui produisent de fausses détections.
+
+        Les polygones sont rasterisés une fois par taille de frame ; une détection dont le centre
+        tombe dans une zone est écartée avant DeepSort (ni crop de re-ID, ni piste fantôme).
+
+        :param polygons: Liste de polygones, chacun une liste de valeurs [x0, y0, x1, y1, ...]
+        :param size: Résolution (largeur, hauteur) des polygones, ou None s'ils sont dans la résolution traitée
+        :param blackout: Noircir aussi les zones sur la frame passée au détecteur
+        """
+        self.polygons = [np.array(polygon, dtype=float).reshape(-1, 2) for polygon in polygons]  # Polygones (x, y)
+        self.size = tuple(size) if size is not None else None  # Résolution des polygones
+        self.blackout = blackout  # Zones noircies avant l'inférence
+        self.raster = None  # Masque booléen des zones (True = ignoré), à la taille des frames
+        self.filtered = 0  # Détections écartées
+
+    def _raster(self, frame_shape):
+        """
+        Rasterise les polygones à la taille de la frame (recalculé seulement si elle change).
+        """
+        height, width = frame_shape[:2]
+        if self.raster is not None and self.raster.shape == (height, width):
+            return self.raster
+        fx, fy = (width / self.size[0], height / self.size[1]) if self.size is not None else (1.0, 1.0)
+        raster = np.zeros((height, width), np.uint8)
+        polygons = [np.round(polygon * (fx, fy)).astype(np.int32) for polygon in self.polygons]
+        if polygons:
+            cv2.fillPoly(raster, polygons, 1)
+        self.raster = raster.astype(bool)
+        return self.raster
+
+    def apply(self, frame):
+        """
+        Noircit les zones ignorées sur une copie de la frame, si demandé.
+
+        :param frame: Frame redimensionnée
+        :return: Frame à passer au détecteur (la frame elle-même sans noircissement)
+        """
+        if not self.blackout or not self.polygons:
+            return frame
+        masked = frame.copy()
+        masked[self._raster(frame.shape)] = 0
+        return masked
+
+    def filter(self, detections, frame_shape):
+        """
+        Écarte les détections dont le centre est dans une zone ignorée.
+
+        :param detections: Dictionnaire {classe: détections ([xc, yc, w, h], confiance, classe)}
+        :param frame_shape: Forme de la frame des détections
+        :return: Dictionnaire {classe: détections gardées}
+        """
+        raster = self._raster(frame_shape)
+        height, width = raster.shape
+        kept = {}
+        for class_id, class_detections in detections.items():
+            if not class_detections:
+                kept[class_id] = class_detections
+                continue
+            centers = np.array([detection[0][:2] for detection in class_detections], dtype=float)
+            xs = np.clip(centers[:, 0].astype(int), 0, width - 1)
+            ys = np.clip(centers[:, 1].astype(int), 0, height - 1)
+            ignored = raster[ys, xs]
+            self.filtered += int(np.count_nonzero(ignored))
+            kept[class_id] = [detection for detection, skip in zip(class_detections, ignored) if not skip]
+        return kept
+
+    def stats(self):
+        """
+        Retourne les compteurs du masque.
+
+        :return: Dictionnaire (détections écartées)
+        """
+        return {'ignored_detections': self.filtered}
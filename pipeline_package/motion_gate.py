@@ -0,0 +1,98 @@
+# Importation des bibliothèques nécessaires
+import cv2  # OpenCV pour la différence d'images
+import numpy as np  # NumPy pour le masque de la zone au sol
+
+
+class MotionGate:
+    def __init__(self, max_skipped=10, width=160, threshold=25, min_changed=0.002):
+        """
+        Porte de mouvement : évite la détection YOLO quand rien n'a bougé dans la zone au sol.
+
+        Chaque frame est réduite à `width` pixels de large, passée en niveaux de gris et
+        comparée à la dernière frame détectée, uniquement dans le quadrilatère des points clés.
+        Sans changement, la détection est sautée et les trackers sont seulement avancés.
+        Une détection est forcée au moins toutes les `max_skipped` + 1 frames.
+
+        :param max_skipped: Nombre maximal de frames consécutives sans détection (K)
+        :param width: Largeur de l'image réduite comparée
+        :param threshold: Écart de niveau de gris à partir duquel un pixel a changé
+        :param min_changed: Fraction de pixels changés de la zone au sol déclenchant la détection
+        """
+        self.max_skipped = max_skipped  # Frames consécutives sans détection autorisées
+        self.width = width  # Largeur de l'image comparée
+        self.threshold = threshold  # Seuil de changement d'un pixel
+        self.min_changed = min_changed  # Fraction de pixels changés déclenchant la détection
+        self.reference = None  # Image réduite de la dernière frame détectée
+        self.mask = None  # Masque de la zone au sol (dans l'image réduite)
+        self.mask_key = None  # Taille de frame et points clés du masque
+        self.skipped = 0  # Frames sautées depuis la dernière détection
+        self.frames = 0  # Frames évaluées
+        self.detections = 0  # Détections demandées
+        self.forced = 0  # Détections forcées par max_skipped
+        self.saved = 0  # Appels au détecteur évités
+
+    def _small(self, frame):
+        """
+        Réduit la frame et la passe en niveaux de gris lissés.
+        """
+        height, width = frame.shape[:2]
+        scale = self.width / width
+        small = cv2.resize(frame, (self.width, max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0), scale
+
+    def _fit_mask(self, frame, small, scale, keypoints):
+        """
+        Construit le masque du quadrilatère des points clés (recalculé si la frame ou les points changent).
+        """
+        key = (frame.shape[:2], tuple(keypoints))
+        if key == self.mask_key:
+            return
+        mask = np.zeros(small.shape[:2], np.uint8)
+        if len(keypoints) >= 6:
+            points = np.round(np.array(keypoints, dtype=float).reshape(-1, 2) * scale).astype(np.int32)
+            cv2.fillConvexPoly(mask, cv2.convexHull(points), 1)
+        if not mask.any():
+            mask[:] = 1  # Pas de zone au sol : toute l'image
+        self.mask = mask.astype(bool)
+        self.mask_key = key
+
+    def should_detect(self, frame, keypoints):
+        """
+        Indique si la frame doit passer par le détecteur.
+
+        :param frame: Frame redimensionnée (BGR)
+        :param keypoints: Points clés du sol [x0, y0, x1, y1, ...] dans la résolution de la frame
+        :return: True si la zone au sol a changé ou si une détection est due
+        """
+        self.frames += 1
+        small, scale = self._small(frame)
+        self._fit_mask(frame, small, scale, keypoints)
+
+        if self.reference is None or self.reference.shape != small.shape:
+            detect = True
+        elif self.skipped >= self.max_skipped:
+            detect = True
+            self.forced += 1
+        else:
+            changed = cv2.absdiff(small, self.reference) > self.threshold
+            detect = np.count_nonzero(changed & self.mask) >= self.min_changed * np.count_nonzero(self.mask)
+
+        if detect:
+            self.reference = small
+            self.skipped = 0
+            self.detections += 1
+        else:
+            self.skipped += 1
+            self.saved += 1
+        return detect
+
+    def stats(self):
+        """
+        Retourne les compteurs de la porte de mouvement.
+
+        :return: Dictionnaire (frames évaluées, détections, détections forcées, appels évités)
+        """
+        return {'frames': self.frames, 'detections': self.detections, 'forced': self.forced,
+                'saved_detector_calls': self.saved}
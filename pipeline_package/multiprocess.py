@@ -0,0 +1,464 @@
+# Importation des bibliothèques nécessaires
+import multiprocessing as mp  # Un processus par caméra
+import queue  # Exception Empty des files inter-processus
+import time  # Mesure du coût de traitement
+from multiprocessing import shared_memory  # Mémoire partagée pour les frames
+
+import cv2  # OpenCV pour l'affichage
+import numpy as np  # NumPy pour les vues sur la mémoire partagée
+
+# Importation des modules personnalisés
+from utils import convert_meters_to_pixel_distance  # Conversion de distances
+from mini_map import MiniMap  # Mini-carte
+from capture_package import make_skipper  # Politiques de saut des frames
+from .site import MINI_MAP_SIZE, new_mini_map_image, build_mini_maps, build_display
+from .sinks import DisplaySink  # Affichage comme destination des résultats
+from .motion_gate import MotionGate  # Détection évitée sur les frames statiques
+from .flow_propagator import FlowPropagator  # Propagation des boîtes entre frames clés
+
+LATENCY_PERIOD = 1.0  # Intervalle en secondes entre deux envois des statistiques de latence d'une caméra
+
+
+class SharedFrameRing:
+    def __init__(self, shape, slots=4, name=None):
+        """
+        Tampon circulaire de frames en mémoire partagée.
+
+        Le processus producteur crée le tampon (name=None) et y écrit ses frames ; le processus
+        consommateur s'y attache par son nom et copie la frame d'un numéro de séquence donné.
+        Chaque case porte le numéro de séquence de la frame qu'elle contient, ce qui permet au
+        consommateur de détecter une frame écrasée. Les frames ne sont jamais sérialisées.
+
+        :param shape: Forme des frames (hauteur, largeur, canaux)
+        :param slots: Nombre de cases du tampon
+        :param name: Nom du segment existant auquel s'attacher (None pour le créer)
+        """
+        self.shape = tuple(shape)  # Forme des frames
+        self.slots = slots  # Nombre de cases
+        self.owner = name is None  # Le créateur est responsable de la suppression du segment
+
+        header_size = 8 * slots
+        frame_size = int(np.prod(self.shape))
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_size + slots * frame_size)
+        else:
+            self.shm = self._attach(name)
+
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=self.shm.buf[:header_size])  # Séquence par case
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf[header_size:])  # Cases
+        if self.owner:
+            self.sequences[:] = -1
+        self.next_sequence = 0  # Prochain numéro de séquence écrit
+
+    @staticmethod
+    def _attach(name):
+        """
+        S'attache à un segment existant sans le confier au resource_tracker de ce processus
+        (seul le producteur supprime le segment).
+        """
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 : pas de paramètre track. Les processus caméra partagent le
+            # resource_tracker du coordinateur, l'enregistrement est donc déjà le sien.
+            return shared_memory.SharedMemory(name=name)
+
+    @property
+    def name(self):
+        """Nom du segment de mémoire partagée."""
+        return self.shm.name
+
+    def write(self, frame):
+        """
+        Écrit une frame dans la case suivante.
+
+        :param frame: Frame à écrire (redimensionnée si sa forme diffère de celle du tampon)
+        :return: Numéro de séquence de la frame
+        """
+        if frame.shape != self.shape:
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        sequence = self.next_sequence
+        slot = sequence % self.slots
+        self.sequences[slot] = -1  # Case en cours d'écriture
+        self.frames[slot] = frame
+        self.sequences[slot] = sequence
+        self.next_sequence += 1
+        return sequence
+
+    def read(self, sequence):
+        """
+        Copie la frame de numéro de séquence donné.
+
+        :param sequence: Numéro de séquence de la frame
+        :return: Copie de la frame, ou None si elle a déjà été écrasée
+        """
+        slot = sequence % self.slots
+        if self.sequences[slot] != sequence:
+            return None
+        frame = self.frames[slot].copy()
+        if self.sequences[slot] != sequence:
+            return None  # Écrasée pendant la copie
+        return frame
+
+    def close(self):
+        """
+        Détache le tampon (et supprime le segment si ce processus l'a créé).
+        """
+        self.sequences = None
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class TrackRecord:
+    __slots__ = ('kind', 'id', 'bbox', 'converted_coord', 'color')
+
+    def __init__(self, kind, id, bbox, converted_coord, color):
+        """
+        Enregistrement compact d'un objet suivi, renvoyé par un processus caméra.
+
+        Expose la même interface que Person et Suit pour MiniMap.update.
+
+        :param kind: 'pers' ou 'suit'
+        :param id: Identifiant du track
+        :param bbox: Boîte englobante (x1, y1, x2, y2)
+        :param converted_coord: Coordonnées sur la mini-carte (ou None)
+        :param color: Couleur de l'objet
+        """
+        self.kind = kind
+        self.id = id
+        self.bbox = bbox
+        self.converted_coord = converted_coord
+        self.color = color
+
+    def get_converted_coord(self):
+        return self.converted_coord
+
+    def get_color(self):
+        return self.color
+
+    def get_id(self):
+        return self.id
+
+
+def result_to_records(result):
+    """
+    Convertit un CameraResult en enregistrements compacts.
+
+    :param result: CameraResult déjà dessiné (couleurs des valises associées à jour)
+    :return: Liste de TrackRecord
+    """
+    records = [TrackRecord('suit', suit.suit_id, suit.bbox, suit.get_converted_coord(), suit.get_color())
+               for suit in result.suits]
+    records += [TrackRecord('pers', pers.hum_id, pers.bbox, pers.get_converted_coord(), pers.get_color())
+                for pers in result.persons]
+    return records
+
+
+def camera_worker(index, spec, options, out_queue, stop_event):
+    """
+    Processus d'une caméra : capture, détection, suivi, association et dessin des boîtes.
+
+    Les frames annotées sont écrites dans un SharedFrameRing ; seuls des messages compacts
+    (numéro de séquence, TrackRecord et sorties sérialisables) sont renvoyés au processus
+    coordinateur. En mode headless, rien n'est dessiné ni écrit dans le tampon.
+
+    :param index: Indice de la caméra
+    :param spec: CameraSpec de la caméra
+    :param options: Dictionnaire (fps_divider, target_fps, target_latency, cpu_budget, radius_in_pixel,
+                    model_path, slots, headless, motion_gate, keyframe_interval, detect_in_floor,
+                    feature_reuse, crop_mode)
+    :param out_queue: File vers le coordinateur
+    :param stop_event: Événement d'arrêt
+    """
+    from .camera_pipeline import CameraPipeline  # Import dans le processus fils (modèles chargés ici)
+
+    motion_gate = MotionGate(max_skipped=options['motion_gate']) if options['motion_gate'] is not None else None
+    propagator = FlowPropagator(options['keyframe_interval']) if options['keyframe_interval'] is not None else None
+    pipeline = None
+    ring = None
+    latency_sent = time.monotonic()  # Dernier envoi des statistiques de latence
+    try:
+        # Construit dans le try : un modèle ou une source introuvable doit aussi prévenir le coordinateur
+        pipeline = CameraPipeline(spec, MiniMap(new_mini_map_image()),
+                                  skipper=make_skipper(options['fps_divider'], options['target_fps'],
+                                                       options['target_latency'], options['cpu_budget']),
+                                  model_path=options['model_path'], motion_gate=motion_gate,
+                                  propagator=propagator, detect_in_floor=options['detect_in_floor'],
+                                  feature_reuse=options['feature_reuse'] or 0,
+                                  crop_mode=options['crop_mode']).start()
+        while not stop_event.is_set():
+            packet = pipeline.read(timeout=0.1)
+            if packet is None:
+                if pipeline.reader.is_finished():
+                    break
+                continue
+
+            start = time.perf_counter()
+            frame = pipeline.preprocess(packet.image)
+            packet.mark('resized')
+            result = pipeline.track(frame, options['radius_in_pixel'], packet)
+            if options['headless']:
+                pipeline.finish(result)
+                out_queue.put(('frame', index, None, None, result.to_dict()))
+            else:
+                result.draw()
+                result.mark('rendered')
+                if ring is None:
+                    ring = SharedFrameRing(frame.shape, slots=options['slots'])
+                    out_queue.put(('ring', index, ring.name, ring.shape, ring.slots))
+                sequence = ring.write(result.frame)
+                pipeline.finish(result)  # Sortie du worker : la frame est remise au coordinateur
+                out_queue.put(('frame', index, sequence, result_to_records(result), result.to_dict()))
+            pipeline.report(time.perf_counter() - start, packet.received)
+
+            if time.monotonic() - latency_sent >= LATENCY_PERIOD:
+                out_queue.put(('latency', index, pipeline.latency.stats()))
+                latency_sent = time.monotonic()
+    except Exception as e:
+        out_queue.put(('error', index, repr(e)))
+        raise
+    finally:
+        if pipeline is not None:
+            out_queue.put(('latency', index, pipeline.latency.stats()))
+        out_queue.put(('end', index))
+        if pipeline is not None:
+            pipeline.release()
+        if ring is not None:
+            # Laisse au coordinateur le temps de lire les dernières frames avant la suppression
+            stop_event.wait(1.0)
+            ring.close()
+
+
+class MultiProcessSite:
+    def __init__(self, cameras, fps_divider=1, target_fps=None, shared_mini_map=False,
+                 radius_in_metter=1.0, cote_carre_in_metter=3, window_size=(720, 720), model_path='yolov10n',
+                 slots=4, headless=False, sinks=None, target_latency=None, cpu_budget=1.0, motion_gate=None,
+                 keyframe_interval=None, detect_in_floor=False, feature_reuse=None,
+                 crop_mode='slice'):
+        """
+        Site dont chaque caméra tourne dans son propre processus (contourne le GIL de DeepSort).
+
+        Le processus coordinateur ne fait que la mini-carte et l'affichage à partir des frames
+        en mémoire partagée et des enregistrements de suivi.
+
+        :param cameras: Liste de CameraSpec
+        :param fps_divider: Diviseur pour réduire le taux de traitement, ou None pour un pas adaptatif
+        :param target_fps: Cadence de traitement visée en frames par seconde (remplace fps_divider si fournie)
+        :param shared_mini_map: Une seule mini-carte pour toutes les caméras
+        :param radius_in_metter: Rayon d'association personnes-valises en mètres
+        :param cote_carre_in_metter: Côté de la zone au sol délimitée par les points clés, en mètres
+        :param window_size: Taille de la fenêtre d'affichage (largeur, hauteur)
+        :param model_path: Chemin vers le modèle YOLO
+        :param slots: Nombre de cases du tampon circulaire de chaque caméra
+        :param headless: Sans affichage : ni dessin des boîtes, ni mini-carte, ni fenêtre
+        :param sinks: Liste de Sink recevant les résultats (l'affichage est ajouté sauf en mode headless)
+        :param target_latency: Latence de bout en bout visée en secondes (pas adaptatif)
+        :param cpu_budget: Fraction du temps de calcul allouée à chaque caméra (pas adaptatif)
+        :param motion_gate: Si fourni, nombre maximal K de frames consécutives sans détection quand rien
+                            ne bouge dans la zone au sol
+        :param keyframe_interval: Si fourni, YOLO ne tourne qu'une frame sur keyframe_interval (boîtes
+                                  propagées par flot optique entre deux)
+        :param detect_in_floor: Ne détecter que dans le rectangle englobant la zone au sol de chaque caméra
+        :param feature_reuse: Si fourni, nombre maximal K de frames consécutives où une piste isolée
+                              réutilise son embedding de re-ID au lieu d'une extraction
+        :param crop_mode: Découpe des patchs de re-ID : 'slice' (crop par crop) ou 'roi_align' (un appel
+                          RoIAlign sur toute la frame, plutôt pour le GPU)
+        """
+        self.cameras = list(cameras)  # Description des caméras
+        self.shared_mini_map = shared_mini_map  # Mini-carte commune
+        self.headless = headless  # Pas de dessin ni d'affichage
+        self.options = {
+            'fps_divider': fps_divider,
+            'target_fps': target_fps,
+            'target_latency': target_latency,
+            'cpu_budget': cpu_budget,
+            'radius_in_pixel': convert_meters_to_pixel_distance(radius_in_metter, cote_carre_in_metter,
+                                                                MINI_MAP_SIZE - 30),
+            'model_path': model_path,
+            'slots': slots,
+            'headless': headless,
+            'motion_gate': motion_gate,
+            'keyframe_interval': keyframe_interval,
+            'detect_in_floor': detect_in_floor,
+            'feature_reuse': feature_reuse,
+            'crop_mode': crop_mode,
+        }
+        self.mini_maps = build_mini_maps(len(self.cameras), shared_mini_map)
+
+        # Sorties : l'affichage est une destination parmi d'autres
+        self.sinks = list(sinks) if sinks is not None else []
+        self.display = None
+        self.display_sink = None  # Affichage, réaffiché même sans message des caméras
+        if not headless:
+            self.display = build_display(self.cameras, shared_mini_map, window_size)
+            self.display_sink = DisplaySink(self.display)
+            self.sinks.append(self.display_sink)
+
+        self.context = mp.get_context('spawn')  # Processus neufs (torch et threads ne supportent pas fork)
+        self.out_queue = self.context.Queue()  # Messages des processus caméra
+        self.stop_event = self.context.Event()  # Arrêt des processus caméra
+        self.processes = []  # Processus caméra
+
+        self.rings = [None] * len(self.cameras)  # Tampons attachés par caméra
+        self.views = [None] * len(self.cameras)  # Dernière frame par caméra
+        self.records = [[] for _ in self.cameras]  # Derniers objets par caméra
+        self.outputs = []  # Sorties reçues depuis le dernier tick
+        self.frames_lost = 0  # Frames écrasées avant d'avoir été lues
+        self.latency = [{} for _ in self.cameras]  # Dernières statistiques de latence reçues par caméra
+
+    def start(self):
+        """
+        Lance un processus par caméra.
+
+        :return: Le site lui-même (pour chaîner les appels)
+        """
+        for i, spec in enumerate(self.cameras):
+            process = self.context.Process(target=camera_worker, name=f"camera-{spec.name}",
+                                           args=(i, spec, self.options, self.out_queue, self.stop_event),
+                                           daemon=True)
+            process.start()
+            self.processes.append(process)
+        return self
+
+    def handle(self, message):
+        """
+        Traite un message d'un processus caméra.
+
+        :param message: Tuple dont le premier élément est le type ('ring', 'frame', 'latency', 'error' ou 'end')
+        :return: False si la caméra a terminé
+        """
+        kind, index = message[0], message[1]
+        if kind == 'ring':
+            _, _, name, shape, slots = message
+            self.rings[index] = SharedFrameRing(shape, slots=slots, name=name)
+        elif kind == 'frame':
+            _, _, sequence, records, output = message
+            self.outputs.append(output)
+            if sequence is None:
+                return True  # Mode headless : ni frame ni mini-carte
+            frame = self.rings[index].read(sequence)
+            if frame is None:
+                self.frames_lost += 1
+            else:
+                self.views[index] = frame
+            self.records[index] = records
+        elif kind == 'latency':
+            self.latency[index] = message[2]
+        elif kind == 'error':
+            print(f"Erreur cam {self.cameras[index].name}: {message[2]}")
+        elif kind == 'end':
+            return False
+        return True
+
+    def exited_workers(self):
+        """
+        Processus caméra terminés sans avoir envoyé 'end' (tués, ou plantés avant d'avoir pu l'envoyer).
+
+        À n'appeler que lorsque la file est vide : un processus qui se termine normalement a déjà
+        vidé ses messages, dont 'end', dans la file.
+
+        :return: Liste des noms des caméras concernées
+        """
+        return [spec.name for spec, process in zip(self.cameras, self.processes) if not process.is_alive()]
+
+    def render(self):
+        """
+        Dessine les mini-cartes à partir des derniers enregistrements.
+
+        :return: Liste des vues à afficher (vues caméra puis mini-cartes)
+        """
+        imgs = [new_mini_map_image() for _ in self.mini_maps]
+        for i, records in enumerate(self.records):
+            img = imgs[0] if self.shared_mini_map else imgs[i]
+            mini_map = self.mini_maps[0] if self.shared_mini_map else self.mini_maps[i]
+            for record in records:
+                mini_map.update(img, record)
+        mini_map_views = [mini_map.draw_mini_map(img) for mini_map, img in zip(self.mini_maps, imgs)]
+        return self.views + mini_map_views
+
+    def emit(self):
+        """
+        Transmet aux sorties les résultats reçus depuis le dernier tick.
+
+        :return: False si une sortie demande l'arrêt
+        """
+        views = None if self.headless else self.render()
+        outputs, self.outputs = self.outputs, []
+        for sink in self.sinks:
+            sink.emit(outputs, views)
+        return not any(sink.stop_requested for sink in self.sinks)
+
+    def idle(self):
+        """
+        Réaffiche la fenêtre et lit le clavier quand aucun message n'arrive (modèles en cours de
+        chargement, caméra bloquée) ; les autres sorties ne reçoivent rien.
+
+        :return: False si l'affichage demande l'arrêt (touche 'q')
+        """
+        if self.display_sink is None:
+            return True
+        self.display_sink.emit([], self.render())
+        return not self.display_sink.stop_requested
+
+    def run(self, mouse_callback=None):
+        """
+        Boucle du coordinateur : transmet les résultats aux sorties jusqu'à la fin d'une source ou
+        l'arrêt demandé par une sortie (touche 'q' de l'affichage).
+
+        :param mouse_callback: Callback souris optionnel pour la fenêtre d'affichage
+        """
+        if mouse_callback is not None and self.display is not None:
+            cv2.setMouseCallback(self.display.window_name, mouse_callback)
+        self.start()
+
+        running = True
+        while running:
+            try:
+                message = self.out_queue.get(timeout=0.1)
+            except queue.Empty:
+                message = None
+                exited = self.exited_workers()
+                if exited:
+                    print(f"Processus caméra arrêté sans fin de flux : {', '.join(exited)}")
+                    break
+                if not self.idle():
+                    break
+            if message is not None:
+                running = self.handle(message)
+                # Vide les messages déjà arrivés avant de réafficher
+                while running:
+                    try:
+                        running = self.handle(self.out_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not self.emit():
+                    break
+
+        self.release()
+
+    def latency_stats(self):
+        """
+        Latence glass-to-glass glissante de chaque caméra, telle que renvoyée par son processus
+        (toutes les LATENCY_PERIOD secondes et à la fin du flux).
+
+        :return: Dictionnaire {nom de la caméra: statistiques (p50, p95, p99 en ms, durée des étapes)}
+        """
+        return {spec.name: stats for spec, stats in zip(self.cameras, self.latency)}
+
+    def release(self):
+        """
+        Arrête les processus caméra, détache les tampons et ferme les sorties (dont l'affichage).
+        """
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        for ring in self.rings:
+            if ring is not None:
+                ring.close()
+        print({'frames_lost': self.frames_lost})
+        for sink in self.sinks:
+            sink.close()
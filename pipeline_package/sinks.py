@@ -0,0 +1,116 @@
+# Importation des bibliothèques nécessaires
+import json  # Sérialisation des résultats
+import socket  # Envoi des résultats sur le réseau
+
+import cv2  # OpenCV pour l'affichage
+
+
+class Sink:
+    """
+    Destination des résultats d'un site.
+
+    emit reçoit à chaque tick la liste des résultats par caméra (dictionnaires produits par
+    CameraResult.to_dict) et la liste des vues dessinées, ou None en mode sans affichage.
+    """
+
+    stop_requested = False  # Demande d'arrêt de la boucle principale (ex. touche 'q')
+
+    def emit(self, outputs, views):
+        """
+        Reçoit les résultats d'un tick.
+
+        :param outputs: Liste de dictionnaires de résultats par caméra
+        :param views: Liste des vues dessinées (vues caméra puis mini-cartes) ou None
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Libère les ressources de la destination.
+        """
+
+
+class CallbackSink(Sink):
+    def __init__(self, callback):
+        """
+        Transmet les résultats à une fonction.
+
+        :param callback: Fonction appelée avec (outputs, views) ; un retour False demande l'arrêt
+        """
+        self.callback = callback  # Fonction de l'utilisateur
+
+    def emit(self, outputs, views):
+        if self.callback(outputs, views) is False:
+            self.stop_requested = True
+
+
+class FileSink(Sink):
+    def __init__(self, path):
+        """
+        Écrit les résultats dans un fichier JSON Lines (une ligne par caméra et par frame traitée).
+
+        :param path: Chemin du fichier
+        """
+        self.path = path  # Chemin du fichier
+        self.file = open(path, 'w', encoding='utf-8')  # Fichier de sortie
+
+    def emit(self, outputs, views):
+        for output in outputs:
+            self.file.write(json.dumps(output) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class SocketSink(Sink):
+    def __init__(self, host, port, timeout=1.0):
+        """
+        Envoie les résultats en JSON Lines sur une connexion TCP.
+
+        Une connexion perdue est rétablie au tick suivant ; les résultats émis entretemps sont perdus.
+
+        :param host: Adresse du serveur
+        :param port: Port du serveur
+        :param timeout: Délai maximal en secondes pour se connecter et envoyer
+        """
+        self.address = (host, port)  # Adresse du serveur
+        self.timeout = timeout  # Délai de connexion et d'envoi
+        self.sock = None  # Connexion courante
+        self.dropped = 0  # Résultats perdus (serveur injoignable)
+
+    def emit(self, outputs, views):
+        data = ''.join(json.dumps(output) + '\n' for output in outputs).encode('utf-8')
+        try:
+            if self.sock is None:
+                self.sock = socket.create_connection(self.address, timeout=self.timeout)
+            self.sock.sendall(data)
+        except OSError:
+            self.dropped += len(outputs)
+            self.close()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+class DisplaySink(Sink):
+    def __init__(self, display):
+        """
+        Affiche les vues dans une fenêtre MultiViewDisplay ; l'appui sur 'q' demande l'arrêt.
+
+        :param display: MultiViewDisplay du site
+        """
+        self.display = display  # Affichage multi-vues
+
+    def emit(self, outputs, views):
+        if views is not None:
+            self.display.display(*views)
+        # Sortie si 'q' est pressé
+        if cv2.waitKey(1) & 0xff == ord('q'):
+            self.stop_requested = True
+
+    def close(self):
+        self.display.close()
+        cv2.destroyAllWindows()
@@ -0,0 +1,313 @@
+# Importation des bibliothèques nécessaires
+import time  # Mesure du coût de traitement
+
+import cv2  # OpenCV pour l'affichage
+import numpy as np  # NumPy pour les images de la mini-carte
+
+# Importation des modules personnalisés
+from utils import convert_meters_to_pixel_distance  # Conversion de distances
+from mini_map import MiniMap  # Mini-carte
+from model_registry import registry  # Registre des modèles partagés
+from display.multiViewDisplay import MultiViewDisplay  # Affichage multi-vues
+from capture_package import make_skipper, FrameSynchronizer  # Politiques de saut et appariement des frames
+from .camera_pipeline import CameraPipeline  # Chaîne de traitement d'une caméra
+from .detection import SharedDetector  # Détecteur partagé
+from .batching import BatchScheduler  # Inférence par lot entre caméras
+from .motion_gate import MotionGate  # Détection évitée sur les frames statiques
+from .flow_propagator import FlowPropagator  # Propagation des boîtes entre frames clés
+from .stages import Stage, StagedPipeline, STOP  # Exécution des étapes en parallèle
+from .sinks import DisplaySink  # Affichage comme destination des résultats
+
+MINI_MAP_SIZE = 300  # Taille (en pixels) de l'image de la mini-carte
+
+
+def new_mini_map_image():
+    """
+    Crée une image blanche pour la mini-carte.
+
+    :return: Image de la mini-carte
+    """
+    return np.ones((MINI_MAP_SIZE, MINI_MAP_SIZE, 3), np.uint8) * 255
+
+
+def build_mini_maps(n_cameras, shared_mini_map):
+    """
+    Crée les mini-cartes du site : une par caméra, ou une seule partagée.
+
+    :param n_cameras: Nombre de caméras
+    :param shared_mini_map: Une seule mini-carte pour toutes les caméras
+    :return: Liste de MiniMap
+    """
+    if shared_mini_map:
+        return [MiniMap(new_mini_map_image())]
+    return [MiniMap(new_mini_map_image()) for _ in range(n_cameras)]
+
+
+def build_display(cameras, shared_mini_map, window_size):
+    """
+    Crée l'affichage en grille du site : les vues caméra puis les mini-cartes.
+
+    :param cameras: Liste de CameraSpec
+    :param shared_mini_map: Une seule mini-carte pour toutes les caméras
+    :param window_size: Taille de la fenêtre d'affichage (largeur, hauteur)
+    :return: MultiViewDisplay
+    """
+    display = MultiViewDisplay(window_size=window_size, layout="grid", show_titles=True)
+    for spec in cameras:
+        display.add_view(f"Vue {spec.name}")
+    if shared_mini_map:
+        display.add_view("Minimap")
+    else:
+        for spec in cameras:
+            display.add_view(f"Minimap {spec.name}")
+    return display
+
+
+class Site:
+    def __init__(self, cameras, fps_divider=1, target_fps=None, shared_mini_map=False,
+                 radius_in_metter=1.0, cote_carre_in_metter=3, window_size=(720, 720), model_path='yolov10n',
+                 max_batch_wait=0.05, headless=False, sinks=None, target_latency=None, cpu_budget=1.0,
+                 sync_tolerance=None, motion_gate=None, keyframe_interval=None, detect_in_floor=False,
+                 feature_reuse=None, crop_mode='slice'):
+        """
+        Initialise un site composé de N caméras traitées par les mêmes étapes.
+
+        :param cameras: Liste de CameraSpec
+        :param fps_divider: Diviseur pour réduire le taux de traitement, ou None pour un pas adaptatif
+        :param target_fps: Cadence de traitement visée en frames par seconde (remplace fps_divider si fournie)
+        :param shared_mini_map: Une seule mini-carte pour toutes les caméras (caméras filmant la même zone)
+        :param radius_in_metter: Rayon d'association personnes-valises en mètres
+        :param cote_carre_in_metter: Côté de la zone au sol délimitée par les points clés, en mètres
+        :param window_size: Taille de la fenêtre d'affichage (largeur, hauteur)
+        :param model_path: Chemin vers le modèle YOLO
+        :param max_batch_wait: Attente maximale en secondes pour regrouper les frames des caméras en un lot
+        :param headless: Sans affichage : ni dessin des boîtes, ni mini-carte, ni fenêtre
+        :param sinks: Liste de Sink recevant les résultats (l'affichage est ajouté sauf en mode headless)
+        :param target_latency: Latence de bout en bout visée en secondes (pas adaptatif)
+        :param cpu_budget: Fraction du temps de calcul allouée au traitement (pas adaptatif)
+        :param sync_tolerance: Si fourni, ne traiter que des frames capturées à moins de sync_tolerance
+                               secondes d'écart sur toutes les caméras (appariement par horodatage)
+        :param motion_gate: Si fourni, nombre maximal K de frames consécutives sans détection quand rien
+                            ne bouge dans la zone au sol (porte de mouvement par caméra)
+        :param keyframe_interval: Si fourni, YOLO ne tourne qu'une frame sur keyframe_interval ; entre deux,
+                                  les boîtes sont propagées par flot optique (à combiner avec fps_divider=1)
+        :param detect_in_floor: Ne détecter que dans le rectangle englobant la zone au sol de chaque caméra
+        :param feature_reuse: Si fourni, nombre maximal K de frames consécutives où une piste isolée
+                              réutilise son embedding de re-ID au lieu d'une extraction
+        :param crop_mode: Découpe des patchs de re-ID : 'slice' (crop par crop) ou 'roi_align' (un appel
+                          RoIAlign sur toute la frame, plutôt pour le GPU)
+        """
+        self.cameras = list(cameras)  # Description des caméras
+        self.shared_mini_map = shared_mini_map  # Mini-carte commune à toutes les caméras
+        self.headless = headless  # Pas de dessin ni d'affichage
+
+        # Rayon d'association
+        self.radius_in_pixel = convert_meters_to_pixel_distance(radius_in_metter, cote_carre_in_metter,
+                                                                MINI_MAP_SIZE - 30)
+
+        # Mini-cartes
+        self.mini_maps = build_mini_maps(len(self.cameras), shared_mini_map)
+
+        # Détection par lot commune à toutes les caméras
+        self.detector = SharedDetector(model_path)
+        self.synchronizer = FrameSynchronizer(len(self.cameras), sync_tolerance) if sync_tolerance is not None else None
+        self.scheduler = BatchScheduler(self.detector, max_wait=max_batch_wait, synchronizer=self.synchronizer)
+
+        # Chaînes de traitement
+        self.pipelines = [
+            CameraPipeline(spec, self._mini_map_of(i), skipper=make_skipper(fps_divider, target_fps, target_latency, cpu_budget),
+                           detector=self.detector,
+                           motion_gate=MotionGate(max_skipped=motion_gate) if motion_gate is not None else None,
+                           propagator=FlowPropagator(keyframe_interval) if keyframe_interval is not None else None,
+                           detect_in_floor=detect_in_floor, feature_reuse=feature_reuse or 0,
+                           crop_mode=crop_mode)
+            for i, spec in enumerate(self.cameras)
+        ]
+
+        self.staged = None  # Chaîne d'étapes en mode pipeline
+
+        # Sorties : l'affichage (vues caméra puis mini-cartes) est une destination parmi d'autres
+        self.sinks = list(sinks) if sinks is not None else []
+        self.display = None
+        if not headless:
+            self.display = build_display(self.cameras, shared_mini_map, window_size)
+            self.sinks.append(DisplaySink(self.display))
+
+    def _mini_map_of(self, index):
+        """
+        Retourne la mini-carte de la caméra d'indice donné.
+        """
+        return self.mini_maps[0] if self.shared_mini_map else self.mini_maps[index]
+
+    def _detect(self, batch):
+        """
+        Étape de détection : redimensionne les frames du lot et passe celles qui ont changé au
+        détecteur en une inférence.
+
+        :param batch: Liste de couples (pipeline, FramePacket)
+        :return: Liste de quadruplets (pipeline, FramePacket, frame, détections ou None si la frame est statique)
+        """
+        frames = []
+        for pipeline, packet in batch:
+            frames.append(pipeline.preprocess(packet.image))
+            packet.mark('resized')
+        moving = [i for i, ((pipeline, _), frame) in enumerate(zip(batch, frames)) if pipeline.should_detect(frame)]
+        detections = [None] * len(frames)
+        rois = [batch[i][0].detection_roi(frames[i]) for i in moving]
+        inputs = [batch[i][0].detection_frame(frames[i]) for i in moving]
+        for i, frame_detections in zip(moving, self.scheduler.detect(inputs, rois)):
+            detections[i] = frame_detections
+        for _, packet in batch:
+            packet.mark('detected')
+        return [(pipeline, packet, frame, frame_detections)
+                for (pipeline, packet), frame, frame_detections in zip(batch, frames, detections)]
+
+    def _track(self, detected):
+        """
+        Étape de suivi : met à jour les trackers de chaque caméra et associe personnes et valises.
+
+        :param detected: Liste de quadruplets (pipeline, FramePacket, frame, détections)
+        :return: Liste de CameraResult
+        """
+        return [pipeline.track_detections(frame, frame_detections, self.radius_in_pixel, packet)
+                for pipeline, packet, frame, frame_detections in detected]
+
+    def _render(self, results):
+        """
+        Étape de rendu : prépare les sorties et, hors mode headless, dessine les boîtes et les mini-cartes.
+
+        Une caméra absente du lot garde sa dernière vue et ses derniers objets.
+
+        :param results: Liste de CameraResult
+        :return: Triplet (résultats, sorties par caméra, vues à afficher ou None en mode headless)
+        """
+        for result in results:
+            result.pipeline.last_result = result
+        if self.headless:
+            return results, self._outputs(results), None
+
+        for result in results:
+            result.draw()
+            result.mark('rendered')
+
+        imgs = [new_mini_map_image() for _ in self.mini_maps]
+        for i, pipeline in enumerate(self.pipelines):
+            if pipeline.last_result is not None:
+                pipeline.last_result.draw_on_mini_map(imgs[0] if self.shared_mini_map else imgs[i])
+
+        views = [pipeline.last_result.frame if pipeline.last_result is not None else None
+                 for pipeline in self.pipelines]
+        mini_map_views = [mini_map.draw_mini_map(img) for mini_map, img in zip(self.mini_maps, imgs)]
+        return results, self._outputs(results), views + mini_map_views
+
+    def _outputs(self, results):
+        """
+        Sérialise les résultats pour les sorties, une fois la vue dessinée.
+        """
+        if not self.sinks:
+            return []
+        return [result.to_dict() for result in results]
+
+    def _emit(self, rendered, start):
+        """
+        Transmet les sorties d'un tick à toutes les destinations, puis informe chaque caméra du
+        coût de sa frame (pas adaptatif).
+
+        :param rendered: Triplet (résultats, sorties par caméra, vues) produit par _render
+        :param start: Instant (time.perf_counter()) de début du traitement du tick
+        :return: False si une destination demande l'arrêt
+        """
+        results, outputs, views = rendered
+        for sink in self.sinks:
+            sink.emit(outputs, views)
+        for result in results:
+            result.pipeline.finish(result)
+
+        # En mode pipeline, une frame coûte le temps de l'étape la plus lente
+        processing_time = time.perf_counter() - start if start is not None else self.staged.bottleneck_time()
+        for result in results:
+            result.pipeline.report(processing_time, result.received)
+        return not any(sink.stop_requested for sink in self.sinks)
+
+    def step(self):
+        """
+        Traite en série les frames disponibles de toutes les caméras et transmet le résultat aux sorties.
+
+        :return: False si l'une des sources est terminée ou si une sortie demande l'arrêt
+        """
+        # Capture des frames dues avant l'échéance
+        batch = self.scheduler.gather(self.pipelines)
+        if batch is None:
+            print("Erreur lecture frame (multivisio.py)")
+            return False
+
+        start = time.perf_counter()
+        return self._emit(self._render(self._track(self._detect(batch))), start)
+
+    def run(self, mouse_callback=None, pipelined=False, queue_size=2):
+        """
+        Boucle principale : traite les caméras jusqu'à la fin d'une source ou l'arrêt demandé par une
+        sortie (touche 'q' de l'affichage).
+
+        En mode pipeline, capture, détection, suivi et rendu tournent chacun dans leur thread,
+        reliés par des files bornées : la détection de la frame N+1 chevauche le suivi et le
+        rendu de la frame N. Les sorties (dont l'affichage) restent sur le thread principal.
+
+        :param mouse_callback: Callback souris optionnel pour la fenêtre d'affichage
+        :param pipelined: Exécuter les étapes en parallèle plutôt qu'en série
+        :param queue_size: Taille des files entre étapes en mode pipeline
+        """
+        if mouse_callback is not None and self.display is not None:
+            cv2.setMouseCallback(self.display.window_name, mouse_callback)
+        for pipeline in self.pipelines:
+            pipeline.start()
+
+        if pipelined:
+            self._run_pipelined(queue_size)
+        else:
+            while self.step():
+                pass
+
+        self.release()
+
+    def _run_pipelined(self, queue_size):
+        """
+        Exécute les étapes dans des threads séparés et transmet les résultats aux sorties sur le thread principal.
+
+        :param queue_size: Taille des files entre étapes
+        """
+        self.staged = StagedPipeline(
+            source=lambda: self.scheduler.gather(self.pipelines),
+            stages=[Stage("detect", self._detect), Stage("track", self._track), Stage("render", self._render)],
+            queue_size=queue_size,
+        ).start()
+
+        while True:
+            rendered = self.staged.get(timeout=0.1)
+            if rendered is STOP:
+                print("Erreur lecture frame (multivisio.py)")
+                break
+            if rendered is not None and not self._emit(rendered, None):
+                break
+
+        self.staged.stop()
+        print(self.staged.stats())
+
+    def latency_stats(self):
+        """
+        Latence glass-to-glass glissante de chaque caméra.
+
+        :return: Dictionnaire {nom de la caméra: statistiques (p50, p95, p99 en ms, durée des étapes)}
+        """
+        return {pipeline.name: pipeline.latency.stats() for pipeline in self.pipelines}
+
+    def release(self):
+        """
+        Libère les captures et ferme les sorties (dont l'affichage).
+        """
+        for pipeline in self.pipelines:
+            pipeline.release()
+        print(self.scheduler.stats())
+        print(registry.stats())
+        for sink in self.sinks:
+            sink.close()
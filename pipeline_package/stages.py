@@ -0,0 +1,155 @@
+# Importation des bibliothèques nécessaires
+import queue  # Files bornées entre étapes
+import threading  # Un thread par étape
+import time  # Mesure du temps passé dans chaque étape
+
+STOP = object()  # Marqueur de fin de flux transmis d'étape en étape
+
+
+class Stage:
+    def __init__(self, name, func):
+        """
+        Étape d'une chaîne de traitement exécutée dans son propre thread.
+
+        :param name: Nom de l'étape (statistiques)
+        :param func: Fonction appliquée à chaque élément ; son résultat est transmis à l'étape suivante
+        """
+        self.name = name  # Nom de l'étape
+        self.func = func  # Traitement de l'étape
+        self.items = 0  # Éléments traités
+        self.busy_time = 0.0  # Temps passé dans le traitement (en secondes)
+        self.last_time = 0.0  # Durée du dernier traitement (en secondes)
+
+    def stats(self):
+        """
+        Retourne les compteurs de l'étape.
+
+        :return: Dictionnaire (éléments traités, temps moyen par élément en ms)
+        """
+        return {
+            'items': self.items,
+            'mean_ms': 1000.0 * self.busy_time / self.items if self.items else 0.0,
+        }
+
+
+class StagedPipeline:
+    def __init__(self, source, stages, queue_size=2):
+        """
+        Chaîne d'étapes reliées par des files bornées, chacune dans son thread.
+
+        Chaque étape n'a qu'un seul thread et les files sont FIFO : l'ordre des éléments est
+        conservé et l'état porté par une étape (ex. les trackers) n'est modifié que par elle.
+        Le débit tend vers celui de l'étape la plus lente au lieu de la somme des étapes.
+
+        :param source: Fonction produisant l'élément suivant (None en fin de flux, liste vide ignorée)
+        :param stages: Liste de Stage appliquées dans l'ordre
+        :param queue_size: Taille de chaque file entre deux étapes
+        """
+        self.source = source  # Production des éléments (capture)
+        self.stages = list(stages)  # Étapes de traitement
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(len(self.stages) + 1)]  # Files inter-étapes
+        self.stop_event = threading.Event()  # Demande d'arrêt
+        self.threads = []  # Threads des étapes
+
+    def _put(self, q, item):
+        """
+        Dépose un élément dans une file en restant interruptible par stop().
+
+        :return: False si l'arrêt a été demandé avant le dépôt
+        """
+        while not self.stop_event.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run_source(self):
+        """
+        Boucle du thread source : produit les éléments jusqu'à la fin du flux ou l'arrêt.
+        """
+        while not self.stop_event.is_set():
+            item = self.source()
+            if item is None:
+                break
+            if isinstance(item, (list, tuple)) and not item:
+                # Lot vide (aucune frame prête à l'échéance) : rien à transmettre
+                continue
+            if not self._put(self.queues[0], item):
+                break
+        self._put(self.queues[0], STOP)
+
+    def _run_stage(self, stage, input_queue, output_queue):
+        """
+        Boucle du thread d'une étape : applique le traitement à chaque élément reçu.
+        """
+        while True:
+            try:
+                item = input_queue.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    break
+                continue
+            if item is STOP:
+                break
+
+            start = time.perf_counter()
+            result = stage.func(item)
+            stage.last_time = time.perf_counter() - start
+            stage.busy_time += stage.last_time
+            stage.items += 1
+
+            if not self._put(output_queue, result):
+                break
+        self._put(output_queue, STOP)
+
+    def start(self):
+        """
+        Démarre les threads de la source et des étapes.
+
+        :return: La chaîne elle-même (pour chaîner les appels)
+        """
+        self.threads = [threading.Thread(target=self._run_source, name="Stage-source", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            self.threads.append(threading.Thread(target=self._run_stage, name=f"Stage-{stage.name}",
+                                                 args=(stage, self.queues[i], self.queues[i + 1]), daemon=True))
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def get(self, timeout=None):
+        """
+        Retourne le prochain résultat de la dernière étape.
+
+        :param timeout: Délai d'attente maximal en secondes
+        :return: Résultat, STOP en fin de flux, ou None si le délai est dépassé
+        """
+        try:
+            return self.queues[-1].get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def stop(self):
+        """
+        Demande l'arrêt de toutes les étapes et attend la fin de leurs threads.
+        """
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+
+    def bottleneck_time(self):
+        """
+        Durée du dernier traitement de l'étape la plus lente : coût d'un élément en régime établi.
+
+        :return: Durée en secondes
+        """
+        return max((stage.last_time for stage in self.stages), default=0.0)
+
+    def stats(self):
+        """
+        Retourne les compteurs de chaque étape.
+
+        :return: Dictionnaire {nom de l'étape: statistiques}
+        """
+        return {stage.name: stage.stats() for stage in self.stages}
@@ -0,0 +1,90 @@
+# Importation des bibliothèques nécessaires
+from collections import deque  # Fenêtres glissantes des latences
+
+import numpy as np  # Centiles
+
+# Étapes de la vie d'une frame, dans l'ordre (instants time.monotonic() notés dans FramePacket.marks)
+STAGES = ('received', 'decoded', 'dequeued', 'resized', 'detected', 'tracked', 'associated', 'rendered', 'output')
+
+
+def lineage(marks):
+    """
+    Durée de chaque étape d'une frame, à partir des instants notés.
+
+    :param marks: Dictionnaire {étape: instant time.monotonic()}
+    :return: Dictionnaire {étape: durée en ms depuis l'étape notée précédente}
+    """
+    durations = {}
+    previous = None
+    for stage in STAGES:
+        if stage not in marks:
+            continue
+        if previous is not None:
+            durations[stage] = 1000.0 * (marks[stage] - marks[previous])
+        previous = stage
+    return durations
+
+
+class LatencyTracker:
+    def __init__(self, window=300, live=True):
+        """
+        Latence glass-to-glass glissante d'une caméra : de la capture de la frame à sa sortie.
+
+        Pour un flux en direct, l'horodatage de capture (X-Timestamp, horloge de la caméra) est
+        ramené à l'horloge locale par le plus petit écart réception - capture observé : la
+        latence est donc exacte au délai de transmission minimal près. Pour un fichier, la
+        position dans la vidéo n'a pas de sens temps réel et la latence part de la réception.
+
+        :param window: Nombre de frames de la fenêtre glissante
+        :param live: La source est un flux en direct
+        """
+        self.live = live  # Flux en direct ou fichier
+        self.latencies = deque(maxlen=window)  # Latences de bout en bout (en secondes)
+        self.stage_durations = {stage: deque(maxlen=window) for stage in STAGES[1:]}  # Durées par étape (en ms)
+        self.clock_offset = None  # Horloge locale - horloge de la caméra (estimation)
+        self.last_lineage = {}  # Durées par étape de la dernière frame
+
+    def record(self, marks, timestamp):
+        """
+        Enregistre une frame sortie du pipeline.
+
+        :param marks: Dictionnaire {étape: instant time.monotonic()} (avec 'received' et 'output')
+        :param timestamp: Horodatage de capture de la frame (en secondes)
+        :return: Latence de bout en bout de la frame (en secondes)
+        """
+        start = marks['received']
+        if self.live and timestamp is not None:
+            offset = marks['received'] - timestamp
+            if self.clock_offset is None or offset < self.clock_offset:
+                self.clock_offset = offset
+            start = timestamp + self.clock_offset
+        latency = marks['output'] - start
+        self.latencies.append(latency)
+
+        self.last_lineage = lineage(marks)
+        for stage, duration in self.last_lineage.items():
+            self.stage_durations[stage].append(duration)
+        return latency
+
+    def percentiles(self):
+        """
+        Centiles de la latence sur la fenêtre glissante.
+
+        :return: Dictionnaire (p50, p95, p99 en ms), vide si aucune frame n'a été enregistrée
+        """
+        if not self.latencies:
+            return {}
+        p50, p95, p99 = np.percentile(np.array(self.latencies) * 1000.0, [50, 95, 99])
+        return {'p50_ms': float(p50), 'p95_ms': float(p95), 'p99_ms': float(p99)}
+
+    def stats(self):
+        """
+        Retourne les statistiques de latence.
+
+        :return: Dictionnaire (frames de la fenêtre, centiles, durée moyenne de chaque étape en ms)
+        """
+        stats = {'frames': len(self.latencies)}
+        stats.update(self.percentiles())
+        stats['stages_ms'] = {stage: float(np.mean(durations))
+                              for stage, durations in self.stage_durations.items() if durations}
+        return stats
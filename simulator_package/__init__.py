@@ -0,0 +1 @@
+from .esp32_simulator import Esp32Simulator, PART_BOUNDARY
@@ -0,0 +1,125 @@
+# Importation des bibliothèques nécessaires
+import argparse  # Lancement en ligne de commande
+import statistics  # Médianes et centiles
+import time  # Mesure des durées
+
+from capture_package import FrameReader  # Lecteur de frames threadé
+from .esp32_simulator import Esp32Simulator  # Caméra ESP32 simulée
+
+
+def percentile(values, q):
+    """
+    Centile q (entre 0 et 100) d'une liste de valeurs.
+    """
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[int(q) - 1]
+
+
+def latency_summary(latencies):
+    """
+    Résumé des latences en millisecondes.
+    """
+    values = [1000.0 * latency for latency in latencies]
+    return {
+        'frames': len(values),
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'max_ms': max(values) if values else None,
+    }
+
+
+def read_frames(simulator, reader, duration, consumer_delay=0.0):
+    """
+    Consomme les frames d'un lecteur pendant une durée donnée.
+
+    :param simulator: Esp32Simulator servant la source
+    :param reader: FrameReader démarré
+    :param duration: Durée de la mesure en secondes
+    :param consumer_delay: Temps de traitement simulé par frame
+    :return: Liste des latences capture -> consommation (en secondes)
+    """
+    latencies = []
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        packet = reader.read_packet(timeout=0.5)
+        if packet is None:
+            continue
+        # Horloge du simulateur : secondes depuis son démarrage
+        latencies.append(time.monotonic() - (simulator.boot + packet.timestamp))
+        if consumer_delay:
+            time.sleep(consumer_delay)
+    return latencies
+
+
+def bench_capture_latency(video_path, duration, fps, jitter):
+    """
+    Latence entre la capture d'une frame par la caméra et sa lecture, en flux et en mode tiré.
+    """
+    results = {}
+    with Esp32Simulator(video_path, fps=fps, jitter=jitter, seed=0) as simulator:
+        for mode, url in (('stream', simulator.stream_url), ('capture', simulator.capture_url)):
+            reader = FrameReader(url, name=mode).start()
+            results[mode] = latency_summary(read_frames(simulator, reader, duration))
+            reader.release()
+    return results
+
+
+def bench_reconnect(video_path, duration, fps, disconnect_every, reconnect_delay):
+    """
+    Comportement du lecteur face aux coupures du flux : reconnexions et trous dans la réception.
+    """
+    with Esp32Simulator(video_path, fps=fps, disconnect_every=disconnect_every, seed=0) as simulator:
+        reader = FrameReader(simulator.stream_url, name='reconnect', reconnect_delay=reconnect_delay).start()
+        arrivals = []
+        end = time.monotonic() + duration
+        while time.monotonic() < end:
+            packet = reader.read_packet(timeout=0.5)
+            if packet is not None:
+                arrivals.append(packet.received)
+        reader.release()
+        gaps = sorted(b - a for a, b in zip(arrivals, arrivals[1:]))
+        return {
+            'frames': len(arrivals),
+            'reconnects': reader.reconnects,
+            'disconnects': simulator.disconnects,
+            'max_gap_ms': 1000.0 * gaps[-1] if gaps else None,
+        }
+
+
+def bench_drop_policy(video_path, duration, fps, consumer_delay):
+    """
+    Consommateur plus lent que la caméra : jeter les plus anciennes frames ou attendre.
+    """
+    results = {}
+    with Esp32Simulator(video_path, fps=fps, seed=0) as simulator:
+        for drop_oldest in (True, False):
+            reader = FrameReader(simulator.stream_url, drop_oldest=drop_oldest, buffer_size=4).start()
+            summary = latency_summary(read_frames(simulator, reader, duration, consumer_delay))
+            summary['dropped'] = reader.stats()['frames_dropped']
+            results['drop_oldest' if drop_oldest else 'wait'] = summary
+            reader.release()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du chemin caméra sur un ESP32 simulé")
+    parser.add_argument('video', help="Vidéo rejouée par le simulateur")
+    parser.add_argument('--duration', type=float, default=5.0, help="Durée de chaque mesure en secondes")
+    parser.add_argument('--fps', type=float, default=15.0)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--disconnect-every', type=int, default=30)
+    parser.add_argument('--reconnect-delay', type=float, default=0.2)
+    parser.add_argument('--consumer-delay', type=float, default=0.15, help="Traitement simulé par frame")
+    args = parser.parse_args()
+
+    print('capture_latency', bench_capture_latency(args.video, args.duration, args.fps, args.jitter))
+    print('reconnect', bench_reconnect(args.video, args.duration, args.fps, args.disconnect_every,
+                                       args.reconnect_delay))
+    print('drop_policy', bench_drop_policy(args.video, args.duration, args.fps, args.consumer_delay))
+
+
+if __name__ == '__main__':
+    main()
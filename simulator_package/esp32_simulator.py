@@ -0,0 +1,378 @@
+# Importation des bibliothèques nécessaires
+import argparse  # Lancement en ligne de commande
+import json  # Réponse de /status
+import random  # Gigue et pannes simulées
+import threading  # Serveurs HTTP en arrière-plan
+import time  # Horloge de la caméra simulée
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Serveurs HTTP de la bibliothèque standard
+from urllib.parse import parse_qs, urlsplit  # Lecture des requêtes /control
+
+import cv2  # OpenCV pour la lecture de la vidéo et l'encodage JPEG
+
+from capture_package.camera_control import FRAME_SIZES  # Résolutions du capteur
+
+# Format des parties du flux, identique à app_httpd.cpp
+PART_BOUNDARY = "123456789000000000000987654321"
+STREAM_CONTENT_TYPE = "multipart/x-mixed-replace;boundary=" + PART_BOUNDARY
+STREAM_BOUNDARY = "\r\n--" + PART_BOUNDARY + "\r\n"
+STREAM_PART = "Content-Type: image/jpeg\r\nContent-Length: %u\r\nX-Timestamp: %d.%06d\r\n\r\n"
+
+
+def load_frames(video_path, max_frames=300):
+    """
+    Charge les frames d'une vidéo en mémoire.
+
+    :param video_path: Chemin de la vidéo rejouée
+    :param max_frames: Nombre maximal de frames chargées
+    :return: Liste de frames BGR
+    """
+    capture = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = capture.read()
+        if not ret:
+            break
+        frames.append(frame)
+    capture.release()
+    if not frames:
+        raise ValueError(f"Aucune frame lisible dans {video_path}")
+    return frames
+
+
+class Esp32Simulator:
+    def __init__(self, video_path, fps=15.0, jitter=0.0, stall_every=0, stall_duration=0.0, disconnect_every=0,
+                 drop_rate=0.0, corrupt_rate=0.0, jpeg_quality=80, host='127.0.0.1', port=0, seed=None,
+                 max_frames=300):
+        """
+        Remplaçant local d'une caméra ESP32 (ESP32/CameraWebServer) rejouant une vidéo en boucle.
+
+        Comme le firmware, un serveur de contrôle sert `/capture`, `/status` et `/control`, et un
+        serveur de flux sur le port suivant sert `/stream` (multipart, même délimiteur et même
+        en-tête X-Timestamp, envoyé en chunked). Les horodatages sont comptés depuis le démarrage
+        du simulateur, comme l'horloge de la caméra depuis son boot.
+
+        :param video_path: Chemin de la vidéo rejouée
+        :param fps: Cadence du capteur simulé
+        :param jitter: Retard aléatoire maximal (en secondes) ajouté à l'envoi de chaque frame
+        :param stall_every: Nombre de frames entre deux blocages du flux (0 pour aucun)
+        :param stall_duration: Durée d'un blocage en secondes
+        :param disconnect_every: Nombre de frames après lequel une connexion /stream est coupée (0 pour jamais)
+        :param drop_rate: Probabilité qu'une frame du capteur ne soit pas envoyée sur /stream (frame manquante)
+        :param corrupt_rate: Probabilité qu'une partie /stream soit tronquée (JPEG incomplet, Content-Length
+                             cohérent : le flux reste synchronisé, comme un tampon de trame abîmé du capteur)
+        :param jpeg_quality: Qualité de l'encodage JPEG
+        :param host: Adresse d'écoute
+        :param port: Port du serveur de contrôle (0 pour un port libre) ; le flux est servi sur port + 1
+        :param seed: Graine des tirages aléatoires (reproductibilité des benchmarks)
+        :param max_frames: Nombre maximal de frames de la vidéo gardées en mémoire
+        """
+        self.frames = load_frames(video_path, max_frames)  # Frames rejouées
+        self.fps = fps  # Cadence du capteur
+        self.jitter = jitter  # Gigue maximale
+        self.stall_every = stall_every  # Fréquence des blocages
+        self.stall_duration = stall_duration  # Durée des blocages
+        self.disconnect_every = disconnect_every  # Fréquence des coupures
+        self.drop_rate = drop_rate  # Probabilité de frame manquante
+        self.corrupt_rate = corrupt_rate  # Probabilité de frame tronquée
+        self.jpeg_quality = jpeg_quality  # Qualité JPEG
+        self.host = host  # Adresse d'écoute
+        self.random = random.Random(seed)  # Tirages aléatoires
+        self.lock = threading.Lock()  # Protection du générateur aléatoire et de la résolution
+        self.frame_size = None  # Résolution demandée par /control (None : résolution de la vidéo)
+        self.boot = time.monotonic()  # Démarrage de la caméra simulée
+
+        # Compteurs
+        self.frames_sent = 0  # Parties /stream envoyées
+        self.captures = 0  # Images /capture servies
+        self.stream_connections = 0  # Connexions /stream acceptées
+        self.disconnects = 0  # Connexions /stream coupées volontairement
+        self.frames_dropped = 0  # Frames du capteur non envoyées
+        self.frames_corrupted = 0  # Parties /stream tronquées
+
+        self.control_server, self.stream_server = self._bind(port)
+        self.threads = []  # Threads des serveurs
+
+    def _bind(self, port):
+        """
+        Ouvre le serveur de contrôle et le serveur de flux sur deux ports consécutifs.
+        """
+        simulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Connexions persistantes comme esp_http_server
+
+            def do_GET(self):
+                simulator.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        for _ in range(20):
+            control_server = ThreadingHTTPServer((self.host, port), Handler)
+            try:
+                stream_server = ThreadingHTTPServer((self.host, control_server.server_address[1] + 1), Handler)
+            except OSError:
+                control_server.server_close()
+                if port != 0:
+                    raise
+                continue
+            control_server.daemon_threads = stream_server.daemon_threads = True
+            return control_server, stream_server
+        raise OSError("Impossible de trouver deux ports consécutifs libres")
+
+    @property
+    def control_port(self):
+        """Port du serveur de contrôle (/capture, /status, /control)."""
+        return self.control_server.server_address[1]
+
+    @property
+    def stream_port(self):
+        """Port du serveur de flux (/stream)."""
+        return self.stream_server.server_address[1]
+
+    @property
+    def stream_url(self):
+        """URL du flux MJPEG."""
+        return f"http://{self.host}:{self.stream_port}/stream"
+
+    @property
+    def capture_url(self):
+        """URL du point d'accès /capture."""
+        return f"http://{self.host}:{self.control_port}/capture"
+
+    def start(self):
+        """
+        Démarre les deux serveurs en arrière-plan.
+
+        :return: Le simulateur lui-même (pour chaîner les appels)
+        """
+        for server in (self.control_server, self.stream_server):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        """
+        Arrête les serveurs.
+        """
+        for server in (self.control_server, self.stream_server):
+            server.shutdown()
+            server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _uniform(self, high):
+        """
+        Tire un retard aléatoire dans [0, high].
+        """
+        with self.lock:
+            return self.random.uniform(0.0, high)
+
+    def _happens(self, probability):
+        """
+        Tire un événement de probabilité donnée.
+        """
+        if probability <= 0.0:
+            return False
+        with self.lock:
+            return self.random.random() < probability
+
+    def _truncate(self, jpeg):
+        """
+        Coupe un JPEG entre 10 % et 90 % de sa taille (marqueur de fin perdu).
+        """
+        with self.lock:
+            cut = self.random.uniform(0.1, 0.9)
+        return jpeg[:max(2, int(len(jpeg) * cut))]
+
+    def current_frame(self):
+        """
+        Capture la frame courante du capteur simulé.
+
+        :return: Tuple (octets JPEG, secondes, microsecondes depuis le démarrage, numéro de frame)
+        """
+        elapsed = time.monotonic() - self.boot
+        number = int(elapsed * self.fps)
+        frame = self.frames[number % len(self.frames)]
+        with self.lock:
+            frame_size = self.frame_size
+        if frame_size is not None and (frame.shape[1], frame.shape[0]) != frame_size:
+            frame = cv2.resize(frame, frame_size, interpolation=cv2.INTER_AREA)
+        jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])[1].tobytes()
+        timestamp = number / self.fps
+        return jpeg, int(timestamp), int(round((timestamp % 1) * 1e6)) % 1000000, number
+
+    def handle(self, request):
+        """
+        Répond à une requête selon le serveur et le chemin, comme app_httpd.cpp.
+
+        :param request: BaseHTTPRequestHandler de la requête
+        """
+        parts = urlsplit(request.path)
+        on_stream_server = request.server is self.stream_server
+        if on_stream_server and parts.path == '/stream':
+            self._stream(request)
+        elif not on_stream_server and parts.path == '/capture':
+            self._capture(request)
+        elif not on_stream_server and parts.path == '/status':
+            self._status(request)
+        elif not on_stream_server and parts.path == '/control':
+            self._control(request, parse_qs(parts.query))
+        else:
+            request.send_error(404)
+
+    def _send(self, request, body, content_type, headers=None):
+        """
+        Envoie une réponse complète.
+        """
+        request.send_response(200)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', str(len(body)))
+        request.send_header('Access-Control-Allow-Origin', '*')
+        for key, value in (headers or {}).items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(body)
+
+    def _capture(self, request):
+        """
+        Sert une image unique (capture_handler).
+        """
+        time.sleep(self._uniform(self.jitter))
+        jpeg, sec, usec, _ = self.current_frame()
+        self.captures += 1
+        self._send(request, jpeg, 'image/jpeg', {
+            'Content-Disposition': 'inline; filename=capture.jpg',
+            'X-Timestamp': '%d.%06d' % (sec, usec),
+        })
+
+    def _status(self, request):
+        """
+        Sert l'état du capteur (status_handler, réduit à la résolution).
+        """
+        with self.lock:
+            size = self.frame_size
+        if size is None:
+            size = (self.frames[0].shape[1], self.frames[0].shape[0])
+        framesize = next((value for value, wh in FRAME_SIZES.items() if wh == size), 0)
+        self._send(request, json.dumps({'framesize': framesize}).encode(), 'application/json')
+
+    def _control(self, request, query):
+        """
+        Applique une commande du capteur (cmd_handler, seule framesize a un effet).
+        """
+        variable = query.get('var', [''])[0]
+        value = query.get('val', [''])[0]
+        if not variable or not value.lstrip('-').isdigit():
+            request.send_error(404)
+            return
+        if variable == 'framesize' and int(value) in FRAME_SIZES:
+            with self.lock:
+                self.frame_size = FRAME_SIZES[int(value)]
+        self._send(request, b'', 'text/html')
+
+    def _stream(self, request):
+        """
+        Sert le flux MJPEG (stream_handler) avec gigue, blocages, coupures, frames manquantes et tronquées simulés.
+        """
+        self.stream_connections += 1
+        request.send_response(200)
+        request.send_header('Content-Type', STREAM_CONTENT_TYPE)
+        request.send_header('Transfer-Encoding', 'chunked')
+        request.send_header('Access-Control-Allow-Origin', '*')
+        request.send_header('X-Framerate', str(int(self.fps)))
+        request.end_headers()
+
+        def send_chunk(data):
+            request.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+        sent = 0
+        last_number = None
+        try:
+            while True:
+                # Attend la prochaine frame du capteur
+                elapsed = time.monotonic() - self.boot
+                next_number = int(elapsed * self.fps) + 1
+                time.sleep(max(0.0, next_number / self.fps - elapsed))
+                time.sleep(self._uniform(self.jitter))
+
+                jpeg, sec, usec, number = self.current_frame()
+                if number == last_number:
+                    continue
+                last_number = number
+                if self._happens(self.drop_rate):
+                    self.frames_dropped += 1
+                    continue
+                if self._happens(self.corrupt_rate):
+                    jpeg = self._truncate(jpeg)
+                    self.frames_corrupted += 1
+
+                send_chunk(STREAM_BOUNDARY.encode())
+                send_chunk((STREAM_PART % (len(jpeg), sec, usec)).encode())
+                send_chunk(jpeg)
+                request.wfile.flush()
+                sent += 1
+                self.frames_sent += 1
+
+                if self.stall_every and sent % self.stall_every == 0:
+                    time.sleep(self.stall_duration)
+                if self.disconnect_every and sent % self.disconnect_every == 0:
+                    # Coupure brutale, sans fin de réponse chunked
+                    self.disconnects += 1
+                    request.close_connection = True
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+    def stats(self):
+        """
+        Retourne les compteurs du simulateur.
+
+        :return: Dictionnaire (parties envoyées, captures, connexions et coupures du flux, frames manquantes et tronquées)
+        """
+        return {
+            'frames_sent': self.frames_sent,
+            'captures': self.captures,
+            'stream_connections': self.stream_connections,
+            'disconnects': self.disconnects,
+            'frames_dropped': self.frames_dropped,
+            'frames_corrupted': self.frames_corrupted,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulateur local de caméra ESP32 (/stream, /capture, /control)")
+    parser.add_argument('video', help="Vidéo rejouée en boucle")
+    parser.add_argument('--fps', type=float, default=15.0)
+    parser.add_argument('--jitter', type=float, default=0.0, help="Gigue maximale en secondes")
+    parser.add_argument('--stall-every', type=int, default=0, help="Frames entre deux blocages")
+    parser.add_argument('--stall-duration', type=float, default=0.0, help="Durée d'un blocage en secondes")
+    parser.add_argument('--disconnect-every', type=int, default=0, help="Frames avant chaque coupure du flux")
+    parser.add_argument('--drop-rate', type=float, default=0.0, help="Probabilité qu'une frame ne soit pas envoyée")
+    parser.add_argument('--corrupt-rate', type=float, default=0.0, help="Probabilité qu'une frame soit tronquée")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help="Port de contrôle (le flux est sur port + 1)")
+    args = parser.parse_args()
+
+    simulator = Esp32Simulator(args.video, fps=args.fps, jitter=args.jitter, stall_every=args.stall_every,
+                               stall_duration=args.stall_duration, disconnect_every=args.disconnect_every,
+                               drop_rate=args.drop_rate, corrupt_rate=args.corrupt_rate,
+                               host=args.host, port=args.port).start()
+    print(f"Flux : {simulator.stream_url}")
+    print(f"Capture : {simulator.capture_url}")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    simulator.stop()
+    print(simulator.stats())
+
+
+if __name__ == '__main__':
+    main()
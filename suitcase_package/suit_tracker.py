@@ -1,22 +1,32 @@
 # Importation des bibliothèques nécessaires
-from ultralytics import YOLO  # Importation du modèle YOLO pour la détection d'objets
 import pandas as pd  # Importation de pandas pour la manipulation des données
 import numpy as np  # Importation de numpy pour les opérations numériques
 from deep_sort.deep_sort import DeepSort  # Importation de DeepSort pour le suivi d'objets
+from model_registry import get_detector, get_extractor  # Importation du registre des modèles partagés
 import suitcase_package as sp  # Importation du package pour la gestion des valises
+from utils.bbox_utils import boxes_to_detections  # Conversion des boîtes YOLO en détections DeepSort
 
 # Chemin vers les poids du modèle DeepSort
 DEEP_SORT_WEIGHTS = 'C:/Ensta/Tracking/wetransfer_deep_sort_2025-02-04_1256/deep_sort/deep/checkpoint/ckpt.t7'
 
 class SuitcaseTracker:
-    def __init__(self, model_path):
+    class_id = 28  # Classe COCO des valises
+    conf = 0.1  # Seuil de confiance des détections
+
+    def __init__(self, model_path, extractor=None, feature_reuse=0, crop_mode='slice'):
         """
         Initialise une nouvelle instance de la classe SuitcaseTracker.
 
-        :param model_path: Chemin vers le modèle YOLO pour la détection d'objets.
+        :param model_path: Chemin vers le modèle YOLO pour la détection d'objets (None si la détection est faite par un détecteur partagé).
+        :param extractor: Extracteur de re-ID à utiliser (celui du registre des modèles par défaut).
+        :param feature_reuse: Nombre maximal de frames consécutives réutilisant l'embedding d'une piste isolée (0 pour toujours extraire).
+        :param crop_mode: Découpe des patchs de re-ID de l'extracteur du registre ('slice' ou 'roi_align').
         """
-        self.model = YOLO(model_path)  # Chargement du modèle YOLO
-        self.tracker = DeepSort(model_path=DEEP_SORT_WEIGHTS, max_age=30)  # Initialisation du tracker DeepSort
+        self.model = get_detector(model_path) if model_path is not None else None  # Modèle YOLO partagé du registre
+        if extractor is None:
+            extractor = get_extractor(DEEP_SORT_WEIGHTS, crop_mode=crop_mode)  # Extracteur de re-ID partagé du registre
+        self.tracker = DeepSort(model_path=DEEP_SORT_WEIGHTS, max_age=30, extractor=extractor,
+                                reuse_refresh=feature_reuse)  # Initialisation du tracker DeepSort
         self.historical_positions = pd.DataFrame(columns=['x1', 'y1', 'x2', 'y2'])  # DataFrame pour stocker les positions historiques
         self.frames = []  # Liste pour stocker les trames vidéo
 
@@ -30,20 +40,26 @@ class SuitcaseTracker:
         :param keypoints: Points clés pour le mappage des coordonnées.
         :return: Objet SuitPop mis à jour avec les valises détectées.
         """
-        suit_pop.clear()  # Vide la collection de valises actuelle
-
         # Détection des objets dans la trame avec le modèle YOLO
-        results = self.model(frame, classes=[28], conf=0.1, verbose=False)
+        results = self.model(frame, classes=[self.class_id], conf=self.conf, verbose=False)
 
         # Conversion des résultats en détections (boîtes englobantes, confiance, classe)
-        detections = [
-            (
-                [int((box[0] + box[2]) / 2), int((box[1] + box[3]) / 2), int(box[2] - box[0]), int(box[3] - box[1])],
-                float(box[4]),
-                int(box[5])
-            )
-            for box in results[0].boxes.data.tolist()
-        ]
+        detections = boxes_to_detections(results[0].boxes.data.tolist())
+
+        return self.update_frame(frame, detections, suit_pop, mini_map, keypoints)
+
+    def update_frame(self, frame, detections, suit_pop, mini_map, keypoints):
+        """
+        Suit les valises à partir de détections déjà calculées (ex. par un détecteur partagé).
+
+        :param frame: Trame vidéo actuelle.
+        :param detections: Détections ([xc, yc, w, h], confiance, classe) des valises.
+        :param suit_pop: Objet SuitPop pour gérer la collection de valises.
+        :param mini_map: Carte miniature pour le suivi.
+        :param keypoints: Points clés pour le mappage des coordonnées.
+        :return: Objet SuitPop mis à jour avec les valises détectées.
+        """
+        suit_pop.clear()  # Vide la collection de valises actuelle
 
         if detections:
             # Conversion des boîtes englobantes au format xywh
@@ -52,13 +68,59 @@ class SuitcaseTracker:
 
             # Mise à jour du tracker DeepSort avec les nouvelles détections
             tracks = self.tracker.update(bboxes_xywh, confidences, frame)
+            self.__add_tracks(tracks, frame, suit_pop, mini_map, keypoints)
 
-            # Ajout des valises détectées à la collection
-            for track in tracks:
-                track_id = int(track[4])  # Identifiant unique du track
-                x1, y1, x2, y2 = map(int, track[:4])  # Coordonnées de la boîte englobante
+        return suit_pop  # Retourne la collection de valises mise à jour
 
-                # Ajout de la valise à la collection
-                suit_pop.add(sp.Suit(id=track_id, bbox=[x1, y1, x2, y2], frame=frame, mini_map=mini_map, keypoints=keypoints))
+    def coast_frame(self, frame, suit_pop, mini_map, keypoints):
+        """
+        Avance les pistes d'une frame sans détection (frame statique, détecteur évité).
 
-        return suit_pop  # Retourne la collection de valises mise à jour
+        :param frame: Trame vidéo actuelle.
+        :param suit_pop: Objet SuitPop pour gérer la collection de valises.
+        :param mini_map: Carte miniature pour le suivi.
+        :param keypoints: Points clés pour le mappage des coordonnées.
+        :return: Objet SuitPop avec les valises à leur position prédite.
+        """
+        suit_pop.clear()  # Vide la collection de valises actuelle
+        tracks = self.tracker.predict()  # Prédiction de Kalman seule
+        self.__add_tracks(tracks, frame, suit_pop, mini_map, keypoints)
+        return suit_pop
+
+    def propagate_frame(self, frame, boxes, track_ids, suit_pop, mini_map, keypoints):
+        """
+        Suit les valises à partir de boîtes propagées par flot optique, sans réextraire leur apparence.
+
+        :param frame: Trame vidéo actuelle.
+        :param boxes: Boîtes propagées (x1, y1, x2, y2).
+        :param track_ids: ID du track de chaque boîte.
+        :param suit_pop: Objet SuitPop pour gérer la collection de valises.
+        :param mini_map: Carte miniature pour le suivi.
+        :param keypoints: Points clés pour le mappage des coordonnées.
+        :return: Objet SuitPop mis à jour avec les valises propagées.
+        """
+        suit_pop.clear()  # Vide la collection de valises actuelle
+
+        if boxes:
+            # Boîtes au format xywh, confiance maximale et apparence mémorisée de chaque track
+            bboxes_xywh = np.array([[(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1] for x1, y1, x2, y2 in boxes], dtype=float)
+            confidences = np.ones(len(boxes))
+            features = self.tracker.track_features(track_ids)
+
+            tracks = self.tracker.update(bboxes_xywh, confidences, frame, features=features)
+            self.__add_tracks(tracks, frame, suit_pop, mini_map, keypoints)
+
+        return suit_pop
+
+    def __add_tracks(self, tracks, frame, suit_pop, mini_map, keypoints):
+        """
+        Ajoute les pistes DeepSort à la collection.
+
+        :param tracks: Pistes (x1, y1, x2, y2, id) renvoyées par DeepSort.
+        """
+        for track in tracks:
+            track_id = int(track[4])  # Identifiant unique du track
+            x1, y1, x2, y2 = map(int, track[:4])  # Coordonnées de la boîte englobante
+
+            # Ajout de la valise à la collection
+            suit_pop.add(sp.Suit(id=track_id, bbox=[x1, y1, x2, y2], frame=frame, mini_map=mini_map, keypoints=keypoints))
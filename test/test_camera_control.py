@@ -0,0 +1,83 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from capture_package import FRAME_SIZES, closest_frame_size, negotiate_frame_size
+from capture_package.camera_control import control_url
+
+
+class ControlHandler(BaseHTTPRequestHandler):
+    framesize = 13  # UXGA, comme CameraWebServer.ino
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == '/status':
+            body = json.dumps({'framesize': ControlHandler.framesize}).encode()
+        elif parts.path == '/control':
+            query = parse_qs(parts.query)
+            if query['var'][0] == 'framesize':
+                ControlHandler.framesize = int(query['val'][0])
+            body = b''
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestCameraControl(unittest.TestCase):
+
+    def test_closest_frame_size_covers_target(self):
+        self.assertEqual(FRAME_SIZES[closest_frame_size(800, 600)], (800, 600))
+        self.assertEqual(FRAME_SIZES[closest_frame_size(700, 500)], (800, 600))
+        self.assertEqual(FRAME_SIZES[closest_frame_size(4000, 3000)], (1600, 1200))
+
+    def test_closest_frame_size_keeps_aspect_ratio(self):
+        self.assertEqual(FRAME_SIZES[closest_frame_size(640, 360)], (640, 480))
+        self.assertEqual(FRAME_SIZES[closest_frame_size(640, 360, aspect=1280 / 720)], (1280, 720))
+        self.assertEqual(FRAME_SIZES[closest_frame_size(700, 500, aspect=4 / 3)], (800, 600))
+
+    def test_control_url_from_stream_and_capture(self):
+        self.assertEqual(control_url("http://172.20.10.14:81/stream"), "http://172.20.10.14")
+        self.assertEqual(control_url("http://172.20.10.14/capture"), "http://172.20.10.14")
+        self.assertEqual(control_url("http://127.0.0.1:8081/stream"), "http://127.0.0.1:8080")
+
+    def test_negotiates_processing_resolution(self):
+        ControlHandler.framesize = 13
+        server = HTTPServer(('127.0.0.1', 0), ControlHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/capture"
+            self.assertEqual(negotiate_frame_size(url, 0.5), ((800, 600), (800, 600)))
+            self.assertEqual(ControlHandler.framesize, 9)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_hd_source_keeps_its_field_of_view(self):
+        ControlHandler.framesize = 11  # HD 16:9 : aucune résolution 16:9 plus petite
+        server = HTTPServer(('127.0.0.1', 0), ControlHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/capture"
+            self.assertEqual(negotiate_frame_size(url, 0.5), ((640, 360), (1280, 720)))
+            self.assertEqual(ControlHandler.framesize, 11)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_negotiation_failure_returns_none(self):
+        self.assertIsNone(negotiate_frame_size("http://127.0.0.1:9/capture", 0.5, timeout=0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
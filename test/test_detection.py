@@ -0,0 +1,102 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from pipeline_package.batching import BatchScheduler
+from pipeline_package.detection import split_detections, floor_roi, roi_imgsz, SharedDetector, DEFAULT_CLASS_CONF
+
+
+class TestSplitDetections(unittest.TestCase):
+
+    def test_applies_per_class_threshold(self):
+        boxes = [
+            [10, 20, 30, 60, 0.9, 0],   # personne gardée
+            [10, 20, 30, 60, 0.3, 0],   # personne sous le seuil de 0.5
+            [40, 50, 60, 70, 0.15, 28],  # valise gardée (seuil 0.1)
+            [40, 50, 60, 70, 0.05, 28],  # valise sous le seuil
+            [0, 0, 5, 5, 0.9, 2],       # classe non suivie
+        ]
+
+        detections = split_detections(boxes, DEFAULT_CLASS_CONF)
+
+        self.assertEqual(set(detections), {0, 28})
+        self.assertEqual(detections[0], [([20, 40, 20, 40], 0.9, 0)])
+        self.assertEqual(detections[28], [([50, 60, 20, 20], 0.15, 28)])
+
+    def test_empty_classes_are_present(self):
+        detections = split_detections([], DEFAULT_CLASS_CONF)
+        self.assertEqual(detections, {0: [], 28: []})
+
+
+class TestFloorRoi(unittest.TestCase):
+
+    def test_roi_covers_quad_with_head_room(self):
+        keypoints = [200, 300, 600, 300, 700, 500, 100, 500]
+        self.assertEqual(floor_roi(keypoints, (720, 1280, 3)), (70, 200, 730, 510))
+        # Rectangle limité à la frame
+        self.assertEqual(floor_roi(keypoints, (505, 720, 3)), (70, 200, 720, 505))
+        self.assertIsNone(floor_roi([], (720, 1280, 3)))
+
+    def test_rectangular_input_keeps_frame_scale(self):
+        # Frame 1280x720 réduite à 640 de large : région 660x310 -> 330x155 arrondi au pas de 32
+        self.assertEqual(roi_imgsz((720, 1280, 3), (70, 200, 730, 510)), (160, 352))
+
+    def test_boxes_are_mapped_back_to_frame(self):
+        result = MagicMock()
+        result.boxes.data.tolist.return_value = [[10, 20, 30, 60, 0.9, 0]]
+        model = MagicMock(return_value=[result])
+        with patch('pipeline_package.detection.get_detector', return_value=model):
+            detector = SharedDetector('yolo')
+
+        frame = np.zeros((720, 1280, 3), np.uint8)
+        detections = detector.detect(frame, (70, 200, 730, 510))
+
+        crops = model.call_args[0][0]
+        self.assertEqual(crops[0].shape, (310, 660, 3))
+        self.assertEqual(model.call_args[1]['imgsz'], [160, 352])
+        self.assertEqual(detections[0], [([90, 240, 20, 40], 0.9, 0)])
+
+
+class FakePipeline:
+    def __init__(self, packet, delay=0.0):
+        self.packet = packet
+        self.delay = delay
+        self.reader = MagicMock()
+        self.reader.is_finished.return_value = False
+
+    def read(self, timeout=None):
+        if self.delay > timeout:
+            time.sleep(timeout)
+            return None
+        return self.packet
+
+
+class TestBatchScheduler(unittest.TestCase):
+
+    def test_slow_camera_does_not_stall_batch(self):
+        scheduler = BatchScheduler(MagicMock(), max_wait=0.05)
+        fast1, slow, fast2 = FakePipeline('a'), FakePipeline('b', delay=1.0), FakePipeline('c')
+
+        start = time.monotonic()
+        batch = scheduler.gather([fast1, slow, fast2])
+
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual([packet for _, packet in batch], ['a', 'c'])
+        self.assertEqual(scheduler.stats()['late_frames'], 1)
+
+    def test_detect_runs_one_batch(self):
+        detector = MagicMock()
+        detector.detect_batch.return_value = [{0: [], 28: []}] * 3
+        scheduler = BatchScheduler(detector)
+
+        results = scheduler.detect(['f1', 'f2', 'f3'])
+
+        detector.detect_batch.assert_called_once_with(['f1', 'f2', 'f3'])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(scheduler.stats()['mean_batch_size'], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
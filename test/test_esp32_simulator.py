@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from capture_package import FrameReader, MjpegStream, SnapshotSource, negotiate_frame_size
+from simulator_package import Esp32Simulator
+from test_frame_reader import write_test_video
+
+
+class TestEsp32Simulator(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.video_path = os.path.join(tempfile.mkdtemp(), 'hall.avi')
+        write_test_video(cls.video_path, n_frames=10, size=(640, 480))
+
+    def test_stream_matches_firmware_format(self):
+        with Esp32Simulator(self.video_path, fps=50) as simulator:
+            stream = MjpegStream(simulator.stream_url)
+            frames = [stream.read() for _ in range(3)]
+            timestamps = [stream.timestamp]
+            stream.release()
+
+        self.assertTrue(all(ret for ret, _ in frames))
+        self.assertEqual(frames[0][1].shape, (480, 640, 3))
+        self.assertGreater(timestamps[0], 0.0)
+
+    def test_capture_and_framesize_negotiation(self):
+        with Esp32Simulator(self.video_path, fps=50) as simulator:
+            self.assertEqual(negotiate_frame_size(simulator.stream_url, 0.5), ((320, 240), (320, 240)))
+            ret, frame = SnapshotSource(simulator.capture_url).read()
+
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (240, 320, 3))
+
+    def test_reader_reconnects_after_disconnect(self):
+        with Esp32Simulator(self.video_path, fps=50, disconnect_every=5) as simulator:
+            reader = FrameReader(simulator.stream_url, reconnect_delay=0.05).start()
+            packets = [reader.read_packet(timeout=2) for _ in range(12)]
+            reader.release()
+
+        self.assertTrue(all(packet is not None for packet in packets))
+        self.assertGreaterEqual(reader.reconnects, 1)
+        self.assertGreaterEqual(simulator.stats()['stream_connections'], 2)
+
+    def test_reader_skips_dropped_and_truncated_frames(self):
+        with Esp32Simulator(self.video_path, fps=50, drop_rate=0.2, corrupt_rate=0.3, seed=0) as simulator:
+            reader = FrameReader(simulator.stream_url).start()
+            packets = [reader.read_packet(timeout=2) for _ in range(12)]
+            reader.release()
+            stats = simulator.stats()
+
+        self.assertTrue(all(packet is not None and packet.image.shape == (480, 640, 3) for packet in packets))
+        self.assertGreater(stats['frames_dropped'], 0)
+        self.assertGreater(reader.stats()['frames_corrupt'], 0)
+        self.assertEqual(reader.reconnects, 0)
+        # Horodatages toujours croissants malgré les frames manquantes
+        gaps = [b.timestamp - a.timestamp for a, b in zip(packets, packets[1:])]
+        self.assertTrue(all(gap > 0 for gap in gaps))
+
+
+if __name__ == '__main__':
+    unittest.main()
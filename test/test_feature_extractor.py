@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+import torch
+import torchvision.transforms as transforms
+
+from deep_sort.deep.feature_extractor import Extractor
+from deep_sort.deep.model import Net
+
+
+def reference_preprocess(im_crops, size=(64, 128)):
+    # Prétraitement d'origine, crop par crop
+    norm = transforms.Compose([
+        transforms.ToTensor(),
+        transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225]),
+    ])
+    return torch.cat([norm(cv2.resize(im.astype(np.float32) / 255., size)).unsqueeze(0)
+                      for im in im_crops], dim=0).float()
+
+
+class TestExtractor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        path = os.path.join(cls.tmp, 'ckpt.t7')
+        torch.save({'net_dict': Net(reid=True).state_dict()}, path)
+        cls.extractor = Extractor(path, use_cuda=False)
+
+    def crops(self, n):
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 255, (int(rng.integers(40, 200)), int(rng.integers(20, 100)), 3), dtype=np.uint8)
+                for _ in range(n)]
+
+    def test_batched_preprocess_matches_per_crop_path(self):
+        crops = self.crops(7)
+        batch = self.extractor._preprocess(crops)
+        self.assertEqual(tuple(batch.shape), (7, 3, 128, 64))
+        # Seul écart : arrondi du redimensionnement fait en uint8
+        np.testing.assert_allclose(batch.numpy(), reference_preprocess(crops).numpy(), atol=0.02)
+
+    def test_buffer_is_reused_across_batch_sizes(self):
+        features = self.extractor(self.crops(5))
+        self.assertEqual(features.shape[0], 5)
+        buffer = self.extractor._buffer
+        self.assertEqual(self.extractor(self.crops(2)).shape[0], 2)
+        self.assertIs(self.extractor._buffer, buffer)
+
+    def test_roi_align_patches_match_slice_crops(self):
+        rng = np.random.default_rng(1)
+        frame = cv2.GaussianBlur(rng.integers(0, 255, (240, 320, 3), dtype=np.uint8), (9, 9), 0)
+        boxes = [(10, 20, 60, 140), (100, 30, 180, 230), (250, 0, 320, 100)]
+        roi_extractor = Extractor(os.path.join(self.tmp, 'ckpt.t7'), use_cuda=False, crop_mode='roi_align')
+
+        patches = roi_extractor._preprocess_boxes(frame, boxes)
+        crops = self.extractor._preprocess([frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes])
+        self.assertEqual(patches.shape, crops.shape)
+        self.assertLess((patches - crops).abs().mean().item(), 0.05)
+        self.assertEqual(roi_extractor(frame, boxes=boxes).shape[0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
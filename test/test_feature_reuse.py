@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from deep_sort.deep_sort import DeepSort
+
+
+class CountingExtractor:
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, crops):
+        self.calls.append(len(crops))
+        return np.ones((len(crops), 4), np.float32)
+
+
+class TestFeatureReuse(unittest.TestCase):
+
+    def setUp(self):
+        self.extractor = CountingExtractor()
+        self.frame = np.zeros((240, 320, 3), np.uint8)
+
+    def run_frames(self, boxes, frames, reuse_refresh=2):
+        tracker = DeepSort(model_path=None, n_init=1, extractor=self.extractor, reuse_refresh=reuse_refresh)
+        boxes = np.array(boxes, dtype=float)
+        for _ in range(frames):
+            outputs = tracker.update(boxes, np.ones(len(boxes)), self.frame)
+        return tracker, outputs
+
+    def test_isolated_track_reuses_its_feature_with_refresh(self):
+        tracker, outputs = self.run_frames([[100.0, 120.0, 40.0, 100.0]], frames=7)
+        # création, confirmation, 2 réutilisations, rafraîchissement, 2 réutilisations
+        self.assertEqual(self.extractor.calls, [1, 1, 1])
+        self.assertEqual(len(outputs), 1)
+        self.assertEqual(tracker.reuse_stats(), {'detections': 7, 'reused': 4, 'hit_rate': 4 / 7})
+
+    def test_nearby_tracks_are_always_extracted(self):
+        tracker, outputs = self.run_frames([[100.0, 120.0, 40.0, 100.0], [130.0, 120.0, 40.0, 100.0]], frames=5)
+        self.assertEqual(self.extractor.calls, [2] * 5)
+        self.assertEqual(len(outputs), 2)
+        self.assertEqual(tracker.reuse_stats()['reused'], 0)
+
+    def test_disabled_by_default(self):
+        self.run_frames([[100.0, 120.0, 40.0, 100.0]], frames=4, reuse_refresh=0)
+        self.assertEqual(self.extractor.calls, [1] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from deep_sort.deep_sort import DeepSort
+from pipeline_package import FlowPropagator
+
+
+def textured_frame(dx=0, dy=0):
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, (60, 40), dtype=np.uint8)
+    texture = np.kron(texture, np.ones((2, 2), np.uint8))  # Motif lisse à l'échelle de LK
+    frame = np.full((240, 320, 3), 30, np.uint8)
+    frame[60 + dy:180 + dy, 100 + dx:180 + dx] = texture[:, :, None]
+    return frame
+
+
+class TestFlowPropagator(unittest.TestCase):
+
+    def test_keyframe_schedule(self):
+        propagator = FlowPropagator(keyframe_interval=3)
+        schedule = []
+        for _ in range(7):
+            schedule.append(propagator.is_keyframe())
+            propagator.schedule(schedule[-1])
+        self.assertEqual(schedule, [True, False, False, True, False, False, True])
+
+    def test_moves_box_with_the_object(self):
+        propagator = FlowPropagator()
+        propagator.keyframe(textured_frame())
+        boxes = propagator.propagate(textured_frame(dx=6, dy=4), [[100, 60, 180, 180]])
+        np.testing.assert_allclose(boxes[0], [106, 64, 186, 184], atol=1.0)
+
+
+class TestDeepSortSuppliedFeatures(unittest.TestCase):
+
+    def test_propagated_boxes_reuse_track_features(self):
+        calls = []
+
+        def extractor(crops):
+            calls.append(len(crops))
+            return np.ones((len(crops), 4), np.float32)
+
+        tracker = DeepSort(model_path=None, n_init=1, extractor=extractor)
+        frame = textured_frame()
+        for _ in range(2):
+            outputs = tracker.update(np.array([[140.0, 120.0, 80.0, 120.0]]), np.array([0.9]), frame)
+        track_id = outputs[0][4]
+
+        features = tracker.track_features([track_id])
+        outputs = tracker.update(np.array([[146.0, 124.0, 80.0, 120.0]]), np.array([1.0]), frame, features=features)
+        self.assertEqual(calls, [1, 1])
+        self.assertEqual(outputs[0][4], track_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
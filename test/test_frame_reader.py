@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from capture_package import FrameReader, StrideSkipper, RateSkipper, AdaptiveSkipper
+
+
+def write_test_video(path, n_frames=12, size=(64, 48)):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 25, size)
+    for i in range(n_frames):
+        frame = np.full((size[1], size[0], 3), i * 10, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+
+
+class TestFrameReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, 'test.avi')
+        write_test_video(self.video_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_file_source_keeps_every_frame(self):
+        reader = FrameReader(self.video_path, buffer_size=2).start()
+        indices = []
+        while True:
+            packet = reader.read_packet(timeout=5)
+            if packet is None:
+                break
+            indices.append(packet.index)
+        reader.release()
+
+        self.assertEqual(indices, list(range(12)))
+        self.assertEqual(reader.stats()['frames_dropped'], 0)
+
+    def test_drop_oldest_keeps_freshest_frame(self):
+        reader = FrameReader(self.video_path, buffer_size=1, drop_oldest=True).start()
+        reader.thread.join(timeout=5)
+
+        packet = reader.read_packet(timeout=1)
+        stats = reader.stats()
+        reader.release()
+
+        self.assertEqual(packet.index, 11)
+        self.assertEqual(stats['frames_read'], 12)
+        self.assertEqual(stats['frames_dropped'], 11)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_read_is_videocapture_compatible(self):
+        reader = FrameReader(self.video_path).start()
+        ret, frame = reader.read()
+        reader.release()
+
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (48, 64, 3))
+
+    def test_stride_skipper_only_decodes_kept_frames(self):
+        reader = FrameReader(self.video_path, skipper=StrideSkipper(5)).start()
+        indices = []
+        while True:
+            packet = reader.read_packet(timeout=5)
+            if packet is None:
+                break
+            indices.append(packet.index)
+        reader.release()
+
+        self.assertEqual(indices, [0, 5, 10])
+        self.assertEqual(reader.stats()['frames_skipped'], 9)
+
+
+class TestRateSkipper(unittest.TestCase):
+
+    def test_targets_processed_frames_per_second(self):
+        skipper = RateSkipper(target_fps=5)
+        # Flux à 25 fps pendant 2 secondes
+        kept = [i for i in range(50) if skipper.should_process(i, i / 25.0)]
+        self.assertEqual(len(kept), 10)
+        self.assertEqual(kept[:3], [0, 5, 10])
+
+
+class TestAdaptiveSkipper(unittest.TestCase):
+
+    def run_stream(self, skipper, processing_time, n_frames=100, fps=25.0):
+        kept = []
+        for i in range(n_frames):
+            if skipper.should_process(i, i / fps):
+                kept.append(i)
+                skipper.report(processing_time)
+        return kept
+
+    def test_full_rate_when_processing_is_fast(self):
+        skipper = AdaptiveSkipper()
+        kept = self.run_stream(skipper, processing_time=0.01)
+        self.assertEqual(len(kept), 100)
+        self.assertEqual(skipper.stride, 1)
+        self.assertAlmostEqual(skipper.effective_fps, 25.0)
+
+    def test_skips_to_keep_up_when_processing_is_slow(self):
+        skipper = AdaptiveSkipper()
+        self.run_stream(skipper, processing_time=0.15)
+        # 25 fps x 150 ms : une frame sur 4 pour ne pas accumuler de retard
+        self.assertEqual(skipper.stride, 4)
+        self.assertAlmostEqual(skipper.effective_fps, 25.0 / 4)
+
+    def test_cpu_budget_raises_stride(self):
+        skipper = AdaptiveSkipper(cpu_budget=0.5)
+        self.run_stream(skipper, processing_time=0.03)
+        self.assertEqual(skipper.stride, 2)
+
+    def test_latency_target_raises_then_relaxes_stride(self):
+        skipper = AdaptiveSkipper(target_latency=0.2)
+        for _ in range(3):
+            skipper.report(0.01, latency=0.5)
+        self.assertEqual(skipper.stride, 4)
+        for _ in range(20):
+            skipper.report(0.01, latency=0.01)
+        self.assertEqual(skipper.stride, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from pipeline_package import IgnoreMask
+
+SCREEN = [0, 0, 100, 0, 100, 50, 0, 50]  # Écran en haut à gauche
+
+
+class TestIgnoreMask(unittest.TestCase):
+
+    def test_filters_detections_centered_in_polygons(self):
+        mask = IgnoreMask([SCREEN])
+        detections = {
+            0: [([50, 25, 20, 40], 0.9, 0), ([200, 150, 20, 40], 0.8, 0)],
+            28: [([90, 40, 10, 10], 0.2, 28)],
+        }
+
+        kept = mask.filter(detections, (240, 320, 3))
+
+        self.assertEqual(kept[0], [([200, 150, 20, 40], 0.8, 0)])
+        self.assertEqual(kept[28], [])
+        self.assertEqual(mask.stats()['ignored_detections'], 2)
+
+    def test_polygons_follow_the_frame_resolution(self):
+        mask = IgnoreMask([SCREEN], size=(160, 120))
+        kept = mask.filter({0: [([150, 80, 20, 40], 0.9, 0)]}, (240, 320, 3))
+        self.assertEqual(kept[0], [])
+
+    def test_blackout_copies_the_frame(self):
+        frame = np.full((240, 320, 3), 200, np.uint8)
+        self.assertIs(IgnoreMask([SCREEN]).apply(frame), frame)
+
+        masked = IgnoreMask([SCREEN], blackout=True).apply(frame)
+        self.assertEqual(masked[10, 10].tolist(), [0, 0, 0])
+        self.assertEqual(masked[200, 200].tolist(), [200, 200, 200])
+        self.assertEqual(frame[10, 10].tolist(), [200, 200, 200])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import cv2
+import numpy as np
+
+from capture_package import MjpegStream
+from capture_package.mjpeg_stream import reduced_decode
+
+PART_BOUNDARY = "123456789000000000000987654321"
+
+
+def make_jpeg(value):
+    frame = np.full((48, 64, 3), value, dtype=np.uint8)
+    return cv2.imencode('.jpg', frame)[1].tobytes()
+
+
+class StreamHandler(BaseHTTPRequestHandler):
+    n_frames = 6
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'multipart/x-mixed-replace;boundary=' + PART_BOUNDARY)
+        self.end_headers()
+        for i in range(self.n_frames):
+            jpeg = make_jpeg(i * 40)
+            self.wfile.write(("\r\n--" + PART_BOUNDARY + "\r\n").encode())
+            self.wfile.write(("Content-Type: image/jpeg\r\nContent-Length: %u\r\nX-Timestamp: %d.%06d\r\n\r\n"
+                              % (len(jpeg), 100 + i, 250000)).encode())
+            self.wfile.write(jpeg)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestMjpegStream(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StreamHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/stream"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_grab_skips_parts_without_decoding(self):
+        stream = MjpegStream(self.url)
+        self.assertTrue(stream.isOpened())
+
+        timestamps = []
+        frames = []
+        while stream.grab():
+            timestamps.append(stream.timestamp)
+            if len(timestamps) % 2 == 0:
+                ret, frame = stream.retrieve()
+                self.assertTrue(ret)
+                frames.append(frame)
+        stream.release()
+
+        self.assertEqual(timestamps, [100.25, 101.25, 102.25, 103.25, 104.25, 105.25])
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].shape, (48, 64, 3))
+        self.assertAlmostEqual(float(frames[0].mean()), 40, delta=3)
+
+    def test_decodes_directly_at_reduced_scale(self):
+        stream = MjpegStream(self.url, scale=0.5)
+        ret, frame = stream.read()
+        stream.release()
+
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (24, 32, 3))
+
+    def test_reduced_decode_choice(self):
+        self.assertEqual(reduced_decode(0.5), (cv2.IMREAD_REDUCED_COLOR_2, 1.0))
+        self.assertEqual(reduced_decode(0.125), (cv2.IMREAD_REDUCED_COLOR_8, 1.0))
+        flag, residual = reduced_decode(0.3)
+        self.assertEqual(flag, cv2.IMREAD_REDUCED_COLOR_2)
+        self.assertAlmostEqual(residual, 0.6)
+        self.assertEqual(reduced_decode(1.0), (cv2.IMREAD_COLOR, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
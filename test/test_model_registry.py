@@ -0,0 +1,48 @@
+import threading
+import unittest
+
+from model_registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_loads_each_model_once(self):
+        registry = ModelRegistry()
+        loaded = []
+
+        def loader():
+            loaded.append(1)
+            return lambda x: x * 2
+
+        handles = [registry._get(('detector', 'yolov10n'), loader) for _ in range(4)]
+
+        self.assertEqual(len(loaded), 1)
+        self.assertTrue(all(h is handles[0] for h in handles))
+        self.assertEqual(handles[0](3), 6)
+        self.assertEqual(registry.stats()['loads'], 1)
+
+    def test_handle_is_thread_safe(self):
+        registry = ModelRegistry()
+        active = []
+        overlaps = []
+
+        def model(x):
+            active.append(x)
+            if len(active) > 1:
+                overlaps.append(x)
+            active.remove(x)
+            return x
+
+        handle = registry._get(('extractor', 'ckpt.t7', True), lambda: model)
+        threads = [threading.Thread(target=lambda i=i: [handle(i) for _ in range(200)]) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(overlaps, [])
+        self.assertEqual(handle.calls, 1600)
+
+
+if __name__ == '__main__':
+    unittest.main()
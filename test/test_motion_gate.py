@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from deep_sort.deep_sort import DeepSort
+from pipeline_package import MotionGate
+
+KEYPOINTS = [80, 80, 240, 80, 240, 200, 80, 200]  # Zone au sol (x, y) x 4
+
+
+def frame_with_box(*boxes):
+    frame = np.full((240, 320, 3), 60, np.uint8)
+    for x, y in boxes:
+        frame[y:y + 40, x:x + 20] = 255
+    return frame
+
+
+class TestMotionGate(unittest.TestCase):
+
+    def test_skips_static_frames_and_detects_motion_in_quad(self):
+        gate = MotionGate(max_skipped=100)
+        self.assertTrue(gate.should_detect(frame_with_box((100, 100)), KEYPOINTS))
+        self.assertFalse(gate.should_detect(frame_with_box((100, 100)), KEYPOINTS))
+
+        # Mouvement hors de la zone au sol : ignoré
+        self.assertFalse(gate.should_detect(frame_with_box((100, 100), (280, 10)), KEYPOINTS))
+
+        # Mouvement dans la zone au sol
+        self.assertTrue(gate.should_detect(frame_with_box((100, 100), (280, 10), (150, 120)), KEYPOINTS))
+        self.assertEqual(gate.stats()['saved_detector_calls'], 2)
+
+    def test_forces_detection_every_k_frames(self):
+        gate = MotionGate(max_skipped=3)
+        decisions = [gate.should_detect(frame_with_box(), KEYPOINTS) for _ in range(9)]
+        self.assertEqual(decisions, [True, False, False, False, True, False, False, False, True])
+        self.assertEqual(gate.stats()['forced'], 2)
+
+
+class TestDeepSortPredict(unittest.TestCase):
+
+    def test_coasting_keeps_reported_tracks(self):
+        extractor = lambda crops: np.ones((len(crops), 4), np.float32)
+        tracker = DeepSort(model_path=None, n_init=1, extractor=extractor)
+        frame = frame_with_box()
+        for _ in range(2):
+            outputs = tracker.update(np.array([[100.0, 100.0, 20.0, 40.0]]), np.array([0.9]), frame)
+        self.assertEqual(len(outputs), 1)
+
+        for _ in range(5):
+            coasted = tracker.predict()
+        self.assertEqual(len(coasted), 1)
+        self.assertEqual(coasted[0][4], outputs[0][4])
+
+
+if __name__ == '__main__':
+    unittest.main()
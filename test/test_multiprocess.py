@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+import numpy as np
+
+from pipeline_package import CameraSpec
+from pipeline_package.multiprocess import MultiProcessSite, SharedFrameRing
+from pipeline_package.sinks import Sink
+
+
+class TestSharedFrameRing(unittest.TestCase):
+
+    def setUp(self):
+        self.ring = SharedFrameRing((4, 6, 3), slots=2)
+        self.reader = SharedFrameRing((4, 6, 3), slots=2, name=self.ring.name)
+
+    def tearDown(self):
+        self.reader.close()
+        self.ring.close()
+
+    def test_reader_sees_written_frame(self):
+        frame = np.full((4, 6, 3), 7, np.uint8)
+        sequence = self.ring.write(frame)
+
+        self.assertEqual(sequence, 0)
+        np.testing.assert_array_equal(self.reader.read(sequence), frame)
+
+    def test_overwritten_frame_is_reported(self):
+        for value in range(3):
+            self.ring.write(np.full((4, 6, 3), value, np.uint8))
+
+        self.assertIsNone(self.reader.read(0))
+        self.assertEqual(int(self.reader.read(2)[0, 0, 0]), 2)
+
+    def test_unwritten_sequence_is_reported(self):
+        self.assertIsNone(self.reader.read(1))
+
+
+class CountingDisplaySink(Sink):
+
+    def __init__(self, stop_after):
+        self.stop_after = stop_after
+        self.emitted = []
+
+    def emit(self, outputs, views):
+        self.emitted.append(outputs)
+        self.stop_requested = len(self.emitted) >= self.stop_after
+
+
+class TestMultiProcessSite(unittest.TestCase):
+
+    def test_display_is_pumped_without_messages(self):
+        site = MultiProcessSite([], headless=True)
+        site.display_sink = CountingDisplaySink(stop_after=3)
+        site.run()  # Aucune caméra : seul l'affichage peut arrêter la boucle
+        self.assertEqual(site.display_sink.emitted, [[], [], []])
+
+    def test_latency_stats_reported_by_workers(self):
+        camera = CameraSpec('missing.avi', [0, 0, 10, 0, 10, 10, 0, 10], 1.0, name='hall')
+        site = MultiProcessSite([camera], headless=True)
+        self.assertEqual(site.latency_stats(), {'hall': {}})
+        stats = {'frames': 3, 'p50_ms': 40.0, 'p95_ms': 55.0, 'p99_ms': 60.0, 'stages_ms': {}}
+        self.assertTrue(site.handle(('latency', 0, stats)))
+        self.assertEqual(site.latency_stats(), {'hall': stats})
+
+    def test_worker_failing_at_startup_ends_the_run(self):
+        camera = CameraSpec('missing.avi', [0, 0, 10, 0, 10, 10, 0, 10], 1.0, name='missing')
+        site = MultiProcessSite([camera], headless=True, model_path='missing.pt')
+        thread = threading.Thread(target=site.run, daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+        self.assertFalse(thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+from deep_sort.deep.feature_extractor import Extractor
+from deep_sort.deep.model import Net
+
+try:
+    import onnx  # noqa: F401 (export)
+    import onnxruntime  # noqa: F401 (backend)
+    HAS_ONNX = True
+except ImportError:
+    HAS_ONNX = False
+
+
+@unittest.skipUnless(HAS_ONNX, "onnx et onnxruntime requis")
+class TestOnnxExtractor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from deep_sort.deep.export_onnx import export_onnx
+
+        tmp = tempfile.mkdtemp()
+        checkpoint = os.path.join(tmp, 'ckpt.t7')
+        torch.manual_seed(0)
+        net = Net(reid=True)
+        # Statistiques de BatchNorm non triviales pour que la parité les couvre
+        for module in net.modules():
+            if isinstance(module, torch.nn.BatchNorm2d):
+                module.running_mean.uniform_(-0.1, 0.1)
+                module.running_var.uniform_(0.5, 1.5)
+        torch.save({'net_dict': net.state_dict()}, checkpoint)
+        cls.torch_extractor = Extractor(checkpoint, use_cuda=False)
+        cls.onnx_extractor = Extractor(export_onnx(checkpoint), use_cuda=False)
+
+    def crops(self, n):
+        rng = np.random.default_rng(n)
+        return [rng.integers(0, 255, (int(rng.integers(40, 200)), int(rng.integers(20, 100)), 3), dtype=np.uint8)
+                for _ in range(n)]
+
+    def test_embeddings_match_torch(self):
+        self.assertEqual(self.onnx_extractor.backend, 'onnx')
+        for n in (1, 6):  # Taille de lot dynamique
+            crops = self.crops(n)
+            expected = self.torch_extractor(crops)
+            features = self.onnx_extractor(crops)
+            self.assertEqual(features.shape, (n, 512))
+            np.testing.assert_allclose(features, expected, atol=1e-4)
+
+
+if __name__ == '__main__':
+    unittest.main()
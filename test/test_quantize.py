@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import torch
+
+from deep_sort.deep.feature_extractor import Extractor
+from deep_sort.deep.model import Net
+from deep_sort.deep.quantize import quantize_net, save_quantized
+
+
+def has_quantized_engine():
+    return 'x86' in torch.backends.quantized.supported_engines or 'fbgemm' in torch.backends.quantized.supported_engines
+
+
+@unittest.skipUnless(has_quantized_engine(), "moteur de quantification x86/fbgemm requis")
+class TestQuantize(unittest.TestCase):
+
+    def test_int8_model_loads_through_extractor(self):
+        tmp = tempfile.mkdtemp()
+        torch.manual_seed(0)
+        net = Net(reid=True).eval()
+        checkpoint = os.path.join(tmp, 'ckpt.t7')
+        torch.save({'net_dict': net.state_dict()}, checkpoint)
+
+        backend = 'x86' if 'x86' in torch.backends.quantized.supported_engines else 'fbgemm'
+        calibration = [torch.randn(8, 3, 128, 64) for _ in range(4)]
+        path = save_quantized(quantize_net(net, calibration, backend=backend), os.path.join(tmp, 'ckpt_int8.pt'))
+
+        int8 = Extractor(path, use_cuda=False)
+        fp32 = Extractor(checkpoint, use_cuda=False)
+        self.assertEqual(int8.backend, 'torchscript')
+
+        rng = np.random.default_rng(0)
+        crops = [rng.integers(0, 255, (120, 50, 3), dtype=np.uint8) for _ in range(3)]
+        a, b = int8(crops), fp32(crops)
+        self.assertEqual(a.shape, (3, 512))
+        # Embeddings proches de la version fp32 (caractéristiques normalisées)
+        self.assertGreater(float(np.min(np.sum(a * b, axis=1))), 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from pipeline_package.sinks import CallbackSink, FileSink, SocketSink
+
+OUTPUTS = [
+    {'camera': 'cam1', 'index': 3, 'timestamp': 0.1,
+     'suitcases': [{'id': 1, 'bbox': [0, 0, 5, 5], 'position': [10.0, 12.0], 'owner': 2}], 'persons': []},
+    {'camera': 'cam2', 'index': 3, 'timestamp': 0.1, 'suitcases': [], 'persons': []},
+]
+
+
+class TestSinks(unittest.TestCase):
+
+    def test_file_sink_writes_one_line_per_camera(self):
+        path = os.path.join(tempfile.mkdtemp(), 'out.jsonl')
+        sink = FileSink(path)
+        sink.emit(OUTPUTS, None)
+        sink.close()
+
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line) for line in f], OUTPUTS)
+
+    def test_callback_sink_can_request_stop(self):
+        received = []
+        sink = CallbackSink(lambda outputs, views: received.append(outputs))
+        sink.emit(OUTPUTS, None)
+        self.assertEqual(received, [OUTPUTS])
+        self.assertFalse(sink.stop_requested)
+
+        sink = CallbackSink(lambda outputs, views: False)
+        sink.emit(OUTPUTS, None)
+        self.assertTrue(sink.stop_requested)
+
+    def test_socket_sink_sends_json_lines(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        sink = SocketSink('127.0.0.1', server.getsockname()[1])
+        sink.emit(OUTPUTS, None)
+        conn, _ = server.accept()
+        sink.close()
+
+        data = b''
+        while data.count(b'\n') < len(OUTPUTS):
+            data += conn.recv(4096)
+        conn.close()
+        server.close()
+        self.assertEqual([json.loads(line) for line in data.splitlines()], OUTPUTS)
+
+    def test_socket_sink_counts_dropped_outputs(self):
+        server = socket.create_server(('127.0.0.1', 0))
+        port = server.getsockname()[1]
+        server.close()
+
+        sink = SocketSink('127.0.0.1', port)
+        sink.emit(OUTPUTS, None)
+        self.assertEqual(sink.dropped, len(OUTPUTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pipeline_package.camera_pipeline as cp
+import pipeline_package.site as site_module
+from pipeline_package import CameraSpec, CameraPipeline, Site
+from test_frame_reader import write_test_video
+
+
+class FakeDetector:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def detect(self, frame, roi=None):
+        return {0: [], 28: []}
+
+    def detect_batch(self, frames, rois=None):
+        return [self.detect(frame) for frame in frames]
+
+
+class FakeTracker:
+    class_id = 0
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+
+    def update_frame(self, frame, detections, pop, mini_map, keypoints):
+        return pop
+
+    def coast_frame(self, frame, pop, mini_map, keypoints):
+        return pop
+
+    def propagate_frame(self, frame, boxes, track_ids, pop, mini_map, keypoints):
+        return pop
+
+
+class TestSiteKeyframes(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, 'test.avi')
+        write_test_video(self.video_path, n_frames=24, size=(160, 120))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def detected_frames(self, pipelined):
+        """
+        Frames passées au détecteur, par caméra, lors d'une exécution du site.
+        """
+        detected = {}
+        track_detections = CameraPipeline.track_detections
+
+        def spy(pipeline, frame, detections, radius_in_pixel, packet=None):
+            if detections is not None:
+                detected.setdefault(pipeline.name, []).append(packet.index)
+            return track_detections(pipeline, frame, detections, radius_in_pixel, packet)
+
+        with patch.object(site_module, 'SharedDetector', FakeDetector), \
+                patch.object(cp.sp, 'SuitcaseTracker', FakeTracker), patch.object(cp.pp, 'PlayerTracker', FakeTracker), \
+                patch.object(CameraPipeline, 'track_detections', spy):
+            cameras = [CameraSpec(self.video_path, [10, 10, 150, 10, 150, 110, 10, 110], 1.0, name=str(i))
+                       for i in range(2)]
+            site = Site(cameras, fps_divider=1, keyframe_interval=3, headless=True)
+            site.run(pipelined=pipelined, queue_size=4)
+        return detected
+
+    def test_serial_and_pipelined_detect_the_same_frames(self):
+        serial = self.detected_frames(pipelined=False)
+        self.assertEqual(serial['0'], list(range(0, 24, 3)))
+        self.assertEqual(self.detected_frames(pipelined=True), serial)
+
+    def test_crop_mode_reaches_the_trackers(self):
+        with patch.object(site_module, 'SharedDetector', FakeDetector), \
+                patch.object(cp.sp, 'SuitcaseTracker', FakeTracker), patch.object(cp.pp, 'PlayerTracker', FakeTracker):
+            camera = CameraSpec(self.video_path, [10, 10, 150, 10, 150, 110, 10, 110], 1.0, name='roi')
+            site = Site([camera], headless=True, crop_mode='roi_align')
+            pipeline = site.pipelines[0]
+            site.release()
+
+        self.assertEqual(pipeline.pers_tracker.kwargs['crop_mode'], 'roi_align')
+        self.assertEqual(pipeline.suit_tracker.kwargs['crop_mode'], 'roi_align')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+
+from capture_package import ConnectionPool, FrameReader, SnapshotSource, StrideSkipper, is_snapshot_url
+
+
+class CaptureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Connexions persistantes comme le serveur de l'ESP32
+    requests = 0
+    connections = set()
+    failing = set()  # Numéros des requêtes en erreur 500
+
+    def do_GET(self):
+        CaptureHandler.requests += 1
+        CaptureHandler.connections.add(self.client_address)
+        if CaptureHandler.requests in CaptureHandler.failing:
+            self.send_error(500)
+            return
+        frame = np.full((48, 64, 3), 10 * CaptureHandler.requests, dtype=np.uint8)
+        jpeg = cv2.imencode('.jpg', frame)[1].tobytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(jpeg)))
+        self.send_header('X-Timestamp', '%d.%06d' % (200 + CaptureHandler.requests, 500000))
+        self.end_headers()
+        self.wfile.write(jpeg)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSnapshotSource(unittest.TestCase):
+
+    def setUp(self):
+        CaptureHandler.requests = 0
+        CaptureHandler.connections = set()
+        CaptureHandler.failing = set()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), CaptureHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/capture"
+        self.pool = ConnectionPool()
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_detects_capture_urls(self):
+        self.assertTrue(is_snapshot_url(self.url))
+        self.assertFalse(is_snapshot_url("http://172.20.10.14:81/stream"))
+        self.assertFalse(is_snapshot_url("input_videos/capture"))
+
+    def test_reuses_keep_alive_connection(self):
+        source = SnapshotSource(self.url, fps=100, scale=0.5, connection_pool=self.pool)
+        frames = [source.read() for _ in range(3)]
+
+        self.assertTrue(all(ret for ret, _ in frames))
+        self.assertEqual(frames[0][1].shape, (24, 32, 3))
+        self.assertEqual(source.timestamp, 203.5)
+        self.assertEqual(self.pool.stats(), {'connections': 1, 'requests': 3})
+        self.assertEqual(len(CaptureHandler.connections), 1)
+
+    def test_skipped_frames_are_never_fetched(self):
+        reader = FrameReader(self.url, skipper=StrideSkipper(5)).start()
+        packets = [reader.read_packet(timeout=2) for _ in range(3)]
+        reader.release()
+
+        self.assertEqual([packet.index for packet in packets], [0, 5, 10])
+        self.assertLessEqual(CaptureHandler.requests, 4)  # 3 frames + au plus une d'avance
+        self.assertGreaterEqual(packets[1].timestamp, 200)
+
+    def test_reader_survives_a_failed_request(self):
+        CaptureHandler.failing = {2}
+        reader = FrameReader(self.url).start()
+        packets = [reader.read_packet(timeout=2) for _ in range(3)]
+        reader.release()
+
+        self.assertTrue(all(packet is not None for packet in packets))
+        self.assertEqual(reader.stats()['frames_corrupt'], 1)
+        self.assertEqual(reader.reconnects, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
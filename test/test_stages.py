@@ -0,0 +1,52 @@
+import time
+import unittest
+
+from pipeline_package.stages import Stage, StagedPipeline, STOP
+
+
+class TestStagedPipeline(unittest.TestCase):
+
+    def run_pipeline(self, pipeline):
+        pipeline.start()
+        results = []
+        while True:
+            item = pipeline.get(timeout=5)
+            if item is STOP or item is None:
+                break
+            results.append(item)
+        pipeline.stop()
+        return results
+
+    def test_preserves_order_across_stages(self):
+        items = iter(range(20))
+        pipeline = StagedPipeline(
+            source=lambda: next(items, None),
+            stages=[Stage("double", lambda x: 2 * x), Stage("inc", lambda x: x + 1)],
+        )
+
+        self.assertEqual(self.run_pipeline(pipeline), [2 * i + 1 for i in range(20)])
+        self.assertEqual(pipeline.stats()['double']['items'], 20)
+
+    def test_stages_overlap(self):
+        items = iter(range(8))
+
+        def slow(x):
+            time.sleep(0.05)
+            return x
+
+        pipeline = StagedPipeline(
+            source=lambda: next(items, None),
+            stages=[Stage("a", slow), Stage("b", slow), Stage("c", slow)],
+        )
+
+        start = time.monotonic()
+        results = self.run_pipeline(pipeline)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(results, list(range(8)))
+        # En série : 8 * 3 * 0.05 = 1.2 s ; en pipeline : environ (8 + 2) * 0.05 = 0.5 s
+        self.assertLess(elapsed, 0.9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+
+from capture_package import FramePacket, FrameSynchronizer
+
+
+def packet(timestamp):
+    return FramePacket(0, timestamp, None)
+
+
+class TestFrameSynchronizer(unittest.TestCase):
+
+    def test_pairs_frames_within_tolerance(self):
+        sync = FrameSynchronizer(2, tolerance=0.02)
+        sync.push(0, packet(1.00))
+        self.assertIsNone(sync.pop())
+
+        sync.push(1, packet(1.01))
+        packets = sync.pop()
+        self.assertEqual([p.timestamp for p in packets], [1.00, 1.01])
+        self.assertAlmostEqual(sync.stats()['skew_ms']['0-1']['max'], 10.0)
+
+    def test_drops_stale_frames_and_holds_newer_ones(self):
+        sync = FrameSynchronizer(2, tolerance=0.02)
+        for t in (1.00, 1.04, 1.08):
+            sync.push(0, packet(t))
+        sync.push(1, packet(1.075))
+
+        packets = sync.pop()
+        self.assertEqual([p.timestamp for p in packets], [1.08, 1.075])
+        self.assertEqual(sync.stats()['dropped'], [2, 0])
+
+        # Frame plus récente que celles de l'autre caméra : gardée en attente
+        sync.push(1, packet(1.20))
+        self.assertIsNone(sync.pop())
+        self.assertTrue(sync.has_pending(1))
+
+    def test_clock_offsets_and_pending_limit(self):
+        sync = FrameSynchronizer(3, tolerance=0.01, max_pending=2, offsets=[0.0, 0.5, 0.0])
+        for t in (1.0, 2.0, 3.0):
+            sync.push(0, packet(t))
+        sync.push(1, packet(2.5))
+        sync.push(2, packet(3.0))
+
+        packets = sync.pop()
+        self.assertEqual([p.timestamp for p in packets], [3.0, 2.5, 3.0])
+        self.assertEqual(sync.stats()['dropped'], [2, 0, 0])
+        self.assertEqual(sync.matched, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
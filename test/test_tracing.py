@@ -0,0 +1,42 @@
+import unittest
+
+from pipeline_package import LatencyTracker, lineage
+
+
+class TestLineage(unittest.TestCase):
+
+    def test_durations_between_consecutive_stages(self):
+        marks = {'received': 10.0, 'decoded': 10.01, 'detected': 10.05, 'output': 10.06}
+        durations = lineage(marks)
+        self.assertEqual(list(durations), ['decoded', 'detected', 'output'])
+        self.assertAlmostEqual(durations['decoded'], 10.0)
+        self.assertAlmostEqual(durations['detected'], 40.0)
+        self.assertAlmostEqual(durations['output'], 10.0)
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def test_percentiles_from_reception_for_files(self):
+        tracker = LatencyTracker(live=False)
+        for i in range(100):
+            tracker.record({'received': 0.0, 'output': (i + 1) / 1000.0}, timestamp=i * 40.0)
+        percentiles = tracker.percentiles()
+        self.assertAlmostEqual(percentiles['p50_ms'], 50.5)
+        self.assertAlmostEqual(percentiles['p99_ms'], 99.01)
+        self.assertEqual(tracker.stats()['frames'], 100)
+
+    def test_live_latency_uses_capture_clock(self):
+        tracker = LatencyTracker(live=True)
+        # Caméra en avance de 100 s sur l'horloge locale, transmission minimale de 5 ms
+        self.assertAlmostEqual(tracker.record({'received': 1.005, 'output': 1.02}, 100.0), 0.015)
+        # Frame reçue 30 ms après sa capture : la latence compte le retard de transmission
+        self.assertAlmostEqual(tracker.record({'received': 1.135, 'output': 1.14}, 100.1), 0.035)
+
+    def test_empty_tracker(self):
+        tracker = LatencyTracker()
+        self.assertEqual(tracker.percentiles(), {})
+        self.assertEqual(tracker.stats(), {'frames': 0, 'stages_ms': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -145,4 +145,20 @@ def associate_objects(pers_pop, suitcase_pop, radius_in_pixels):
                 suitcase.lost = True  # Marque la valise comme perdue
                 print(f"{suitcase} perdu")  # Log de débogage
 
-    return lien_dict
\ No newline at end of file
+    return lien_dict
+
+def boxes_to_detections(boxes):
+    """
+    Convertit les boîtes YOLO en détections utilisables par DeepSort.
+
+    Args:
+        boxes (list): Lignes (x1, y1, x2, y2, confiance, classe) de results[0].boxes.data
+
+    Returns:
+        list: Détections ([xc, yc, w, h], confiance, classe)
+    """
+    return [
+        ([int((box[0] + box[2]) / 2), int((box[1] + box[3]) / 2), int(box[2] - box[0]), int(box[3] - box[1])],
+         float(box[4]), int(box[5]))
+        for box in boxes
+    ]